@@ -1,7 +1,10 @@
+import collections
+import queue
 import re
 import struct
 import sys
 import textwrap
+import threading
 
 __version__ = '2.7.1'
 
@@ -74,6 +77,39 @@ IMAGE_FORMAT = {
     'depth24plus': (0x81A6, 0x1902, 0x1405, 0x1801, 1, 4, 0, 2, 'f'),
     'depth24plus-stencil8': (0x88F0, 0x84F9, 0x84FA, 0x84F9, 2, 4, 0, 6, 'x'),
     'depth32float': (0x8CAC, 0x1902, 0x1406, 0x1801, 1, 4, 0, 2, 'f'),
+    'bc1-rgba-unorm': (0x83F1, 0, 0, 0x1800, 4, 8, 1, 9, 'f'),
+    'bc3-rgba-unorm': (0x83F3, 0, 0, 0x1800, 4, 16, 1, 9, 'f'),
+    'bc4-r-unorm': (0x8DBB, 0, 0, 0x1800, 1, 8, 1, 9, 'f'),
+    'bc4-r-snorm': (0x8DBC, 0, 0, 0x1800, 1, 8, 1, 9, 'f'),
+    'bc5-rg-unorm': (0x8DBD, 0, 0, 0x1800, 2, 16, 1, 9, 'f'),
+    'bc5-rg-snorm': (0x8DBE, 0, 0, 0x1800, 2, 16, 1, 9, 'f'),
+    'bc7-rgba-unorm': (0x8E8C, 0, 0, 0x1800, 4, 16, 1, 9, 'f'),
+    'etc2-rgb8unorm': (0x9274, 0, 0, 0x1800, 4, 8, 1, 9, 'f'),
+    'etc2-rgb8a1unorm': (0x9276, 0, 0, 0x1800, 4, 8, 1, 9, 'f'),
+    'etc2-rgba8unorm': (0x9278, 0, 0, 0x1800, 4, 16, 1, 9, 'f'),
+    'eac-r11unorm': (0x9270, 0, 0, 0x1800, 1, 8, 1, 9, 'f'),
+    'eac-r11snorm': (0x9271, 0, 0, 0x1800, 1, 8, 1, 9, 'f'),
+    'eac-rg11unorm': (0x9272, 0, 0, 0x1800, 2, 16, 1, 9, 'f'),
+    'eac-rg11snorm': (0x9273, 0, 0, 0x1800, 2, 16, 1, 9, 'f'),
+}
+
+PIXEL_FORMAT = {
+    'r8unorm': (0x1903, 0x1401, 1, 1),
+    'rg8unorm': (0x8227, 0x1401, 2, 2),
+    'rgb8unorm': (0x1907, 0x1401, 3, 3),
+    'bgr8unorm': (0x80E0, 0x1401, 3, 3),
+    'rgba8unorm': (0x1908, 0x1401, 4, 4),
+    'bgra8unorm': (0x80E1, 0x1401, 4, 4),
+    'r16unorm': (0x1903, 0x1403, 1, 2),
+    'rgba16unorm': (0x1908, 0x1403, 4, 8),
+    'r16float': (0x1903, 0x140B, 1, 2),
+    'rg16float': (0x8227, 0x140B, 2, 4),
+    'rgb16float': (0x1907, 0x140B, 3, 6),
+    'rgba16float': (0x1908, 0x140B, 4, 8),
+    'r32float': (0x1903, 0x1406, 1, 4),
+    'rg32float': (0x8227, 0x1406, 2, 8),
+    'rgb32float': (0x1907, 0x1406, 3, 12),
+    'rgba32float': (0x1908, 0x1406, 4, 16),
 }
 
 TOPOLOGY = {
@@ -409,6 +445,445 @@ def loader(headless=False):
     return loader
 
 
+frame_recorders = []
+
+
+class FrameRecorder:
+    def __init__(self, image, depth=3, sink=None):
+        if depth < 1:
+            raise ValueError('invalid depth')
+        if not callable(sink):
+            raise TypeError('sink must be callable')
+        self.image = image
+        self.depth = depth
+        self.sink = sink
+        self.frames = 0
+        self.error = None
+        self.failed = False
+        self.pending = collections.deque()
+        self.encoding = queue.Queue(depth)
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+        frame_recorders.append(self)
+
+    def _worker(self):
+        while True:
+            frame = self.encoding.get()
+            try:
+                if frame is None:
+                    break
+                if not self.failed:
+                    self.sink(frame)
+            except BaseException as error:
+                self.error = error
+                self.failed = True
+            finally:
+                self.encoding.task_done()
+
+    def _check(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _submit(self):
+        self.encoding.put(self.pending.popleft().read())
+        self.frames += 1
+
+    def capture(self):
+        self._check()
+        self.pending.append(self.image.read_async())
+        while len(self.pending) > self.depth:
+            self._submit()
+
+    def flush(self):
+        while self.pending:
+            self._submit()
+        self.encoding.join()
+        self._check()
+
+    def close(self):
+        if self not in frame_recorders:
+            return
+        frame_recorders.remove(self)
+        try:
+            self.flush()
+        finally:
+            self.encoding.put(None)
+            self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Atlas:
+    def __init__(self, ctx, size, format='rgba8unorm', layers=1, padding=1):
+        width, height = size
+        if width <= 0 or height <= 0:
+            raise ValueError('invalid size')
+        if layers < 1:
+            raise ValueError('invalid layers')
+        self.ctx = ctx
+        self.size = (width, height)
+        self.format = format
+        self.padding = padding
+        self.image = ctx.image(self.size, format, array=layers)
+        self.shelves = [[] for _ in range(layers)]
+        self.bottom = [0] * layers
+        self.used = 0
+        self.pending = []
+
+    @property
+    def layers(self):
+        return len(self.shelves)
+
+    @property
+    def efficiency(self):
+        width, height = self.size
+        return self.used / (width * height * self.layers)
+
+    def _allocate(self, width, height):
+        atlas_width, atlas_height = self.size
+        best = None
+        for layer, shelves in enumerate(self.shelves):
+            for shelf in shelves:
+                y, shelf_height, x = shelf
+                if shelf_height >= height and x + width <= atlas_width:
+                    if best is None or shelf_height < best[1][1]:
+                        best = layer, shelf
+        if best is not None:
+            layer, shelf = best
+            x = shelf[2]
+            shelf[2] += width
+            return layer, x, shelf[0]
+        for layer, shelves in enumerate(self.shelves):
+            y = self.bottom[layer]
+            if y + height <= atlas_height:
+                shelves.append([y, height, width])
+                self.bottom[layer] = y + height
+                return layer, 0, y
+        return None
+
+    def _grow(self):
+        layers = self.layers
+        image = self.ctx.image(self.size, self.format, array=layers * 2)
+        for layer in range(layers):
+            self.image.face(layer=layer).blit(image.face(layer=layer))
+        self.ctx.release(self.image)
+        self.image = image
+        self.shelves.extend([] for _ in range(layers))
+        self.bottom.extend([0] * layers)
+
+    def add(self, data, size=None):
+        if size is None:
+            shape = memoryview(data).shape
+            if len(shape) < 2:
+                raise ValueError('the size is required for flat data')
+            size = (shape[1], shape[0])
+        width, height = size
+        padding = self.padding
+        atlas_width, atlas_height = self.size
+        if width <= 0 or height <= 0 or width + padding * 2 > atlas_width or height + padding * 2 > atlas_height:
+            raise ValueError('invalid size')
+        rect = self._allocate(width + padding * 2, height + padding * 2)
+        if rect is None:
+            self._grow()
+            rect = self._allocate(width + padding * 2, height + padding * 2)
+        layer, x, y = rect
+        x, y = x + padding, y + padding
+        self.pending.append((data, (width, height), (x, y), layer))
+        self.used += width * height
+        uv = (x / atlas_width, y / atlas_height, (x + width) / atlas_width, (y + height) / atlas_height)
+        return layer, uv
+
+    def flush(self):
+        for data, size, offset, layer in self.pending:
+            row = memoryview(data).nbytes // size[1]
+            if row % 4:
+                self.image.write(data, size, offset, layer, alignment=1)
+            else:
+                self.image.write(data, size, offset, layer)
+        self.pending.clear()
+
+
+def picked_id(data):
+    return struct.unpack('I', data)[0]
+
+
+def picked_ids(data):
+    return [i for i, value in enumerate(data) if value]
+
+
+class PickResult:
+    def __init__(self, readback, convert):
+        self.readback = readback
+        self.convert = convert
+
+    @property
+    def ready(self):
+        return self.readback.ready
+
+    def read(self):
+        return self.convert(self.readback.read())
+
+
+class Picker:
+    def __init__(self, ctx, size, depth=True, max_id=65535):
+        width, height = size
+        if width <= 0 or height <= 0:
+            raise ValueError('invalid size')
+        if max_id < 1:
+            raise ValueError('invalid max_id')
+        self.ctx = ctx
+        self.size = (width, height)
+        self.max_id = max_id
+        self.image = ctx.image(self.size, 'r32uint')
+        self.depth = ctx.image(self.size, 'depth24plus') if depth else None
+        self.mask = ctx.image((256, max_id // 256 + 1), 'r8unorm')
+        self.pipeline = None
+
+    @property
+    def framebuffer(self):
+        if self.depth is None:
+            return [self.image]
+        return [self.image, self.depth]
+
+    def clear(self):
+        self.image.clear()
+        if self.depth is not None:
+            self.depth.clear()
+
+    def pick(self, x, y):
+        width, height = self.size
+        if x < 0 or y < 0 or x >= width or y >= height:
+            raise ValueError('invalid position')
+        return PickResult(self.image.read_async((1, 1), (x, y)), picked_id)
+
+    def select(self, rect):
+        x, y, w, h = rect
+        width, height = self.size
+        if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > width or y + h > height:
+            raise ValueError('invalid rect')
+        if self.pipeline is None:
+            self.pipeline = self.ctx.pipeline(
+                vertex_shader=builtin_shader(self.ctx, PICKER_VERTEX_SHADER),
+                fragment_shader=builtin_shader(self.ctx, PICKER_FRAGMENT_SHADER),
+                layout=[{'name': 'Source', 'binding': 0}],
+                resources=[{'type': 'sampler', 'binding': 0, 'image': self.image, 'min_filter': 'nearest', 'mag_filter': 'nearest'}],
+                uniforms={'region': (0, 0, 1, 1), 'max_id': self.max_id},
+                framebuffer=[self.mask],
+                topology='points',
+            )
+        struct.pack_into('4i', self.pipeline.uniforms['region'], 0, x, y, w, h)
+        self.pipeline.vertex_count = w * h
+        self.mask.clear()
+        self.pipeline.render()
+        return PickResult(self.mask.read_async(), picked_ids)
+
+
+REDUCE_OPERATION = {
+    'sum': 'a + b',
+    'min': 'min(a, b)',
+    'max': 'max(a, b)',
+    'mean': 'a + b',
+}
+
+REDUCE_VERTEX_SHADER = '''
+    vec2 positions[3] = vec2[](
+        vec2(-1.0, -1.0),
+        vec2(3.0, -1.0),
+        vec2(-1.0, 3.0)
+    );
+
+    void main() {
+        gl_Position = vec4(positions[gl_VertexID], 0.0, 1.0);
+    }
+'''
+
+REDUCE_FRAGMENT_SHADER = '''
+    #define REDUCE(a, b) (%s)
+
+    uniform sampler2D Source;
+    uniform ivec4 region;
+
+    layout (location = 0) out vec4 out_value;
+
+    void main() {
+        ivec2 base = region.xy + ivec2(gl_FragCoord.xy) * 4;
+        ivec2 end = region.xy + region.zw;
+        vec4 res = texelFetch(Source, base, 0);
+        for (int y = 0; y < 4; ++y) {
+            for (int x = 0; x < 4; ++x) {
+                ivec2 at = base + ivec2(x, y);
+                if (x + y > 0 && at.x < end.x && at.y < end.y) {
+                    res = REDUCE(res, texelFetch(Source, at, 0));
+                }
+            }
+        }
+        out_value = res;
+    }
+'''
+
+HISTOGRAM_VERTEX_SHADER = '''
+    uniform sampler2D Source;
+    uniform ivec4 region;
+    uniform vec2 value_range;
+    uniform int bins;
+    uniform int luminance;
+
+    void main() {
+        ivec2 at = region.xy + ivec2(gl_VertexID % region.z, gl_VertexID / region.z);
+        vec4 color = texelFetch(Source, at, 0);
+        float value = luminance != 0 ? dot(color.rgb, vec3(0.2126, 0.7152, 0.0722)) : color.r;
+        float t = clamp((value - value_range.x) / (value_range.y - value_range.x), 0.0, 1.0);
+        float bin = min(floor(t * float(bins)), float(bins - 1));
+        gl_PointSize = 1.0;
+        gl_Position = vec4((bin + 0.5) / float(bins) * 2.0 - 1.0, 0.0, 0.0, 1.0);
+    }
+'''
+
+HISTOGRAM_FRAGMENT_SHADER = '''
+    layout (location = 0) out vec4 out_count;
+
+    void main() {
+        out_count = vec4(1.0, 0.0, 0.0, 0.0);
+    }
+'''
+
+
+PICKER_VERTEX_SHADER = '''
+    uniform highp usampler2D Source;
+    uniform ivec4 region;
+    uniform int max_id;
+
+    void main() {
+        ivec2 at = region.xy + ivec2(gl_VertexID % region.z, gl_VertexID / region.z);
+        int id = int(texelFetch(Source, at, 0).r);
+        int rows = max_id / 256 + 1;
+        gl_PointSize = 1.0;
+        gl_Position = vec4(2.0, 2.0, 0.0, 1.0);
+        if (id > 0 && id <= max_id) {
+            vec2 cell = vec2(float(id % 256) + 0.5, float(id / 256) + 0.5) / vec2(256.0, float(rows));
+            gl_Position = vec4(cell * 2.0 - 1.0, 0.0, 1.0);
+        }
+    }
+'''
+
+PICKER_FRAGMENT_SHADER = '''
+    layout (location = 0) out vec4 out_mask;
+
+    void main() {
+        out_mask = vec4(1.0, 0.0, 0.0, 0.0);
+    }
+'''
+
+
+def builtin_shader(ctx, source):
+    if ctx.info['version'].startswith(('OpenGL ES', 'WebGL')):
+        return '#version 300 es\nprecision highp float;\nprecision highp int;\n' + textwrap.dedent(source)
+    return '#version 330 core\n' + textwrap.dedent(source)
+
+
+def reduction_source(ctx, image, region):
+    width, height = image.size
+    x, y, w, h = region if region is not None else (0, 0, width, height)
+    if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > width or y + h > height:
+        raise ValueError('invalid region')
+    if image.renderbuffer:
+        source = ctx.transient(image.size, image.format)
+        image.blit(source)
+        return source, (x, y, w, h), True
+    return image, (x, y, w, h), False
+
+
+def reduce_image(ctx, image, op, region):
+    original, region, temporary = reduction_source(ctx, image, region)
+    source = original
+    count = region[2] * region[3]
+    fragment_shader = builtin_shader(ctx, REDUCE_FRAGMENT_SHADER % REDUCE_OPERATION[op])
+    first_size = (region[2] + 3) // 4, (region[3] + 3) // 4
+    targets = [None, None]
+    pipelines = {}
+    index = 0
+    while True:
+        width, height = (region[2] + 3) // 4, (region[3] + 3) // 4
+        if targets[index] is None:
+            targets[index] = ctx.transient(first_size, 'rgba32float')
+        target = targets[index]
+        pipeline = pipelines.get((source, target))
+        if pipeline is None:
+            pipeline = ctx.pipeline(
+                vertex_shader=builtin_shader(ctx, REDUCE_VERTEX_SHADER),
+                fragment_shader=fragment_shader,
+                layout=[{'name': 'Source', 'binding': 0}],
+                resources=[{'type': 'sampler', 'binding': 0, 'image': source, 'min_filter': 'nearest', 'mag_filter': 'nearest'}],
+                uniforms={'region': region},
+                framebuffer=[target],
+                topology='triangles',
+                vertex_count=3,
+            )
+            pipelines[(source, target)] = pipeline
+        pipeline.viewport = (0, 0, width, height)
+        struct.pack_into('4i', pipeline.uniforms['region'], 0, *region)
+        pipeline.render()
+        source, region, index = target, (0, 0, width, height), 1 - index
+        if width == 1 and height == 1:
+            break
+    for pipeline in pipelines.values():
+        ctx.release(pipeline)
+    if temporary:
+        ctx.release(original)
+    res = struct.unpack('4f', source.read((1, 1)))
+    for target in targets:
+        if target is not None:
+            ctx.release(target)
+    if op == 'mean':
+        res = tuple(value / count for value in res)
+    components = IMAGE_FORMAT[image.format][4]
+    if components == 1:
+        return res[0]
+    return res[:components]
+
+
+def image_histogram(ctx, image, bins, value_range, region):
+    if bins < 1:
+        raise ValueError('invalid bins')
+    low, high = value_range
+    if high <= low:
+        raise ValueError('invalid range')
+    if not ctx.info['float_blend']:
+        raise RuntimeError('histogram requires float blending')
+    source, region, temporary = reduction_source(ctx, image, region)
+    target = ctx.transient((bins, 1), 'r32float')
+    target.clear_value = 0.0
+    target.clear()
+    pipeline = ctx.pipeline(
+        vertex_shader=builtin_shader(ctx, HISTOGRAM_VERTEX_SHADER),
+        fragment_shader=builtin_shader(ctx, HISTOGRAM_FRAGMENT_SHADER),
+        layout=[{'name': 'Source', 'binding': 0}],
+        resources=[{'type': 'sampler', 'binding': 0, 'image': source, 'min_filter': 'nearest', 'mag_filter': 'nearest'}],
+        uniforms={
+            'region': region,
+            'value_range': (low, high),
+            'bins': bins,
+            'luminance': IMAGE_FORMAT[image.format][4] >= 3,
+        },
+        blend={'src_color': 'one', 'dst_color': 'one', 'src_alpha': 'one', 'dst_alpha': 'one'},
+        framebuffer=[target],
+        topology='points',
+        vertex_count=region[2] * region[3],
+    )
+    pipeline.render()
+    ctx.release(pipeline)
+    if temporary:
+        ctx.release(source)
+    res = [int(value) for value in struct.unpack(f'{bins}f', target.read())]
+    ctx.release(target)
+    return res
+
+
 def calcsize(layout):
     nodes = layout.split(' ')
     if nodes[-1] == '/i':
@@ -520,6 +995,25 @@ def framebuffer_attachments(attachments):
     return size, tuple(attachments), depth_stencil_attachment
 
 
+def discard_attachments(discard, attachments):
+    if discard is None:
+        return ()
+    color_attachments = attachments[1] if attachments else ()
+    depth_stencil_attachment = attachments[2] if attachments else None
+    res = []
+    for item in discard:
+        face = item.face() if hasattr(item, 'face') else item
+        if face in color_attachments:
+            attachment = 0x8CE0 + color_attachments.index(face)
+        elif face is not None and face is depth_stencil_attachment:
+            attachment = {2: 0x8D00, 4: 0x8D20, 6: 0x821A}[face.flags & 6]
+        else:
+            raise ValueError('The discarded images must be attachments of the framebuffer')
+        if attachment not in res:
+            res.append(attachment)
+    return tuple(res)
+
+
 def settings(cull_face, depth, stencil, blend, attachments):
     if attachments:
         num_color_attachments = len(attachments[1])
@@ -593,7 +1087,7 @@ def shader_source(source: str) -> bytes:
     return source.encode()
 
 
-def program(vertex_shader, fragment_shader, layout, includes):
+def program(vertex_shader, fragment_shader, layout, includes, varyings):
     def include(match):
         name = match.group(1)
         content = includes.get(name)
@@ -603,6 +1097,11 @@ def program(vertex_shader, fragment_shader, layout, includes):
 
     vert = textwrap.dedent(vertex_shader).strip()
     vert = re.sub(r'#include\s+[<"]([^">]*)[">]', include, vert)
+
+    if fragment_shader is None:
+        version = re.match(r'#version[^\n]*', vert)
+        fragment_shader = (version.group(0) if version else '') + '\nvoid main() {\n}\n'
+
     vert = shader_source(vert)
 
     frag = textwrap.dedent(fragment_shader).strip()
@@ -613,7 +1112,16 @@ def program(vertex_shader, fragment_shader, layout, includes):
     for obj in sorted(layout, key=lambda x: x['name']):
         bindings.extend((obj['name'], obj['binding']))
 
-    return (vert, 0x8B31), (frag, 0x8B30), tuple(bindings)
+    return (vert, 0x8B31), (frag, 0x8B30), tuple(bindings), varyings
+
+
+def feedback(feedback):
+    varyings = feedback.get('varyings')
+    if isinstance(varyings, str) or not varyings or not all(isinstance(x, str) for x in varyings):
+        raise ValueError('the feedback varyings must be a non-empty list of names')
+    if 'buffer' not in feedback:
+        raise ValueError('no feedback buffer was specified')
+    return tuple(varyings), feedback['buffer']
 
 
 def compile_error(shader: bytes, shader_type: int, log: bytes):
@@ -29,7 +29,7 @@ while True:
             sys.exit()
 
     frame[::-1, :, 0:3] = next(it)
-    image.write(frame)
+    image.write_async(frame)
     image.blit()
 
     pygame.display.flip()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+import zengl
+
+
+def test_atlas(ctx: zengl.Context):
+    atlas = ctx.atlas((16, 16), 'r8unorm', padding=0)
+    a = np.full((4, 5), 10, 'u1')
+    b = np.full((3, 7), 20, 'u1')
+    layer_a, uv_a = atlas.add(a)
+    layer_b, uv_b = atlas.add(b)
+    assert layer_a == layer_b == 0
+    assert uv_a == (0.0, 0.0, 5 / 16, 4 / 16)
+    assert uv_b == (5 / 16, 0.0, 12 / 16, 3 / 16)
+    atlas.flush()
+    pixels = np.frombuffer(atlas.image.read(), 'u1').reshape(16, 16)
+    np.testing.assert_array_equal(pixels[0:4, 0:5], 10)
+    np.testing.assert_array_equal(pixels[0:3, 5:12], 20)
+    assert atlas.efficiency == (20 + 21) / 256
+
+
+def test_atlas_grow(ctx: zengl.Context):
+    atlas = ctx.atlas((8, 8), 'rgba8unorm')
+    layers = []
+    for i in range(6):
+        layer, uv = atlas.add(bytes([i]) * 4 * 4 * 4, (4, 4))
+        layers.append(layer)
+        atlas.flush()
+    assert layers == [0, 1, 2, 3, 4, 5]
+    assert atlas.layers == 8
+    pixels = np.frombuffer(atlas.image.read(), 'u1').reshape(8, 8, 8, 4)
+    for i in range(6):
+        np.testing.assert_array_equal(pixels[i, 1:5, 1:5], i)
+
+
+def test_atlas_invalid_size(ctx: zengl.Context):
+    atlas = ctx.atlas((8, 8), 'rgba8unorm', padding=0)
+    with pytest.raises(ValueError):
+        atlas.add(b'\x00' * 4 * 9, (9, 1))
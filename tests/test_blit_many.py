@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import zengl
+
+
+def test_blit_many(ctx: zengl.Context):
+    src = ctx.image((4, 4), 'rgba8unorm', np.full((4, 4, 4), (10, 20, 30, 255), 'u1'))
+    a = ctx.image((4, 4), 'rgba8unorm')
+    b = ctx.image((2, 2), 'rgba8unorm')
+    c = ctx.image((2, 2), 'rgba8unorm')
+    c.clear()
+    ctx.blit_many([
+        (src, a),
+        (a, b, None, True),
+        (src.face(), c.face(), (0, 0, 1, 1)),
+    ])
+    assert a.read() == b'\x0a\x14\x1e\xff' * 16
+    assert b.read() == b'\x0a\x14\x1e\xff' * 4
+    assert c.read() == b'\x0a\x14\x1e\xff' * 4
+
+
+def test_blit_many_invalid(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    for blits in [None, [img], [(None, img)]]:
+        try:
+            ctx.blit_many(blits)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError
+
+
+def test_downsample_chain(ctx: zengl.Context):
+    data = np.zeros((2, 8, 8, 4), 'u1')
+    data[0, :, :4] = 255
+    data[1, :, :] = (0, 128, 0, 255)
+    img = ctx.image((8, 8), 'rgba8unorm', data, array=2, levels=4)
+    img.downsample_chain()
+    top = np.frombuffer(img.face(0, 3).read(), 'u1')
+    np.testing.assert_allclose(top, [128, 128, 128, 128], atol=1)
+    assert img.face(1, 2).read() == b'\x00\x80\x00\xff' * 4
+    assert img.face(0, 1).read() == (b'\xff' * 8 + bytes(8)) * 4
+
+
+def test_downsample_chain_nearest_formats(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8uint', np.full((4, 4, 4), 9, 'u1'), levels=3)
+    img.downsample_chain()
+    assert img.face(0, 2).read() == b'\x09' * 4
+    depth = ctx.image((4, 4), 'depth16unorm', levels=3)
+    depth.clear_value = 0.5
+    depth.clear()
+    depth.downsample_chain()
+    content = np.frombuffer(depth.face(0, 2).read(), 'u2').astype(float) / 0xFFFF
+    np.testing.assert_array_almost_equal(content, [0.5], 2)
+
+
+def test_downsample_chain_invalid_levels(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', levels=3)
+    with pytest.raises(TypeError):
+        img.downsample_chain(levels='all')
+    with pytest.raises(ValueError):
+        img.downsample_chain(levels=4)
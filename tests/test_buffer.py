@@ -1,3 +1,7 @@
+import io
+import mmap
+
+import numpy as np
 import pytest
 import zengl
 
@@ -130,3 +134,96 @@ def test_buffer_read_into(ctx: zengl.Context):
 def test_invalid_access(ctx):
     with pytest.raises(ValueError):
         ctx.buffer(size=64, access='bad')
+
+
+def test_buffer_write_many(ctx: zengl.Context):
+    buf = ctx.buffer(b'---------------')
+    buf.write_many([(2, b'Hel'), (5, b'lo'), (9, b'World')])
+    assert buf.read() == b'--Hello--World-'
+
+
+def test_buffer_write_many_packed(ctx: zengl.Context):
+    buf = ctx.buffer(b'------------')
+    buf.write_many(np.array([8, 0, 2], 'i4'), b'abcdef')
+    assert buf.read() == b'cdef----ab--'
+    buf.write_many([10, 4], b'xyzw')
+    assert buf.read() == b'cdefzw--abxy'
+
+
+def test_buffer_write_many_invalid(ctx: zengl.Context):
+    buf = ctx.buffer(b'--------')
+    with pytest.raises(ValueError):
+        buf.write_many([(0, b'abc'), (6, b'abc')])
+    with pytest.raises(ValueError):
+        buf.write_many([0, 2], b'abc')
+    with pytest.raises(TypeError):
+        buf.write_many([b'abc'])
+    assert buf.read() == b'--------'
+
+
+def test_buffer_resize(ctx: zengl.Context):
+    buf = ctx.buffer(b'Hello')
+    buf.resize(12)
+    assert buf.size == 12
+    assert buf.read(5) == b'Hello'
+    buf.write(b' World!', offset=5)
+    buf.resize(4)
+    assert buf.read() == b'Hell'
+    buf.resize(12)
+    assert buf.read() == b'Hell' + bytes(8)
+    buf.resize(30)
+    assert buf.read() == b'Hell' + bytes(26)
+    buf.resize(8, preserve=False)
+    assert buf.size == 8
+    with pytest.raises(ValueError):
+        buf.resize(0)
+
+
+def test_buffer_write_strided(ctx: zengl.Context):
+    data = np.arange(24, dtype='i4').reshape(4, 6)
+    buf = ctx.buffer(size=32)
+    buf.write(data[:, 1:3], zero_copy_only=True)
+    np.testing.assert_array_equal(np.frombuffer(buf.read(), 'i4'), data[:, 1:3].flatten())
+    buf.write(data.T[:2, :2], offset=16)
+    np.testing.assert_array_equal(np.frombuffer(buf.read(16, 16), 'i4'), [0, 6, 1, 7])
+
+
+def test_buffer_write_from_file(ctx: zengl.Context, tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(bytes(range(100)))
+    buf = ctx.buffer(size=128)
+    with open(path, 'rb') as f:
+        assert buf.write_from(f, 8, chunk=16) == 100
+    assert buf.read(100, 8) == bytes(range(100))
+
+
+def test_buffer_write_from_mmap(ctx: zengl.Context, tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(bytes(range(256)) * 4)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        buf = ctx.buffer(data)
+        assert buf.read() == bytes(range(256)) * 4
+        assert buf.write_from(data, 24, size=40, chunk=7) == 40
+    assert buf.read(40, 24) == bytes(range(40))
+
+
+def test_buffer_write_from_invalid(ctx: zengl.Context):
+    buf = ctx.buffer(size=16)
+    with pytest.raises(ValueError):
+        buf.write_from(b'x' * 17)
+    with pytest.raises(TypeError):
+        buf.write_from(123)
+    assert buf.write_from(io.BytesIO(b'x' * 32)) == 16
+
+
+def test_buffer_size_overflow(ctx: zengl.Context):
+    buf = ctx.buffer(size=16)
+
+    with pytest.raises(OverflowError):
+        buf.read(2**70)
+
+    with pytest.raises(OverflowError):
+        buf.view(2**70)
+
+    with pytest.raises(TypeError):
+        buf.view('16')
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+import zengl
+
+
+def render_texture(ctx: zengl.Context, texture: zengl.Image):
+    image = ctx.image((8, 8), 'rgba8unorm')
+    pipeline = ctx.pipeline(
+        vertex_shader='''
+            #version 330 core
+
+            vec2 positions[3] = vec2[](
+                vec2(-1.0, -1.0),
+                vec2(3.0, -1.0),
+                vec2(-1.0, 3.0)
+            );
+
+            void main() {
+                gl_Position = vec4(positions[gl_VertexID], 0.0, 1.0);
+            }
+        ''',
+        fragment_shader='''
+            #version 330 core
+
+            uniform sampler2D Texture;
+
+            layout (location = 0) out vec4 out_color;
+
+            void main() {
+                out_color = texelFetch(Texture, ivec2(gl_FragCoord.xy), 0);
+            }
+        ''',
+        layout=[
+            {
+                'name': 'Texture',
+                'binding': 0,
+            },
+        ],
+        resources=[
+            {
+                'type': 'sampler',
+                'binding': 0,
+                'image': texture,
+            },
+        ],
+        framebuffer=[image],
+        topology='triangles',
+        vertex_count=3,
+    )
+    pipeline.render()
+    return np.frombuffer(image.read(), 'u1').reshape(8, 8, 4)
+
+
+def test_compressed_formats(ctx: zengl.Context):
+    assert isinstance(ctx.info['compressed_formats'], list)
+
+
+def test_compressed_image(ctx: zengl.Context):
+    if 'bc1-rgba-unorm' not in ctx.info['compressed_formats']:
+        pytest.skip('bc1 is not supported')
+
+    red = b'\x00\xf8\x00\x00\x00\x00\x00\x00'
+    blue = b'\x1f\x00\x00\x00\x00\x00\x00\x00'
+    texture = ctx.image((8, 8), 'bc1-rgba-unorm', red * 4)
+    texture.write(blue, (4, 4), (4, 4))
+    pixels = render_texture(ctx, texture)
+    np.testing.assert_array_equal(pixels[0:4, 0:4], [[[255, 0, 0, 255]] * 4] * 4)
+    np.testing.assert_array_equal(pixels[4:8, 4:8], [[[0, 0, 255, 255]] * 4] * 4)
+
+
+def test_compressed_image_invalid(ctx: zengl.Context):
+    if 'bc1-rgba-unorm' not in ctx.info['compressed_formats']:
+        pytest.skip('bc1 is not supported')
+
+    texture = ctx.image((8, 8), 'bc1-rgba-unorm')
+    with pytest.raises(ValueError):
+        texture.write(b'\x00' * 8, (4, 4), (2, 2))
+    with pytest.raises(ValueError):
+        texture.write(b'\x00' * 16)
+    with pytest.raises(TypeError):
+        texture.read()
+    with pytest.raises(TypeError):
+        texture.mipmaps()
+    with pytest.raises(TypeError):
+        ctx.image((8, 8), 'bc1-rgba-unorm', samples=4)
+
+
+def test_compressed_image_read_all(ctx: zengl.Context):
+    if 'bc1-rgba-unorm' not in ctx.info['compressed_formats']:
+        pytest.skip('bc1 is not supported')
+
+    texture = ctx.image((8, 8), 'bc1-rgba-unorm', array=2, levels=4)
+    data = np.random.randint(0, 255, 2 * (4 + 1 + 1 + 1) * 8, 'u1').tobytes()
+    texture.write_all(data)
+    assert texture.read_all() == data
+
+
+def test_compressed_formats_cached(ctx: zengl.Context):
+    assert ctx.info is ctx.info
+    assert ctx.info['compressed_formats'] is ctx.info['compressed_formats']
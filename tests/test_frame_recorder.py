@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+import zengl
+
+
+def test_frame_recorder(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r8unorm')
+    frames = []
+    threads = set()
+
+    def sink(frame):
+        threads.add(threading.get_ident())
+        frames.append(bytes(frame))
+
+    with zengl.FrameRecorder(img, depth=2, sink=sink) as recorder:
+        for i in range(6):
+            ctx.new_frame(clear=False)
+            img.clear_value = i / 255.0
+            img.clear()
+            ctx.end_frame()
+        assert len(frames) <= 4
+
+    assert recorder.frames == 6
+    assert frames == [bytes([i]) * 16 for i in range(6)]
+    assert threads and threading.get_ident() not in threads
+    ctx.end_frame()
+    assert recorder.frames == 6
+
+
+def test_frame_recorder_sink_error(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+
+    def sink(frame):
+        raise OSError('broken pipe')
+
+    recorder = zengl.FrameRecorder(img, depth=1, sink=sink)
+    with pytest.raises(OSError):
+        for i in range(4):
+            ctx.end_frame()
+        recorder.flush()
+    recorder.close()
+
+
+def test_frame_recorder_invalid(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    with pytest.raises(ValueError):
+        zengl.FrameRecorder(img, depth=0, sink=print)
+    with pytest.raises(TypeError):
+        zengl.FrameRecorder(img)
+
+
+def test_frame_recorder_closed_on_release(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r8unorm')
+    other = ctx.image((4, 4), 'r8unorm')
+    frames = []
+    recorder = zengl.FrameRecorder(img, depth=1, sink=frames.append)
+    ctx.end_frame()
+    ctx.release(other)
+    assert recorder.thread.is_alive()
+    ctx.release(img)
+    assert not recorder.thread.is_alive()
+    assert recorder.frames == 1
+    ctx.end_frame()
+    assert recorder.frames == 1
+
+
+def test_frame_recorder_transient(ctx: zengl.Context):
+    frames = []
+    ctx.new_frame()
+    img = ctx.transient((4, 4), 'r8unorm')
+    img.clear_value = 1.0 / 255.0
+    img.clear()
+    recorder = zengl.FrameRecorder(img, depth=1, sink=frames.append)
+    ctx.end_frame()
+    recorder.close()
+    assert frames == [bytes([1]) * 16]
+
+
+def test_frame_recorder_error_finishes_frame(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    recorder = zengl.FrameRecorder(img, depth=1, sink=lambda frame: None)
+    recorder.error = OSError('broken pipe')
+    ctx.new_frame()
+    temp = ctx.transient((8, 8))
+    with pytest.raises(OSError):
+        ctx.end_frame()
+    ctx.new_frame()
+    assert ctx.transient((8, 8)) is temp
+    ctx.end_frame()
+    recorder.close()
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import zengl
+
+
+def test_image_3d_write_read(ctx: zengl.Context):
+    data = np.arange(4 * 4 * 4 * 4, dtype='u1').reshape(4, 4, 4, 4)
+    img = ctx.image((4, 4), 'rgba8unorm', data, depth=4)
+    assert img.depth == 4
+    assert img.array == 0
+    assert img.read() == data.tobytes()
+    assert img.face(2).read() == data[2].tobytes()
+    img.write(np.full((2, 2, 4), 255, 'u1'), (2, 2), (1, 1), layer=3)
+    expected = data.copy()
+    expected[3, 1:3, 1:3] = 255
+    assert img.read() == expected.tobytes()
+
+
+def test_image_3d_mipmaps(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r8unorm', np.full((8, 4, 4), 200, 'u1'), depth=8, levels=4)
+    img.mipmaps()
+    assert img.face(1, 1).read() == b'\xc8' * 4
+    with pytest.raises(ValueError):
+        img.face(4, 1)
+    data = img.read_all(alignment=1)
+    assert len(data) == 4 * 4 * 8 + 2 * 2 * 4 + 1 * 1 * 2 + 1 * 1 * 1
+    assert data == b'\xc8' * len(data)
+
+
+def test_image_3d_render_slice(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', depth=3)
+    img.clear_value = (0.0, 0.0, 0.0, 1.0)
+    img.clear()
+    face = img.face(1)
+    img.clear_value = (1.0, 0.0, 0.0, 1.0)
+    img.clear(layers=1)
+    assert face.read() == b'\xff\x00\x00\xff' * 16
+    assert img.face(0).read() == b'\x00\x00\x00\xff' * 16
+
+
+def test_image_3d_sampling(ctx: zengl.Context):
+    volume = ctx.image((4, 4), 'r8unorm', np.array([[0] * 16, [255] * 16], 'u1'), depth=2)
+    image = ctx.image((4, 4), 'r8unorm')
+    pipeline = ctx.pipeline(
+        vertex_shader='''
+            #version 330 core
+
+            vec2 positions[3] = vec2[](
+                vec2(-1.0, -1.0),
+                vec2(3.0, -1.0),
+                vec2(-1.0, 3.0)
+            );
+
+            void main() {
+                gl_Position = vec4(positions[gl_VertexID], 0.0, 1.0);
+            }
+        ''',
+        fragment_shader='''
+            #version 330 core
+
+            uniform sampler3D Volume;
+
+            layout (location = 0) out vec4 out_color;
+
+            void main() {
+                out_color = texture(Volume, vec3(0.5, 0.5, 0.5));
+            }
+        ''',
+        layout=[{'name': 'Volume', 'binding': 0}],
+        resources=[
+            {
+                'type': 'sampler',
+                'binding': 0,
+                'image': volume,
+                'min_filter': 'linear',
+                'mag_filter': 'linear',
+                'wrap_z': 'clamp_to_edge',
+            },
+        ],
+        framebuffer=[image],
+        topology='triangles',
+        vertex_count=3,
+    )
+    pipeline.render()
+    pixels = np.frombuffer(image.read(), 'u1')
+    np.testing.assert_allclose(pixels, 128, atol=1)
+
+
+def test_image_3d_invalid(ctx: zengl.Context):
+    with pytest.raises(TypeError):
+        ctx.image((4, 4), 'rgba8unorm', depth=4, array=2)
+    with pytest.raises(TypeError):
+        ctx.image((4, 4), 'rgba8unorm', depth=4, samples=4)
+    with pytest.raises(ValueError):
+        ctx.image((4, 4), 'rgba8unorm', depth=-1)
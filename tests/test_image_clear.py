@@ -56,3 +56,53 @@ def test_invalid_image_clear_array(ctx: zengl.Context):
     assert img.face(2).read() == b'\xff\x00\x00\xff' * 256
     assert img.face(3).read() == b'\xff\x00\x00\xff' * 256
     assert img.read() == b'\xff\x00\x00\xff' * 256 * 4
+
+
+def test_image_clear_rect(ctx: zengl.Context):
+    for texture in [True, False]:
+        img = ctx.image((4, 4), 'rgba8unorm', texture=texture)
+        img.clear()
+        img.clear_value = (1.0, 1.0, 1.0, 1.0)
+        img.clear(rect=(1, 2, 2, 1))
+        pixels = np.frombuffer(img.read(), 'u1').reshape(4, 4, 4)
+        expected = np.zeros((4, 4, 4), 'u1')
+        expected[2, 1:3] = 255
+        np.testing.assert_array_equal(pixels, expected)
+
+
+def test_image_clear_layers(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r8unorm', bytes(64), array=4)
+    img.clear_value = 1.0
+    img.clear(layers=range(1, 3))
+    img.clear(layers=3, rect=(0, 0, 1, 1))
+    layers = [img.face(i).read() for i in range(4)]
+    assert layers == [bytes(16), b'\xff' * 16, b'\xff' * 16, b'\xff' + bytes(15)]
+
+
+def test_image_clear_level(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', levels=3)
+    img.clear_value = (0.0, 0.0, 1.0, 1.0)
+    img.clear(level=1)
+    assert img.face(0, 1).read() == b'\x00\x00\xff\xff' * 4
+
+
+def test_invalid_image_clear_layers(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r8unorm', array=4)
+    for layers in [4, -1, 2**32 + 1, range(2**32, 2**32 + 1), range(0, 4, 2)]:
+        try:
+            img.clear(layers=layers)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+
+
+def test_image_clear_layers_overflow(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r8unorm', array=4)
+    for layers in [2**70, range(2**70, 2**70 + 1), range(0, 2**70)]:
+        try:
+            img.clear(layers=layers)
+        except OverflowError:
+            pass
+        else:
+            raise AssertionError
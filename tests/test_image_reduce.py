@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import zengl
+
+
+def test_image_reduce(ctx: zengl.Context):
+    data = np.random.default_rng(1).random((37, 53, 4), 'f4')
+    img = ctx.image((53, 37), 'rgba32float', data)
+    np.testing.assert_allclose(img.reduce('sum'), data.sum(axis=(0, 1)), rtol=1e-4)
+    np.testing.assert_allclose(img.reduce('mean'), data.mean(axis=(0, 1)), rtol=1e-4)
+    np.testing.assert_allclose(img.reduce('min'), data.min(axis=(0, 1)))
+    np.testing.assert_allclose(img.reduce('max'), data.max(axis=(0, 1)))
+    np.testing.assert_allclose(img.reduce('max', (10, 5, 7, 9)), data[5:14, 10:17].max(axis=(0, 1)))
+
+
+def test_image_reduce_single_component(ctx: zengl.Context):
+    data = np.arange(64, dtype='f4').reshape(8, 8)
+    img = ctx.image((8, 8), 'r32float', data)
+    assert img.reduce('max') == 63.0
+    assert img.reduce('mean') == pytest.approx(31.5)
+
+
+def test_image_reduce_multisampled(ctx: zengl.Context):
+    img = ctx.image((8, 8), 'rgba16float', samples=4)
+    img.clear_value = (0.5, 1.0, 2.0, 1.0)
+    img.clear()
+    assert img.reduce('sum') == pytest.approx((32.0, 64.0, 128.0, 64.0))
+
+
+def test_image_reduce_depth(ctx: zengl.Context):
+    img = ctx.image((16, 16), 'depth32float')
+    img.clear_value = 0.25
+    img.clear()
+    assert img.reduce('min') == pytest.approx(0.25)
+
+
+def test_image_reduce_many_passes(ctx: zengl.Context):
+    data = np.random.default_rng(2).random((200, 300), 'f4')
+    img = ctx.image((300, 200), 'r32float', data)
+    objects = len(ctx.gc())
+    assert img.reduce('max') == data.max()
+    np.testing.assert_allclose(img.reduce('sum'), data.sum(), rtol=1e-4)
+    assert len(ctx.gc()) <= objects + 2
+
+
+def test_image_histogram(ctx: zengl.Context):
+    data = np.zeros((4, 4, 4), 'u1')
+    data[:1] = 255
+    data[1:2] = 128
+    img = ctx.image((4, 4), 'rgba8unorm', data)
+    assert img.histogram(4) == [8, 0, 4, 4]
+    assert img.histogram(2, region=(0, 0, 4, 1)) == [0, 4]
+
+
+def test_image_histogram_without_float_blend(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    ctx.info['float_blend'] = False
+    try:
+        with pytest.raises(RuntimeError):
+            img.histogram()
+    finally:
+        ctx.info['float_blend'] = True
+
+
+def test_image_reduce_invalid(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    with pytest.raises(ValueError):
+        img.reduce('median')
+    with pytest.raises(ValueError):
+        img.reduce('sum', (2, 2, 4, 4))
+    with pytest.raises(TypeError):
+        ctx.image((4, 4), 'rgba8uint').reduce('sum')
+    with pytest.raises(TypeError):
+        ctx.image((4, 4), 'rgba8unorm', array=2).histogram()
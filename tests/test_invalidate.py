@@ -0,0 +1,91 @@
+import numpy as np
+import zengl
+
+
+def make_pipeline(ctx, framebuffer, discard):
+    return ctx.pipeline(
+        vertex_shader='''
+            #version 330 core
+
+            vec2 positions[3] = vec2[](
+                vec2(-1.0, -1.0),
+                vec2(3.0, -1.0),
+                vec2(-1.0, 3.0)
+            );
+
+            void main() {
+                gl_Position = vec4(positions[gl_VertexID], 0.0, 1.0);
+            }
+        ''',
+        fragment_shader='''
+            #version 330 core
+
+            layout (location = 0) out vec4 out_color;
+
+            void main() {
+                out_color = vec4(0.0, 1.0, 0.0, 1.0);
+            }
+        ''',
+        framebuffer=framebuffer,
+        depth={'func': 'less', 'write': True},
+        discard=discard,
+        viewport=(0, 0, 4, 4),
+        topology='triangles',
+        vertex_count=3,
+    )
+
+
+def test_pipeline_discard(ctx: zengl.Context):
+    image = ctx.image((4, 4), 'rgba8unorm')
+    depth = ctx.image((4, 4), 'depth24plus')
+    image.clear()
+    depth.clear()
+    pipeline = make_pipeline(ctx, [image, depth], [depth, depth.face()])
+    pipeline.render()
+    pipeline.render()
+    pipeline.invalidate()
+    assert image.read() == b'\x00\xff\x00\xff' * 16
+
+
+def test_pipeline_discard_multisample(ctx: zengl.Context):
+    image = ctx.image((4, 4), 'rgba8unorm', samples=4)
+    depth = ctx.image((4, 4), 'depth24plus', samples=4)
+    output = ctx.image((4, 4), 'rgba8unorm')
+    image.clear()
+    depth.clear()
+    pipeline = make_pipeline(ctx, [image, depth], [depth])
+    pipeline.render()
+    pipeline.invalidate()
+    image.resolve(output)
+    image.invalidate()
+    assert output.read() == b'\x00\xff\x00\xff' * 16
+
+
+def test_pipeline_discard_invalid(ctx: zengl.Context):
+    image = ctx.image((4, 4), 'rgba8unorm')
+    depth = ctx.image((4, 4), 'depth24plus')
+    other = ctx.image((4, 4), 'rgba8unorm')
+    for framebuffer, discard in [([image, depth], [other]), (None, [image])]:
+        try:
+            make_pipeline(ctx, framebuffer, discard)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+
+
+def test_image_invalidate(ctx: zengl.Context):
+    image = ctx.image((4, 4), 'rgba8unorm', np.zeros((2, 4, 4, 4), 'u1'), array=2)
+    depth = ctx.image((4, 4), 'depth24plus')
+    image.invalidate()
+    image.invalidate(layers=1)
+    depth.invalidate()
+    image.clear()
+    assert image.face(1).read() == b'\x00\x00\x00\x00' * 16
+    for kwargs in [{'layers': 2}, {'level': 1}]:
+        try:
+            image.invalidate(**kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
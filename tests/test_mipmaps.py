@@ -0,0 +1,42 @@
+import numpy as np
+import zengl
+
+
+def test_mipmaps_layers(ctx: zengl.Context):
+    data = np.zeros((3, 4, 4, 4), 'u1')
+    data[:] = (0, 128, 0, 255)
+    img = ctx.image((4, 4), 'rgba8unorm', data, array=3, levels=3)
+    img.face(0, 2).clear()
+    img.face(2, 2).clear()
+    img.mipmaps(layers=1)
+    assert img.face(1, 2).read() == b'\x00\x80\x00\xff'
+    assert img.face(0, 2).read() == b'\x00\x00\x00\x00'
+    assert img.face(2, 2).read() == b'\x00\x00\x00\x00'
+
+
+def test_mipmaps_range(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', np.full((4, 4, 4), 255, 'u1'), levels=3)
+    img.face(0, 1).clear()
+    img.face(0, 2).clear()
+    img.mipmaps(base=0, top=1)
+    assert img.face(0, 1).read() == b'\xff\xff\xff\xff' * 4
+    assert img.face(0, 2).read() == b'\x00\x00\x00\x00'
+    img.mipmaps(base=1)
+    assert img.face(0, 2).read() == b'\xff\xff\xff\xff'
+
+
+def test_mipmaps_invalid(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', levels=3)
+    for kwargs in [{'base': 3}, {'top': 0}, {'top': 3}, {'layers': 1}]:
+        try:
+            img.mipmaps(**kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+
+
+def test_mipmaps_layers_integer(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8uint', np.full((2, 4, 4, 4), 9, 'u1'), array=2, levels=3)
+    img.mipmaps(layers=range(0, 2))
+    assert img.face(1, 2).read() == b'\x09' * 4
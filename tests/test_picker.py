@@ -0,0 +1,44 @@
+import numpy as np
+import zengl
+
+
+def test_picker_pick(ctx: zengl.Context):
+    picker = ctx.picker((8, 4))
+    ids = np.zeros((4, 8), 'u4')
+    ids[1:3, 2:4] = 7
+    ids[0, 7] = 300
+    picker.image.write(ids)
+    a = picker.pick(2, 1)
+    b = picker.pick(7, 0)
+    c = picker.pick(0, 3)
+    assert a.read() == 7
+    assert b.read() == 300
+    assert c.read() == 0
+    assert picker.framebuffer == [picker.image, picker.depth]
+
+
+def test_picker_select(ctx: zengl.Context):
+    picker = ctx.picker((8, 4), depth=False, max_id=1000)
+    ids = np.zeros((4, 8), 'u4')
+    ids[1:3, 2:4] = 7
+    ids[0, 7] = 300
+    ids[3, 0] = 1001
+    picker.image.write(ids)
+    everything = picker.select((0, 0, 8, 4))
+    left = picker.select((0, 0, 4, 4))
+    assert everything.read() == [7, 300]
+    assert left.read() == [7]
+    picker.clear()
+    assert picker.select((0, 0, 8, 4)).read() == []
+    assert picker.framebuffer == [picker.image]
+
+
+def test_picker_invalid(ctx: zengl.Context):
+    picker = ctx.picker((8, 4))
+    for call in [lambda: picker.pick(8, 0), lambda: picker.select((4, 0, 5, 4)), lambda: ctx.picker((0, 4))]:
+        try:
+            call()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
@@ -1,3 +1,5 @@
+import numpy as np
+import pytest
 import zengl
 
 
@@ -33,3 +35,153 @@ def test_image_read_to_buffer_offset(ctx: zengl.Context):
     buf = ctx.buffer(b'UUUUUUUU' + b'BBBB' * 16 + b'VVVVVVVV')
     img.read(into=buf.view(64, 8))
     assert buf.read() == b'UUUUUUUU' + b'AAAA' * 16 + b'VVVVVVVV'
+
+
+def test_image_write_strided(ctx: zengl.Context):
+    pixels = np.random.randint(0, 255, (8, 8, 4), 'u1')
+    img = ctx.image((3, 5), 'rgba8unorm')
+    img.write(pixels[1:6, 2:5], zero_copy_only=True)
+    np.testing.assert_array_equal(np.frombuffer(img.read(), 'u1').reshape(5, 3, 4), pixels[1:6, 2:5])
+
+
+def test_image_write_transposed(ctx: zengl.Context):
+    pixels = np.random.randint(0, 255, (4, 4, 4), 'u1')
+    img = ctx.image((4, 4), 'rgba8unorm')
+    img.write(pixels.transpose(1, 0, 2))
+    np.testing.assert_array_equal(np.frombuffer(img.read(), 'u1').reshape(4, 4, 4), pixels.transpose(1, 0, 2))
+
+
+def test_image_write_strided_array(ctx: zengl.Context):
+    pixels = np.random.randint(0, 255, (2, 4, 6, 4), 'u1')
+    img = ctx.image((4, 4), 'rgba8unorm', array=2)
+    img.write(pixels[:, :, 1:5])
+    np.testing.assert_array_equal(np.frombuffer(img.read(), 'u1').reshape(2, 4, 4, 4), pixels[:, :, 1:5])
+
+
+def test_image_write_row_length(ctx: zengl.Context):
+    pixels = np.random.randint(0, 255, (8, 8, 4), 'u1')
+    img = ctx.image((3, 2), 'rgba8unorm')
+    img.write(pixels[2:].reshape(-1)[5 * 4:], row_length=8)
+    np.testing.assert_array_equal(np.frombuffer(img.read(), 'u1').reshape(2, 3, 4), pixels[2:4, 5:8])
+
+
+def test_image_odd_width_alignment(ctx: zengl.Context):
+    pixels = np.random.randint(0, 255, (3, 5), 'u1')
+    img = ctx.image((5, 3), 'r8unorm')
+    img.write(pixels, alignment=1)
+    assert img.read() == pixels.tobytes()
+    padded = np.frombuffer(img.read(alignment=4), 'u1')
+    assert padded.size == 8 * 2 + 5
+    np.testing.assert_array_equal(padded[8:13], pixels[1])
+
+
+def test_image_read_row_length(ctx: zengl.Context):
+    pixels = np.random.randint(0, 255, (4, 4, 4), 'u1')
+    img = ctx.image((4, 4), 'rgba8unorm', pixels)
+    tiles = np.zeros((4, 8, 4), 'u1')
+    img.read((2, 4), (2, 0), into=memoryview(tiles).cast('B')[4 * 4:], row_length=8)
+    np.testing.assert_array_equal(tiles[:, 4:6], pixels[:, 2:4])
+    assert not tiles[:, :4].any() and not tiles[:, 6:].any()
+
+
+def test_image_write_all(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', array=2, levels=3)
+    chain = [np.random.randint(0, 255, (2, 4 >> level, 4 >> level, 4), 'u1') for level in range(3)]
+    img.write_all(b''.join(level.tobytes() for level in chain))
+    for level in range(3):
+        for layer in range(2):
+            pixels = np.frombuffer(img.face(layer, level).read(), 'u1').reshape(chain[level][layer].shape)
+            np.testing.assert_array_equal(pixels, chain[level][layer])
+
+
+def test_image_write_all_tight(ctx: zengl.Context):
+    img = ctx.image((5, 3), 'r8unorm', levels=3)
+    chain = [np.random.randint(0, 255, shape, 'u1') for shape in [(3, 5), (1, 2), (1, 1)]]
+    buf = ctx.buffer(b''.join(level.tobytes() for level in chain))
+    img.write_all(buf, alignment=1)
+    for level in range(3):
+        assert img.face(0, level).read() == chain[level].tobytes()
+
+
+def test_image_read_all(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', cubemap=True, levels=3)
+    data = np.random.randint(0, 255, 6 * (16 + 4 + 1) * 4, 'u1').tobytes()
+    img.write_all(data)
+    assert img.read_all() == data
+    assert img.read_all(levels=1) == data[:6 * 64]
+    buf = ctx.buffer(size=len(data))
+    img.read_all(into=buf)
+    assert buf.read() == data
+
+
+def test_image_read_all_renderbuffer(ctx: zengl.Context):
+    img = ctx.image((3, 3), 'r8unorm', texture=False)
+    img.clear_value = 1.0
+    img.clear()
+    assert img.read_all() == b'\xff' * 9
+    padded = img.read_all(alignment=4)
+    assert len(padded) == 12 and padded[0:3] == padded[4:7] == padded[8:11] == b'\xff' * 3
+
+
+def test_image_read_format(ctx: zengl.Context):
+    pixels = np.array([[[1.0, 0.5, 0.0, 1.0]] * 3] * 2, 'f4')
+    img = ctx.image((3, 2), 'rgba32float', pixels)
+    assert img.read(format='rgb8unorm') == bytes([255, 128, 0]) * 6
+    assert img.read(format='bgra8unorm') == bytes([0, 128, 255, 255]) * 6
+    np.testing.assert_array_equal(np.frombuffer(img.read(format='r32float'), 'f4'), [1.0] * 6)
+    np.testing.assert_array_equal(np.frombuffer(img.face().read(format='rg16float'), 'f2'), [1.0, 0.5] * 6)
+
+
+def test_image_read_format_invalid(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'r32uint')
+    with pytest.raises(TypeError):
+        img.read(format='rgba8unorm')
+    img = ctx.image((4, 4), 'rgba8unorm')
+    with pytest.raises(ValueError):
+        img.read(format='rgb9unorm')
+
+
+def test_image_write_format(ctx: zengl.Context):
+    img = ctx.image((4, 2), 'rgba8unorm')
+    img.write(bytes([30, 20, 10, 255]) * 8, format='bgra8unorm')
+    assert img.read() == bytes([10, 20, 30, 255]) * 8
+    img.write(bytes([1, 2, 3]) * 8, format='rgb8unorm')
+    assert img.read() == bytes([1, 2, 3, 255]) * 8
+    img.write(bytes([3, 2, 1]) * 4, (2, 2), (2, 0), format='bgr8unorm', alignment=1)
+    assert img.read(size=(2, 2), offset=(2, 0)) == bytes([1, 2, 3, 255]) * 4
+    img.write_async(bytes([6, 5, 4, 255]) * 8, format='bgra8unorm')
+    assert img.read() == bytes([4, 5, 6, 255]) * 8
+
+
+def test_image_write_format_float(ctx: zengl.Context):
+    img = ctx.image((2, 2), 'rgba32float')
+    img.write(bytes([255, 0, 0, 255]) * 4, format='bgra8unorm')
+    np.testing.assert_array_equal(np.frombuffer(img.read(), 'f4'), [0.0, 0.0, 1.0, 1.0] * 4)
+    with pytest.raises(TypeError):
+        ctx.image((4, 4), 'r32sint').write(bytes(16), format='r8unorm')
+
+
+def test_image_write_layers_from_sequence(ctx: zengl.Context):
+    faces = [np.full((4, 4, 4), i * 40, 'u1') for i in range(6)]
+    img = ctx.image((4, 4), 'rgba8unorm', cubemap=True)
+    img.write(faces)
+    assert img.read() == b''.join(face.tobytes() for face in faces)
+    buffer = ctx.buffer(b''.join(face.tobytes() for face in faces))
+    img.write([buffer.view(64, i * 64) for i in reversed(range(6))])
+    assert img.face(0).read() == faces[5].tobytes()
+    with pytest.raises(ValueError):
+        img.write(faces[:5])
+
+
+def test_image_read_layers_into(ctx: zengl.Context):
+    data = np.arange(3 * 4 * 4 * 4, dtype='u1').reshape(3, 4, 4, 4)
+    img = ctx.image((4, 4), 'rgba8unorm', data, array=3)
+    targets = [bytearray(64) for _ in range(3)]
+    assert img.read(into=targets) is None
+    assert targets == [bytearray(layer.tobytes()) for layer in data]
+    packed = np.zeros((3, 4, 4, 4), 'u1')
+    assert img.read(into=packed) is None
+    np.testing.assert_array_equal(packed, data)
+    buffer = ctx.buffer(size=3 * 64 + 16)
+    img.read(into=buffer.view(192, 16))
+    assert buffer.read(192, 16) == data.tobytes()
@@ -0,0 +1,65 @@
+import sys
+
+import numpy as np
+import zengl
+
+
+def test_read_async(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    img.clear_value = (1.0, 0.0, 0.0, 1.0)
+    img.clear()
+    readback = img.read_async()
+    img.clear_value = (0.0, 1.0, 0.0, 1.0)
+    img.clear()
+    assert readback.size == 64
+    assert bytes(readback.read()) == b'\xff\x00\x00\xff' * 16
+    assert readback.ready
+    assert bytes(img.read_async(size=(2, 1), offset=(1, 1)).read()) == b'\x00\xff\x00\xff' * 2
+
+
+def test_read_async_ring(ctx: zengl.Context):
+    img = ctx.image((3, 3), 'r8unorm')
+    readbacks = []
+    for i in range(10):
+        img.clear_value = i / 255.0
+        img.clear()
+        readbacks.append(img.read_async())
+    for i, readback in enumerate(readbacks):
+        assert bytes(readback.read()) == bytes([i]) * 9
+
+
+def test_read_async_layers(ctx: zengl.Context):
+    img = ctx.image((2, 2), 'rgba8unorm', array=3)
+    pixels = np.random.randint(0, 255, (3, 2, 2, 4), 'u1')
+    img.write(pixels)
+    readback = img.read_async()
+    face = img.face(layer=1).read_async()
+    np.testing.assert_array_equal(np.frombuffer(readback.read(), 'u1').reshape(3, 2, 2, 4), pixels)
+    np.testing.assert_array_equal(np.frombuffer(face.read(), 'u1').reshape(2, 2, 4), pixels[1])
+
+
+def test_read_async_multisampled(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', samples=4)
+    img.clear_value = (0.0, 1.0, 0.0, 1.0)
+    img.clear()
+    assert bytes(img.read_async().read()) == b'\x00\xff\x00\xff' * 16
+
+
+def test_read_async_release(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    img.clear_value = (0.0, 0.0, 1.0, 1.0)
+    img.clear()
+    readback = img.read_async()
+    ctx.release(img)
+    assert readback.ready
+    assert bytes(readback.read()) == b'\x00\x00\xff\xff' * 16
+
+
+def test_read_async_no_cycle(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    refcount = sys.getrefcount(img)
+    readback = img.read_async()
+    assert sys.getrefcount(img) == refcount
+    ctx.release(img)
+    assert sys.getrefcount(img) == refcount - 1
+    assert len(bytes(readback.read())) == 64
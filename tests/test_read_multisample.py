@@ -6,3 +6,44 @@ def test_read_multisampled_image(ctx: zengl.Context):
     img.clear_value = (0.0, 1.0, 0.0, 1.0)
     img.clear()
     assert img.read() == b'\x00\xff\x00\xff' * 16
+
+
+def test_read_multisampled_image_reuses_resolve_target(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', samples=4)
+    img.clear_value = (1.0, 0.0, 0.0, 1.0)
+    img.clear()
+    img.read()
+    objects = len(ctx.gc())
+    assert img.read(size=(4, 4)) == b'\xff\x00\x00\xff' * 16
+    assert len(ctx.gc()) == objects
+    assert img.read((2, 2), (1, 1)) == b'\xff\x00\x00\xff' * 4
+    assert len(ctx.gc()) == objects
+    ctx.release(img)
+    assert len(ctx.gc()) == 0
+
+
+def test_resolve(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', samples=4)
+    img.clear_value = (0.0, 0.0, 1.0, 1.0)
+    img.clear()
+    resolved = img.resolve()
+    assert resolved.samples == 1
+    assert img.resolve() is resolved
+    assert resolved.read() == b'\x00\x00\xff\xff' * 16
+    target = ctx.image((4, 4), 'rgba8unorm')
+    assert img.resolve(target) is target
+    assert target.read() == b'\x00\x00\xff\xff' * 16
+
+
+def test_resolve_survives_partial_reads(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm', samples=4)
+    img.clear_value = (0.0, 0.0, 1.0, 1.0)
+    img.clear()
+    resolved = img.resolve()
+    assert img.read((2, 2), (1, 1)) == b'\x00\x00\xff\xff' * 4
+    assert img.read_async((1, 1), (3, 3)).read() == b'\x00\x00\xff\xff'
+    assert resolved in ctx.gc()
+    assert img.resolve() is resolved
+    assert resolved.read() == b'\x00\x00\xff\xff' * 16
+    ctx.release(resolved)
+    assert img.read((2, 2), (2, 2)) == b'\x00\x00\xff\xff' * 4
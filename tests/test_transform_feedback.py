@@ -0,0 +1,111 @@
+import sys
+
+import numpy as np
+import pytest
+import zengl
+
+
+def test_transform_feedback(ctx: zengl.Context):
+    vertex_buffer = ctx.buffer(np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], 'f4'))
+    output = ctx.buffer(size=36)
+    pipeline = ctx.pipeline(
+        vertex_shader='''
+            #version 330 core
+
+            layout (location = 0) in vec2 in_value;
+
+            out vec2 out_value;
+            out float out_sum;
+
+            void main() {
+                out_value = in_value * 2.0;
+                out_sum = in_value.x + in_value.y;
+            }
+        ''',
+        feedback={'varyings': ['out_value', 'out_sum'], 'buffer': output},
+        topology='points',
+        vertex_buffers=zengl.bind(vertex_buffer, '2f', 0),
+        vertex_count=3,
+    )
+
+    pipeline.render()
+    values = np.frombuffer(output.read(), 'f4').reshape(3, 3)
+    np.testing.assert_array_almost_equal(values, [[2.0, 4.0, 3.0], [6.0, 8.0, 7.0], [10.0, 12.0, 11.0]])
+
+
+def test_transform_feedback_ping_pong(ctx: zengl.Context):
+    buffers = [ctx.buffer(np.array([0.0, 1.0, 2.0, 3.0], 'f4')), ctx.buffer(size=16)]
+    pipelines = []
+    for src, dst in [(0, 1), (1, 0)]:
+        pipelines.append(ctx.pipeline(
+            vertex_shader='''
+                #version 330 core
+
+                layout (location = 0) in float in_value;
+
+                out float out_value;
+
+                void main() {
+                    out_value = in_value + 10.0;
+                }
+            ''',
+            feedback={'varyings': ['out_value'], 'buffer': buffers[dst].view(16)},
+            topology='points',
+            vertex_buffers=zengl.bind(buffers[src], '1f', 0),
+            vertex_count=4,
+        ))
+
+    for i in range(3):
+        pipelines[i % 2].render()
+
+    np.testing.assert_array_almost_equal(np.frombuffer(buffers[1].read(), 'f4'), [30.0, 31.0, 32.0, 33.0])
+
+
+def test_transform_feedback_invalid(ctx: zengl.Context):
+    output = ctx.buffer(size=16)
+    with pytest.raises(ValueError):
+        ctx.pipeline(
+            vertex_shader='#version 330 core\nout float value;\nvoid main() { value = 1.0; }',
+            feedback={'varyings': 'value', 'buffer': output},
+            topology='points',
+        )
+    with pytest.raises(TypeError):
+        ctx.pipeline(
+            vertex_shader='#version 330 core\nout float value;\nvoid main() { value = 1.0; }',
+            feedback={'varyings': ['value'], 'buffer': b'data'},
+            topology='points',
+        )
+    with pytest.raises(ValueError):
+        ctx.pipeline(
+            vertex_shader='#version 330 core\nout float value;\nvoid main() { value = 1.0; }',
+            feedback={'varyings': ['value'] * 65, 'buffer': output},
+            topology='points',
+        )
+
+
+def test_transform_feedback_resized_buffer(ctx: zengl.Context):
+    output = ctx.buffer(size=4)
+    pipeline = ctx.pipeline(
+        vertex_shader='#version 330 core\nout float value;\nvoid main() { value = float(gl_VertexID + 1); }',
+        feedback={'varyings': ['value'], 'buffer': output},
+        topology='points',
+        vertex_count=1,
+    )
+    output.resize(12)
+    pipeline.vertex_count = 3
+    pipeline.render()
+    np.testing.assert_array_almost_equal(np.frombuffer(output.read(), 'f4'), [1.0, 2.0, 3.0])
+
+
+def test_transform_feedback_failure_releases_buffer(ctx: zengl.Context):
+    output = ctx.buffer(size=16)
+    pipeline = ctx.pipeline(
+        vertex_shader='#version 330 core\nout float value;\nvoid main() { value = 1.0; }',
+        feedback={'varyings': ['value'], 'buffer': output},
+        topology='points',
+    )
+    refcount = sys.getrefcount(output)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            ctx.pipeline(template=pipeline, feedback={'varyings': ['other'], 'buffer': output})
+    assert sys.getrefcount(output) == refcount
@@ -0,0 +1,37 @@
+import zengl
+
+
+def test_transient_aliasing(ctx: zengl.Context):
+    a = ctx.transient((64, 64), 'rgba8unorm')
+    b = ctx.transient((64, 64), 'rgba8unorm')
+    assert a is not b
+    ctx.release(a)
+    c = ctx.transient((64, 64), 'rgba8unorm')
+    assert c is a
+    d = ctx.transient((64, 64), 'r32float')
+    assert d is not a and d is not b
+    assert d.format == 'r32float'
+    assert len(ctx.gc()) == 3
+
+
+def test_transient_end_frame(ctx: zengl.Context):
+    ctx.new_frame()
+    a = ctx.transient((32, 32))
+    b = ctx.transient((32, 32), samples=4)
+    ctx.end_frame()
+    ctx.new_frame()
+    assert ctx.transient((32, 32)) is a
+    ctx.end_frame()
+    assert len(ctx.gc()) == 1
+    ctx.new_frame()
+    ctx.end_frame()
+    assert len(ctx.gc()) == 0
+    assert ctx.transient((32, 32), samples=4) is not b
+
+
+def test_transient_resize(ctx: zengl.Context):
+    for size in [(16, 16), (24, 16), (32, 16)]:
+        ctx.new_frame()
+        ctx.transient(size, 'rgba16float')
+        ctx.end_frame()
+    assert len(ctx.gc()) == 1
@@ -0,0 +1,25 @@
+import numpy as np
+import zengl
+
+
+def test_write_async(ctx: zengl.Context):
+    img = ctx.image((4, 4), 'rgba8unorm')
+    frames = [np.random.randint(0, 255, (4, 4, 4), 'u1') for _ in range(5)]
+    for frame in frames:
+        img.write_async(frame)
+        np.testing.assert_array_equal(np.frombuffer(img.read(), 'u1').reshape(4, 4, 4), frame)
+
+
+def test_write_async_sub_region(ctx: zengl.Context):
+    img = ctx.image((5, 3), 'r8unorm', b'\x00' * 24)
+    img.write_async(b'\xff' * 4, (2, 2), (1, 1))
+    pixels = np.frombuffer(img.read(), 'u1').reshape(3, 5)
+    np.testing.assert_array_equal(pixels[1:3, 1:3], 255)
+    assert pixels.sum() == 255 * 4
+
+
+def test_write_async_strided_array(ctx: zengl.Context):
+    img = ctx.image((2, 2), 'rgba8unorm', array=3)
+    pixels = np.random.randint(0, 255, (3, 2, 4, 4), 'u1')
+    img.write_async(pixels[:, :, ::2])
+    np.testing.assert_array_equal(np.frombuffer(img.read(), 'u1').reshape(3, 2, 2, 4), pixels[:, :, ::2])
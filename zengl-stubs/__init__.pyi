@@ -1,4 +1,4 @@
-from typing import Any, Dict, Iterable, List, Literal, Protocol, Tuple, TypedDict
+from typing import Any, Callable, Dict, Iterable, List, Literal, Protocol, Tuple, TypedDict
 
 CullFace = Literal['front', 'back', 'front_and_back', 'none']
 Topology = Literal['points', 'lines', 'line_loop', 'line_strip', 'triangles', 'triangle_strip', 'triangle_fan']
@@ -150,6 +150,39 @@ ImageFormat = Literal[
     'depth24plus',
     'depth24plus-stencil8',
     'depth32float',
+    'bc1-rgba-unorm',
+    'bc3-rgba-unorm',
+    'bc4-r-unorm',
+    'bc4-r-snorm',
+    'bc5-rg-unorm',
+    'bc5-rg-snorm',
+    'bc7-rgba-unorm',
+    'etc2-rgb8unorm',
+    'etc2-rgb8a1unorm',
+    'etc2-rgba8unorm',
+    'eac-r11unorm',
+    'eac-r11snorm',
+    'eac-rg11unorm',
+    'eac-rg11snorm',
+]
+
+PixelFormat = Literal[
+    'r8unorm',
+    'rg8unorm',
+    'rgb8unorm',
+    'bgr8unorm',
+    'rgba8unorm',
+    'bgra8unorm',
+    'r16unorm',
+    'rgba16unorm',
+    'r16float',
+    'rg16float',
+    'rgb16float',
+    'rgba16float',
+    'r32float',
+    'rg32float',
+    'rgb32float',
+    'rgba32float',
 ]
 
 BufferAccess = Literal[
@@ -175,6 +208,10 @@ class LayoutBinding(TypedDict, total=False):
     name: str
     binding: int
 
+class FeedbackSettings(TypedDict, total=False):
+    varyings: Iterable[str]
+    buffer: Buffer | BufferView
+
 class BufferResource(TypedDict, total=False):
     type: Literal['uniform_buffer']
     binding: int
@@ -245,6 +282,24 @@ class Info(TypedDict):
     max_vertex_attribs: int
     max_draw_buffers: int
     max_samples: int
+    float_blend: bool
+    compressed_formats: List[str]
+
+class Readback:
+    size: int
+    ready: bool
+    def read(self) -> memoryview: ...
+
+class FrameRecorder:
+    image: Image
+    depth: int
+    frames: int
+    def __init__(self, image: Image, depth: int = 3, sink: Callable[[memoryview], Any] | None = None) -> None: ...
+    def capture(self) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> FrameRecorder: ...
+    def __exit__(self, *args: Any) -> None: ...
 
 class ImageFace:
     image: Image
@@ -252,6 +307,7 @@ class ImageFace:
     samples: int
     color: bool
     def clear(self) -> None: ...
+    def read_async(self, size: Tuple[int, int] | None = None, offset: Tuple[int, int] | None = None) -> Readback: ...
     def blit(
         self,
         target: ImageFace,
@@ -267,7 +323,10 @@ class ContextLoader(Protocol):
 class Buffer:
     size: int
     def read(self, size: int | None = None, offset: int = 0, into=None) -> bytes: ...
-    def write(self, data: Data, offset: int = 0) -> None: ...
+    def write(self, data: Data, offset: int = 0, *, zero_copy_only: bool = False) -> None: ...
+    def write_many(self, items: Iterable[Tuple[int, Data]] | Any, data: Data | None = None) -> None: ...
+    def write_from(self, source: Any, offset: int = 0, size: int | None = None, *, chunk: int = 16777216) -> int: ...
+    def resize(self, size: int, preserve: bool = True) -> None: ...
     def view(self, size: int | None = None, offset: int = 0) -> BufferView: ...
 
 class Image:
@@ -275,20 +334,52 @@ class Image:
     format: ImageFormat
     samples: int
     array: int
+    depth: int
     renderbuffer: bool
     clear_value: Iterable[int | float] | int | float
     def face(self, layer: int = 0, level: int = 0) -> ImageFace: ...
-    def clear(self) -> None: ...
+    def clear(self, rect: Viewport | None = None, layers: int | range | None = None, level: int = 0) -> None: ...
+    def invalidate(self, layers: int | range | None = None, level: int = 0) -> None: ...
     def write(
+        self,
+        data: Data | List[Data] | Tuple[Data, ...],
+        size: Tuple[int, int] | None = None,
+        offset: Tuple[int, int] | None = None,
+        layer: int | None = None,
+        level: int = 0,
+        *,
+        zero_copy_only: bool = False,
+        row_length: int = 0,
+        alignment: int = 4,
+        format: PixelFormat | None = None,
+    ) -> None: ...
+    def write_all(self, data: Data, levels: int | None = None, layers: int | None = None, *, alignment: int = 4) -> None: ...
+    def write_async(
         self,
         data: Data,
         size: Tuple[int, int] | None = None,
         offset: Tuple[int, int] | None = None,
         layer: int | None = None,
         level: int = 0,
+        *,
+        format: PixelFormat | None = None,
     ) -> None: ...
-    def mipmaps(self) -> None: ...
-    def read(self, size: Tuple[int, int] | None = None, offset: Tuple[int, int] | None = None, into=None) -> bytes: ...
+    def mipmaps(self, base: int = 0, top: int | None = None, layers: int | range | None = None) -> None: ...
+    def downsample_chain(self, levels: int | None = None, filter: bool = True) -> None: ...
+    def reduce(self, op: Literal['sum', 'min', 'max', 'mean'], region: Viewport | None = None) -> float | Tuple[float, ...]: ...
+    def histogram(self, bins: int = 256, range: Tuple[float, float] = (0.0, 1.0), region: Viewport | None = None) -> List[int]: ...
+    def read(
+        self,
+        size: Tuple[int, int] | None = None,
+        offset: Tuple[int, int] | None = None,
+        into=None,
+        *,
+        row_length: int = 0,
+        alignment: int = 1,
+        format: PixelFormat | None = None,
+    ) -> bytes: ...
+    def read_all(self, levels: int | None = None, into=None, *, alignment: int = 1) -> bytes: ...
+    def read_async(self, size: Tuple[int, int] | None = None, offset: Tuple[int, int] | None = None) -> Readback: ...
     def blit(
         self,
         target: Image | None = None,
@@ -297,6 +388,7 @@ class Image:
         crop: Viewport | None = None,
         filter: bool = False,
     ) -> None: ...
+    def resolve(self, target: Image | None = None) -> Image: ...
 
 class Pipeline:
     vertex_count: int
@@ -305,6 +397,29 @@ class Pipeline:
     viewport: Viewport
     uniforms: Dict[str, memoryview] | None
     def render(self) -> None: ...
+    def invalidate(self) -> None: ...
+
+class Atlas:
+    image: Image
+    size: Tuple[int, int]
+    layers: int
+    efficiency: float
+    def add(self, data: Data, size: Tuple[int, int] | None = None) -> Tuple[int, Tuple[float, float, float, float]]: ...
+    def flush(self) -> None: ...
+
+class PickResult:
+    ready: bool
+    def read(self) -> Any: ...
+
+class Picker:
+    image: Image
+    depth: Image | None
+    size: Tuple[int, int]
+    max_id: int
+    framebuffer: List[Image]
+    def pick(self, x: int, y: int) -> PickResult: ...
+    def select(self, rect: Viewport) -> PickResult: ...
+    def clear(self) -> None: ...
 
 class Context:
     info: Info
@@ -332,7 +447,12 @@ class Context:
         texture: bool | None = None,
         cubemap: bool = False,
         external: int = 0,
+        depth: int = 0,
     ) -> Image: ...
+    def atlas(self, size: Tuple[int, int], format: ImageFormat = 'rgba8unorm', layers: int = 1, padding: int = 1) -> Atlas: ...
+    def picker(self, size: Tuple[int, int], depth: bool = True, max_id: int = 65535) -> Picker: ...
+    def transient(self, size: Tuple[int, int], format: ImageFormat = 'rgba8unorm', samples: int = 1) -> Image: ...
+    def blit_many(self, blits: Iterable[Tuple[Image | ImageFace, Image | ImageFace | None, Viewport | None, bool]]) -> None: ...
     def pipeline(
         self,
         vertex_shader: str = ...,
@@ -357,6 +477,8 @@ class Context:
         viewport_data: memoryview | None = None,
         render_data: memoryview | None = None,
         includes: Dict[str, str] | None = None,
+        feedback: FeedbackSettings | None = None,
+        discard: Iterable[Image | ImageFace] | None = None,
         template: Pipeline = ...,
     ) -> Pipeline: ...
     def new_frame(self, reset: bool = True, clear: bool = True) -> None: ...
@@ -4,6 +4,9 @@
 #define MAX_ATTACHMENTS 8
 #define MAX_BUFFER_BINDINGS 8
 #define MAX_SAMPLER_BINDINGS 16
+#define MAX_FEEDBACK_VARYINGS 64
+#define UPLOAD_RING_SIZE 3
+#define FORMAT_COMPRESSED 8
 
 typedef struct VertexFormat {
     int type;
@@ -84,6 +87,7 @@ typedef struct ModuleState {
     PyObject * str_rgba8unorm;
     PyObject * default_loader;
     PyObject * default_context;
+    PyObject * frame_recorders;
     PyTypeObject * Context_type;
     PyTypeObject * Buffer_type;
     PyTypeObject * Image_type;
@@ -93,6 +97,7 @@ typedef struct ModuleState {
     PyTypeObject * DescriptorSet_type;
     PyTypeObject * GlobalSettings_type;
     PyTypeObject * GLObject_type;
+    PyTypeObject * Readback_type;
 } ModuleState;
 
 typedef struct GCHeader {
@@ -101,6 +106,8 @@ typedef struct GCHeader {
     struct GCHeader * gc_next;
 } GCHeader;
 
+typedef Py_ssize_t intptr;
+
 typedef struct GLObject {
     PyObject_HEAD
     int uses;
@@ -173,6 +180,8 @@ typedef struct Context {
     PyObject * program_cache;
     PyObject * shader_cache;
     PyObject * includes;
+    PyObject * transient_free;
+    PyObject * transient_images;
     GLObject * default_framebuffer;
     PyObject * info_dict;
     DescriptorSet * current_descriptor_set;
@@ -191,6 +200,10 @@ typedef struct Context {
     int is_gles;
     int is_webgl;
     int is_lost;
+    int has_clear_texture;
+    int has_invalidate_framebuffer;
+    int has_float_blend;
+    int has_compressed_formats;
     Limits limits;
 } Context;
 
@@ -201,7 +214,8 @@ typedef struct Buffer {
     Context * ctx;
     int buffer;
     int target;
-    int size;
+    intptr size;
+    intptr capacity;
     int access;
 } Buffer;
 
@@ -222,12 +236,33 @@ typedef struct Image {
     int samples;
     int array;
     int cubemap;
+    int depth;
     int target;
     int renderbuffer;
     int layer_count;
     int level_count;
+    PyObject * readbacks;
+    PyObject * readback_buffers;
+    int upload_buffers[UPLOAD_RING_SIZE];
+    void * upload_syncs[UPLOAD_RING_SIZE];
+    intptr upload_sizes[UPLOAD_RING_SIZE];
+    int upload_index;
+    PyObject * transient_key;
+    int transient_leased;
+    int transient_used;
+    struct Image * resolve_target;
 } Image;
 
+typedef struct Readback {
+    PyObject_HEAD
+    Context * ctx;
+    Image * image;
+    PyObject * data;
+    void * sync;
+    int buffer;
+    intptr size;
+} Readback;
+
 typedef struct RenderParameters {
     int vertex_count;
     int instance_count;
@@ -259,6 +294,13 @@ typedef struct Pipeline {
     int topology;
     int index_type;
     int index_size;
+    PyObject * feedback_varyings;
+    Buffer * feedback_buffer;
+    intptr feedback_offset;
+    intptr feedback_size;
+    int feedback_mode;
+    int discard_count;
+    int discard_attachments[MAX_ATTACHMENTS + 1];
 } Pipeline;
 
 typedef struct ImageFace {
@@ -278,12 +320,10 @@ typedef struct ImageFace {
 typedef struct BufferView {
     PyObject_HEAD
     Buffer * buffer;
-    int offset;
-    int size;
+    intptr offset;
+    intptr size;
 } BufferView;
 
-typedef Py_ssize_t intptr;
-
 #ifdef _WIN32
 #define GL __stdcall
 #else
@@ -296,6 +336,9 @@ typedef Py_ssize_t intptr;
 #define RESOLVE(type, name, ...) extern type GL name(__VA_ARGS__) __asm__("zengl_" # name)
 #endif
 
+#define GL_POINTS 0x0000
+#define GL_LINES 0x0001
+#define GL_TRIANGLES 0x0004
 #define GL_DEPTH_BUFFER_BIT 0x0100
 #define GL_STENCIL_BUFFER_BIT 0x0400
 #define GL_COLOR_BUFFER_BIT 0x4000
@@ -313,6 +356,7 @@ typedef Py_ssize_t intptr;
 #define GL_VENDOR 0x1F00
 #define GL_RENDERER 0x1F01
 #define GL_VERSION 0x1F02
+#define GL_EXTENSIONS 0x1F03
 #define GL_NEAREST 0x2600
 #define GL_LINEAR 0x2601
 #define GL_TEXTURE_MAG_FILTER 0x2800
@@ -345,7 +389,13 @@ typedef Py_ssize_t intptr;
 #define GL_PIXEL_PACK_BUFFER 0x88EB
 #define GL_PIXEL_UNPACK_BUFFER 0x88EC
 #define GL_TEXTURE_2D_ARRAY 0x8C1A
+#define GL_TEXTURE_3D 0x806F
+#define GL_TEXTURE_BASE_LEVEL 0x813C
+#define GL_TEXTURE_MAX_LEVEL 0x813D
 #define GL_DEPTH_STENCIL_ATTACHMENT 0x821A
+#define GL_MAJOR_VERSION 0x821B
+#define GL_MINOR_VERSION 0x821C
+#define GL_NUM_EXTENSIONS 0x821D
 #define GL_DEPTH_STENCIL 0x84F9
 #define GL_READ_FRAMEBUFFER 0x8CA8
 #define GL_DRAW_FRAMEBUFFER 0x8CA9
@@ -366,6 +416,32 @@ typedef Py_ssize_t intptr;
 #define GL_TEXTURE_CUBE_MAP_SEAMLESS 0x884F
 #define GL_PRIMITIVE_RESTART_FIXED_INDEX 0x8D69
 #define GL_TEXTURE_MAX_ANISOTROPY 0x84FE
+#define GL_R8 0x8229
+#define GL_UNPACK_ROW_LENGTH 0x0CF2
+#define GL_UNPACK_ALIGNMENT 0x0CF5
+#define GL_STREAM_DRAW 0x88E0
+#define GL_MAP_WRITE_BIT 0x0002
+#define GL_MAP_INVALIDATE_RANGE_BIT 0x0004
+#define GL_MAP_INVALIDATE_BUFFER_BIT 0x0008
+#define GL_MAP_UNSYNCHRONIZED_BIT 0x0020
+#define GL_PACK_ROW_LENGTH 0x0D02
+#define GL_PACK_ALIGNMENT 0x0D05
+#define GL_STREAM_READ 0x88E1
+#define GL_SYNC_GPU_COMMANDS_COMPLETE 0x9117
+#define GL_SYNC_FLUSH_COMMANDS_BIT 0x0001
+#define GL_ALREADY_SIGNALED 0x911A
+#define GL_CONDITION_SATISFIED 0x911C
+#define GL_SCISSOR_TEST 0x0C11
+#define GL_RGBA 0x1908
+#define GL_RGBA_INTEGER 0x8D99
+#define GL_INT 0x1404
+#define GL_FLOAT 0x1406
+#define GL_TIMEOUT_IGNORED 0xFFFFFFFFFFFFFFFFull
+
+#define READBACK_RING_SIZE 4
+#define GL_RASTERIZER_DISCARD 0x8C89
+#define GL_INTERLEAVED_ATTRIBS 0x8C8C
+#define GL_TRANSFORM_FEEDBACK_BUFFER 0x8C8E
 
 static int gl_initialized = 0;
 
@@ -382,7 +458,9 @@ RESOLVE(void, glReadBuffer, int);
 RESOLVE(void, glReadPixels, int, int, int, int, int, int, void *);
 RESOLVE(int, glGetError);
 RESOLVE(void, glGetIntegerv, int, int *);
+RESOLVE(void, glGetTexParameteriv, int, int, int *);
 RESOLVE(const char *, glGetString, int);
+RESOLVE(const char *, glGetStringi, int, int);
 RESOLVE(void, glViewport, int, int, int, int);
 RESOLVE(void, glTexSubImage2D, int, int, int, int, int, int, int, int, const void *);
 RESOLVE(void, glBindTexture, int, int);
@@ -390,6 +468,10 @@ RESOLVE(void, glDeleteTextures, int, const int *);
 RESOLVE(void, glGenTextures, int, int *);
 RESOLVE(void, glTexImage3D, int, int, int, int, int, int, int, int, int, const void *);
 RESOLVE(void, glTexSubImage3D, int, int, int, int, int, int, int, int, int, int, const void *);
+RESOLVE(void, glCompressedTexImage2D, int, int, int, int, int, int, int, const void *);
+RESOLVE(void, glCompressedTexImage3D, int, int, int, int, int, int, int, int, const void *);
+RESOLVE(void, glCompressedTexSubImage2D, int, int, int, int, int, int, int, int, const void *);
+RESOLVE(void, glCompressedTexSubImage3D, int, int, int, int, int, int, int, int, int, int, const void *);
 RESOLVE(void, glActiveTexture, int);
 RESOLVE(void, glBlendFuncSeparate, int, int, int, int);
 RESOLVE(void, glBindBuffer, int, int);
@@ -478,6 +560,21 @@ RESOLVE(void, glBindSampler, int, int);
 RESOLVE(void, glSamplerParameteri, int, int, int);
 RESOLVE(void, glSamplerParameterf, int, int, float);
 RESOLVE(void, glVertexAttribDivisor, int, int);
+RESOLVE(void, glTransformFeedbackVaryings, int, int, const char * const *, int);
+RESOLVE(void, glBeginTransformFeedback, int);
+RESOLVE(void, glEndTransformFeedback);
+RESOLVE(void, glBindBufferBase, int, int, int);
+RESOLVE(void, glPixelStorei, int, int);
+RESOLVE(void *, glMapBufferRange, int, intptr, intptr, int);
+RESOLVE(int, glUnmapBuffer, int);
+RESOLVE(void *, glFenceSync, int, int);
+RESOLVE(int, glClientWaitSync, void *, int, unsigned long long);
+RESOLVE(void, glDeleteSync, void *);
+RESOLVE(void, glGetTexImage, int, int, int, int, void *);
+RESOLVE(void, glGetCompressedTexImage, int, int, void *);
+RESOLVE(void, glScissor, int, int, int, int);
+RESOLVE(void, glClearTexSubImage, int, int, int, int, int, int, int, int, int, int, const void *);
+RESOLVE(void, glInvalidateFramebuffer, int, int, const int *);
 
 #ifndef EXTERN_GL
 
@@ -503,6 +600,7 @@ static void load_gl(PyObject * loader) {
 
     #define check(name) if (!name) { if (PyErr_Occurred()) return; PyList_Append(missing, PyUnicode_FromString(#name)); }
     #define load(name) *(void **)&name = load_opengl_function(loader_function, #name); check(name)
+    #define load_optional(name) *(void **)&name = load_opengl_function(loader_function, #name); if (PyErr_Occurred()) return
 
     load(glCullFace);
     load(glClear);
@@ -517,7 +615,9 @@ static void load_gl(PyObject * loader) {
     load(glReadPixels);
     load(glGetError);
     load(glGetIntegerv);
+    load(glGetTexParameteriv);
     load(glGetString);
+    load(glGetStringi);
     load(glViewport);
     load(glTexSubImage2D);
     load(glBindTexture);
@@ -525,6 +625,10 @@ static void load_gl(PyObject * loader) {
     load(glGenTextures);
     load(glTexImage3D);
     load(glTexSubImage3D);
+    load(glCompressedTexImage2D);
+    load(glCompressedTexImage3D);
+    load(glCompressedTexSubImage2D);
+    load(glCompressedTexSubImage3D);
     load(glActiveTexture);
     load(glBlendFuncSeparate);
     load(glBindBuffer);
@@ -613,7 +717,24 @@ static void load_gl(PyObject * loader) {
     load(glSamplerParameteri);
     load(glSamplerParameterf);
     load(glVertexAttribDivisor);
-
+    load(glTransformFeedbackVaryings);
+    load(glBeginTransformFeedback);
+    load(glEndTransformFeedback);
+    load(glBindBufferBase);
+    load(glPixelStorei);
+    load(glMapBufferRange);
+    load(glUnmapBuffer);
+    load(glFenceSync);
+    load(glClientWaitSync);
+    load(glDeleteSync);
+    load(glScissor);
+
+    load_optional(glGetTexImage);
+    load_optional(glGetCompressedTexImage);
+    load_optional(glClearTexSubImage);
+    load_optional(glInvalidateFramebuffer);
+
+    #undef load_optional
     #undef load
     #undef check
 
@@ -717,6 +838,10 @@ static int get_vertex_format(PyObject * helper, PyObject * name, VertexFormat *
     return 1;
 }
 
+static intptr compressed_size(ImageFormat * fmt, int width, int height) {
+    return (intptr)((width + 3) / 4) * ((height + 3) / 4) * fmt->pixel_size;
+}
+
 static int get_image_format(PyObject * helper, PyObject * name, ImageFormat * res) {
     PyObject * lookup = PyObject_GetAttrString(helper, "IMAGE_FORMAT");
     PyObject * tup = PyDict_GetItem(lookup, name);
@@ -798,6 +923,42 @@ static int valid_mem(PyObject * mem, Py_ssize_t size) {
     return size < 0 || mem_size == size;
 }
 
+static int row_pitch(Py_buffer * view, intptr row_size, intptr * pitch) {
+    if (view->suboffsets || !view->strides) {
+        return 0;
+    }
+    intptr inner = view->itemsize;
+    int dim = view->ndim - 1;
+    while (dim >= 0 && inner < row_size) {
+        if (view->shape[dim] != 1 && view->strides[dim] != inner) {
+            return 0;
+        }
+        inner *= view->shape[dim];
+        dim -= 1;
+    }
+    if (inner != row_size) {
+        return 0;
+    }
+    intptr res = 0;
+    intptr next = 0;
+    for (; dim >= 0; --dim) {
+        if (view->shape[dim] == 1) {
+            continue;
+        }
+        if (!res) {
+            res = view->strides[dim];
+            next = res * view->shape[dim];
+            continue;
+        }
+        if (view->strides[dim] != next) {
+            return 0;
+        }
+        next *= view->shape[dim];
+    }
+    *pitch = res ? res : row_size;
+    return *pitch >= row_size;
+}
+
 static int to_int_pair(IntPair * value, PyObject * obj, int x, int y) {
     if (obj != Py_None) {
         if (PySequence_Size(obj) != 2) {
@@ -964,7 +1125,7 @@ static GLObject * build_framebuffer(Context * self, PyObject * attachments) {
             glFramebufferRenderbuffer(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + i, GL_RENDERBUFFER, face->image->image);
         } else if (face->image->cubemap) {
             glFramebufferTexture2D(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + i, GL_TEXTURE_CUBE_MAP_POSITIVE_X + face->layer, face->image->image, face->level);
-        } else if (face->image->array) {
+        } else if (face->image->array || face->image->depth) {
             glFramebufferTextureLayer(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + i, face->image->image, face->level, face->layer);
         } else {
             glFramebufferTexture2D(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + i, GL_TEXTURE_2D, face->image->image, face->level);
@@ -979,7 +1140,7 @@ static GLObject * build_framebuffer(Context * self, PyObject * attachments) {
             glFramebufferRenderbuffer(GL_DRAW_FRAMEBUFFER, attachment, GL_RENDERBUFFER, face->image->image);
         } else if (face->image->cubemap) {
             glFramebufferTexture2D(GL_DRAW_FRAMEBUFFER, attachment, GL_TEXTURE_CUBE_MAP_POSITIVE_X + face->layer, face->image->image, face->level);
-        } else if (face->image->array) {
+        } else if (face->image->array || face->image->depth) {
             glFramebufferTextureLayer(GL_DRAW_FRAMEBUFFER, attachment, face->image->image, face->level, face->layer);
         } else {
             glFramebufferTexture2D(GL_DRAW_FRAMEBUFFER, attachment, GL_TEXTURE_2D, face->image->image, face->level);
@@ -1003,37 +1164,26 @@ static GLObject * build_framebuffer(Context * self, PyObject * attachments) {
     return res;
 }
 
-static GLObject * build_vertex_array(Context * self, PyObject * bindings) {
-    GLObject * cache = (GLObject *)PyDict_GetItem(self->vertex_array_cache, bindings);
-    if (cache) {
-        cache->uses += 1;
-        Py_INCREF((PyObject *)cache);
-        return cache;
-    }
-
+static int setup_vertex_array(Context * self, PyObject * bindings) {
     int length = (int)PyTuple_Size(bindings);
     PyObject * index_buffer = PyTuple_GetItem(bindings, 0);
 
-    int vertex_array = 0;
-    glGenVertexArrays(1, &vertex_array);
-    bind_vertex_array(self, vertex_array);
-
     for (int i = 1; i < length; i += 6) {
         Buffer * buffer = (Buffer *)PyTuple_GetItem(bindings, i + 0);
         int location = to_int(PyTuple_GetItem(bindings, i + 1));
-        int offset = to_int(PyTuple_GetItem(bindings, i + 2));
+        intptr offset = PyLong_AsSsize_t(PyTuple_GetItem(bindings, i + 2));
         int stride = to_int(PyTuple_GetItem(bindings, i + 3));
         int divisor = to_int(PyTuple_GetItem(bindings, i + 4));
         VertexFormat fmt;
         if (!get_vertex_format(self->module_state->helper, PyTuple_GetItem(bindings, i + 5), &fmt)) {
             PyErr_Format(PyExc_ValueError, "invalid vertex format");
-            return NULL;
+            return 0;
         }
         glBindBuffer(GL_ARRAY_BUFFER, buffer->buffer);
         if (fmt.integer) {
-            glVertexAttribIPointer(location, fmt.size, fmt.type, stride, (intptr)offset);
+            glVertexAttribIPointer(location, fmt.size, fmt.type, stride, offset);
         } else {
-            glVertexAttribPointer(location, fmt.size, fmt.type, fmt.normalize, stride, (intptr)offset);
+            glVertexAttribPointer(location, fmt.size, fmt.type, fmt.normalize, stride, offset);
         }
         glVertexAttribDivisor(location, divisor);
         glEnableVertexAttribArray(location);
@@ -1044,6 +1194,52 @@ static GLObject * build_vertex_array(Context * self, PyObject * bindings) {
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, buffer->buffer);
     }
 
+    return 1;
+}
+
+static GLObject * build_feedback_framebuffer(Context * self) {
+    GLObject * cache = (GLObject *)PyDict_GetItemString(self->framebuffer_cache, "feedback");
+    if (cache) {
+        cache->uses += 1;
+        Py_INCREF((PyObject *)cache);
+        return cache;
+    }
+
+    int renderbuffer = 0;
+    glGenRenderbuffers(1, &renderbuffer);
+    glBindRenderbuffer(GL_RENDERBUFFER, renderbuffer);
+    glRenderbufferStorageMultisample(GL_RENDERBUFFER, 0, GL_R8, 1, 1);
+
+    int framebuffer = 0;
+    glGenFramebuffers(1, &framebuffer);
+    bind_draw_framebuffer(self, framebuffer);
+    glFramebufferRenderbuffer(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, renderbuffer);
+
+    GLObject * res = PyObject_New(GLObject, self->module_state->GLObject_type);
+    res->obj = framebuffer;
+    res->uses = 1;
+    res->extra = PyLong_FromLong(renderbuffer);
+
+    PyDict_SetItemString(self->framebuffer_cache, "feedback", (PyObject *)res);
+    return res;
+}
+
+static GLObject * build_vertex_array(Context * self, PyObject * bindings) {
+    GLObject * cache = (GLObject *)PyDict_GetItem(self->vertex_array_cache, bindings);
+    if (cache) {
+        cache->uses += 1;
+        Py_INCREF((PyObject *)cache);
+        return cache;
+    }
+
+    int vertex_array = 0;
+    glGenVertexArrays(1, &vertex_array);
+    bind_vertex_array(self, vertex_array);
+
+    if (!setup_vertex_array(self, bindings)) {
+        return NULL;
+    }
+
     GLObject * res = PyObject_New(GLObject, self->module_state->GLObject_type);
     res->obj = vertex_array;
     res->uses = 1;
@@ -1280,8 +1476,13 @@ static PyObject * program_interface(Context * self, int program) {
     return Py_BuildValue("(NNN)", attributes, uniforms, uniform_buffers);
 }
 
-static GLObject * compile_program(Context * self, PyObject * includes, PyObject * vert, PyObject * frag, PyObject * layout) {
-    PyObject * tup = PyObject_CallMethod(self->module_state->helper, "program", "(OOOO)", vert, frag, layout, includes);
+static GLObject * compile_program(Context * self, PyObject * includes, PyObject * vert, PyObject * frag, PyObject * layout, PyObject * varyings) {
+    if (PyTuple_Size(varyings) > MAX_FEEDBACK_VARYINGS) {
+        PyErr_Format(PyExc_ValueError, "too many feedback varyings, the limit is %d", MAX_FEEDBACK_VARYINGS);
+        return NULL;
+    }
+
+    PyObject * tup = PyObject_CallMethod(self->module_state->helper, "program", "(OOOOO)", vert, frag, layout, includes, varyings);
     if (!tup) {
         return NULL;
     }
@@ -1315,6 +1516,16 @@ static GLObject * compile_program(Context * self, PyObject * includes, PyObject
     int program = glCreateProgram();
     glAttachShader(program, vertex_shader_obj);
     glAttachShader(program, fragment_shader_obj);
+
+    int varying_count = (int)PyTuple_Size(varyings);
+    if (varying_count) {
+        const char * varying_names[MAX_FEEDBACK_VARYINGS];
+        for (int i = 0; i < varying_count; ++i) {
+            varying_names[i] = PyUnicode_AsUTF8(PyTuple_GetItem(varyings, i));
+        }
+        glTransformFeedbackVaryings(program, varying_count, varying_names, GL_INTERLEAVED_ATTRIBS);
+    }
+
     glLinkProgram(program);
 
     int linked = 0;
@@ -1404,8 +1615,8 @@ static void clear_bound_image(Image * self) {
 static PyObject * blit_image_face(ImageFace * src, PyObject * target_arg, PyObject * offset_arg, PyObject * size_arg, PyObject * crop_arg, int filter) {
     if (Py_TYPE(target_arg) == src->image->ctx->module_state->Image_type) {
         Image * image = (Image *)target_arg;
-        if (image->array || image->cubemap) {
-            PyErr_Format(PyExc_TypeError, "cannot blit to whole cubemap or array images");
+        if (image->array || image->cubemap || image->depth) {
+            PyErr_Format(PyExc_TypeError, "cannot blit to whole cubemap, array or 3D images");
             return NULL;
         }
         target_arg = PyTuple_GetItem(image->layers, 0);
@@ -1428,6 +1639,11 @@ static PyObject * blit_image_face(ImageFace * src, PyObject * target_arg, PyObje
         return NULL;
     }
 
+    if ((src->image->fmt.flags | (target ? target->image->fmt.flags : 0)) & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot blit compressed images");
+        return NULL;
+    }
+
     Viewport crop;
     if (!to_viewport(&crop, crop_arg, 0, 0, src->width, src->height)) {
         PyErr_Format(PyExc_TypeError, "the crop must be a tuple of 4 ints");
@@ -1502,39 +1718,115 @@ static int parse_size_and_offset(ImageFace * self, PyObject * size_arg, PyObject
     return 1;
 }
 
-static PyObject * read_image_face(ImageFace * src, IntPair size, IntPair offset, PyObject * into) {
-    if (src->image->samples > 1) {
-        PyObject * temp = PyObject_CallMethod((PyObject *)src->image->ctx, "image", "((ii)O)", size.x, size.y, src->image->format);
+static int valid_alignment(int alignment) {
+    return alignment == 1 || alignment == 2 || alignment == 4 || alignment == 8;
+}
+
+static intptr row_stride(int width, int pixel_size, int row_length, int alignment) {
+    intptr row = (intptr)(row_length ? row_length : width) * pixel_size;
+    return (row + alignment - 1) / alignment * alignment;
+}
+
+static int parse_pixel_store(int width, int row_length, int alignment) {
+    if (row_length && row_length < width) {
+        PyErr_Format(PyExc_ValueError, "the row_length must not be less than the width");
+        return 0;
+    }
+    if (!valid_alignment(alignment)) {
+        PyErr_Format(PyExc_ValueError, "the alignment must be 1, 2, 4 or 8");
+        return 0;
+    }
+    return 1;
+}
+
+static int get_pixel_format(Image * image, PyObject * format_arg, ImageFormat * res) {
+    *res = image->fmt;
+
+    if (format_arg == Py_None) {
+        return 1;
+    }
+
+    if (!PyUnicode_CheckExact(format_arg)) {
+        PyErr_Format(PyExc_TypeError, "the format must be a string or None");
+        return 0;
+    }
+
+    PyObject * lookup = PyObject_GetAttrString(image->ctx->module_state->helper, "PIXEL_FORMAT");
+    PyObject * tup = PyDict_GetItem(lookup, format_arg);
+    Py_DECREF(lookup);
+
+    if (!tup) {
+        PyErr_Format(PyExc_ValueError, "invalid read format");
+        return 0;
+    }
+
+    if (!image->fmt.color || image->fmt.clear_type != 'f' || image->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "only normalized and float color images support pixel formats");
+        return 0;
+    }
+
+    res->format = to_int(PyTuple_GetItem(tup, 0));
+    res->type = to_int(PyTuple_GetItem(tup, 1));
+    res->components = to_int(PyTuple_GetItem(tup, 2));
+    res->pixel_size = to_int(PyTuple_GetItem(tup, 3));
+    return 1;
+}
+
+static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kwargs);
+static PyObject * Context_meth_release(Context * self, PyObject * arg);
+
+static Image * resolve_image(Image * image, IntPair size, IntPair offset) {
+    Image * temp = image->resolve_target;
+    if (temp && !temp->gc_prev) {
+        Py_CLEAR(image->resolve_target);
+        temp = NULL;
+    }
+
+    if (!temp) {
+        PyObject * args = Py_BuildValue("((ii)O)", image->width, image->height, image->format);
+        temp = Context_meth_image(image->ctx, args, NULL);
+        Py_DECREF(args);
         if (!temp) {
             return NULL;
         }
+        image->resolve_target = temp;
+    }
 
-        PyObject * blit = PyObject_CallMethod((PyObject *)src, "blit", "(O(ii)(ii)(iiii))", temp, 0, 0, size.x, size.y, offset.x, offset.y, size.x, size.y);
-        if (!blit) {
-            return NULL;
-        }
-        Py_DECREF(blit);
+    ImageFace * src = (ImageFace *)PyTuple_GetItem(image->layers, 0);
+    ImageFace * dst = (ImageFace *)PyTuple_GetItem(temp->layers, 0);
+    int buffer = image->fmt.color ? GL_COLOR_BUFFER_BIT : (GL_DEPTH_BUFFER_BIT | GL_STENCIL_BUFFER_BIT);
+    bind_read_framebuffer(image->ctx, src->framebuffer->obj);
+    bind_draw_framebuffer(image->ctx, dst->framebuffer->obj);
+    glBlitFramebuffer(offset.x, offset.y, offset.x + size.x, offset.y + size.y, offset.x, offset.y, offset.x + size.x, offset.y + size.y, buffer, GL_NEAREST);
+    return temp;
+}
 
-        PyObject * res = PyObject_CallMethod(temp, "read", "(OOO)", Py_None, Py_None, into);
-        if (!res) {
-            return NULL;
-        }
+static PyObject * read_image_face(ImageFace * src, IntPair size, IntPair offset, int row_length, int alignment, const ImageFormat * fmt, PyObject * into) {
+    if (src->image->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot read compressed images");
+        return NULL;
+    }
 
-        PyObject * release = PyObject_CallMethod((PyObject *)src->image->ctx, "release", "(N)", temp);
-        if (!release) {
+    if (src->image->samples > 1) {
+        Image * temp = resolve_image(src->image, size, offset);
+        if (!temp) {
             return NULL;
         }
-        Py_DECREF(release);
-        return res;
+        return read_image_face((ImageFace *)PyTuple_GetItem(temp->layers, 0), size, offset, row_length, alignment, fmt, into);
     }
 
-    int write_size = size.x * size.y * src->image->fmt.pixel_size;
+    intptr row_size = (intptr)size.x * fmt->pixel_size;
+    intptr write_size = row_stride(size.x, fmt->pixel_size, row_length, alignment) * (size.y - 1) + row_size;
 
     bind_read_framebuffer(src->ctx, src->framebuffer->obj);
 
     if (into == Py_None) {
         PyObject * res = PyBytes_FromStringAndSize(NULL, write_size);
-        glReadPixels(offset.x, offset.y, size.x, size.y, src->image->fmt.format, src->image->fmt.type, PyBytes_AsString(res));
+        glPixelStorei(GL_PACK_ROW_LENGTH, row_length);
+        glPixelStorei(GL_PACK_ALIGNMENT, alignment);
+        glReadPixels(offset.x, offset.y, size.x, size.y, fmt->format, fmt->type, PyBytes_AsString(res));
+        glPixelStorei(GL_PACK_ROW_LENGTH, 0);
+        glPixelStorei(GL_PACK_ALIGNMENT, 4);
         return res;
     }
 
@@ -1556,7 +1848,11 @@ static PyObject * read_image_face(ImageFace * src, IntPair size, IntPair offset,
 
         char * ptr = (char *)(intptr)buffer_view->offset;
         glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer_view->buffer->buffer);
-        glReadPixels(offset.x, offset.y, size.x, size.y, src->image->fmt.format, src->image->fmt.type, ptr);
+        glPixelStorei(GL_PACK_ROW_LENGTH, row_length);
+        glPixelStorei(GL_PACK_ALIGNMENT, alignment);
+        glReadPixels(offset.x, offset.y, size.x, size.y, fmt->format, fmt->type, ptr);
+        glPixelStorei(GL_PACK_ROW_LENGTH, 0);
+        glPixelStorei(GL_PACK_ALIGNMENT, 4);
         glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
         Py_DECREF(buffer_view);
         Py_RETURN_NONE;
@@ -1567,16 +1863,121 @@ static PyObject * read_image_face(ImageFace * src, IntPair size, IntPair offset,
         return NULL;
     }
 
-    if (write_size > (int)view.len) {
+    if (write_size > view.len) {
+        PyBuffer_Release(&view);
         PyErr_Format(PyExc_ValueError, "invalid write size");
         return NULL;
     }
 
-    glReadPixels(offset.x, offset.y, size.x, size.y, src->image->fmt.format, src->image->fmt.type, view.buf);
+    glPixelStorei(GL_PACK_ROW_LENGTH, row_length);
+    glPixelStorei(GL_PACK_ALIGNMENT, alignment);
+    glReadPixels(offset.x, offset.y, size.x, size.y, fmt->format, fmt->type, view.buf);
+    glPixelStorei(GL_PACK_ROW_LENGTH, 0);
+    glPixelStorei(GL_PACK_ALIGNMENT, 4);
     PyBuffer_Release(&view);
     Py_RETURN_NONE;
 }
 
+static int resolve_readback(Readback * self) {
+    if (self->data) {
+        return 1;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return 0;
+    }
+
+    PyObject * data = PyBytes_FromStringAndSize(NULL, self->size);
+    char * ptr = PyBytes_AsString(data);
+    void * sync = self->sync;
+    int buffer = self->buffer;
+
+    Py_BEGIN_ALLOW_THREADS;
+    glClientWaitSync(sync, GL_SYNC_FLUSH_COMMANDS_BIT, GL_TIMEOUT_IGNORED);
+    Py_END_ALLOW_THREADS;
+
+    glDeleteSync(sync);
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer);
+    glGetBufferSubData(GL_PIXEL_PACK_BUFFER, 0, self->size, ptr);
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+
+    self->data = data;
+    self->sync = NULL;
+    self->buffer = 0;
+
+    PyObject * free_buffer = PyLong_FromLong(buffer);
+    PyList_Append(self->image->readback_buffers, free_buffer);
+    Py_DECREF(free_buffer);
+
+    Py_ssize_t index = PySequence_Index(self->image->readbacks, (PyObject *)self);
+    if (index >= 0) {
+        PySequence_DelItem(self->image->readbacks, index);
+    }
+    return 1;
+}
+
+static Readback * read_image_async(Image * owner, ImageFace * face, IntPair size, IntPair offset) {
+    if (owner->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot read compressed images");
+        return NULL;
+    }
+
+    if (PyList_Size(owner->readbacks) >= READBACK_RING_SIZE) {
+        Readback * oldest = (Readback *)new_ref(PyList_GetItem(owner->readbacks, 0));
+        int resolved = resolve_readback(oldest);
+        Py_DECREF(oldest);
+        if (!resolved) {
+            return NULL;
+        }
+    }
+
+    int layers = face ? 1 : owner->layer_count;
+    intptr layer_size = (intptr)size.x * size.y * owner->fmt.pixel_size;
+
+    int buffer = 0;
+    Py_ssize_t free_buffers = PyList_Size(owner->readback_buffers);
+    if (free_buffers) {
+        buffer = to_int(PyList_GetItem(owner->readback_buffers, free_buffers - 1));
+        PyList_SetSlice(owner->readback_buffers, free_buffers - 1, free_buffers, NULL);
+    } else {
+        glGenBuffers(1, &buffer);
+    }
+
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer);
+    glBufferData(GL_PIXEL_PACK_BUFFER, layer_size * layers, NULL, GL_STREAM_READ);
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    for (int i = 0; i < layers; ++i) {
+        ImageFace * src = face ? face : (ImageFace *)PyTuple_GetItem(owner->layers, i);
+        bind_read_framebuffer(owner->ctx, src->framebuffer->obj);
+        glReadPixels(offset.x, offset.y, size.x, size.y, owner->fmt.format, owner->fmt.type, (void *)(layer_size * i));
+    }
+    glPixelStorei(GL_PACK_ALIGNMENT, 4);
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+
+    Readback * res = PyObject_New(Readback, owner->ctx->module_state->Readback_type);
+    res->ctx = owner->ctx;
+    res->image = owner;
+    res->data = NULL;
+    res->sync = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+    res->buffer = buffer;
+    res->size = layer_size * layers;
+    PyList_Append(owner->readbacks, (PyObject *)res);
+    return res;
+}
+
+static Readback * read_image_face_async(ImageFace * src, IntPair size, IntPair offset) {
+    if (src->image->samples > 1) {
+        Image * temp = resolve_image(src->image, size, offset);
+        if (!temp) {
+            return NULL;
+        }
+        return read_image_async(src->image, (ImageFace *)PyTuple_GetItem(temp->layers, 0), size, offset);
+    }
+
+    return read_image_async(src->image, src, size, offset);
+}
+
 static PyObject * meth_init(PyObject * self, PyObject * args, PyObject * kwargs) {
     static char * keywords[] = {"loader", NULL};
 
@@ -1624,6 +2025,57 @@ static PyObject * meth_init(PyObject * self, PyObject * args, PyObject * kwargs)
     Py_RETURN_NONE;
 }
 
+static void detect_compressed_formats(Context * self, PyObject * res) {
+    PyObject * lookup = PyObject_GetAttrString(self->module_state->helper, "IMAGE_FORMAT");
+    char zeros[16] = {0};
+    int texture = 0;
+
+    glGenTextures(1, &texture);
+    glActiveTexture(self->default_texture_unit);
+    glBindTexture(GL_TEXTURE_2D, texture);
+
+    for (int i = 0; i < 16 && glGetError(); ++i) {
+    }
+
+    PyObject * key = NULL;
+    PyObject * value = NULL;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(lookup, &pos, &key, &value)) {
+        ImageFormat fmt;
+        get_image_format(self->module_state->helper, key, &fmt);
+        if (fmt.flags & FORMAT_COMPRESSED) {
+            glCompressedTexImage2D(GL_TEXTURE_2D, 0, fmt.internal_format, 4, 4, 0, fmt.pixel_size, zeros);
+            if (!glGetError()) {
+                PyList_Append(res, key);
+            }
+        }
+    }
+
+    glBindTexture(GL_TEXTURE_2D, 0);
+    glDeleteTextures(1, &texture);
+    Py_DECREF(lookup);
+}
+
+static int has_gl_extension(const char * name) {
+    int count = 0;
+    glGetIntegerv(GL_NUM_EXTENSIONS, &count);
+    for (int i = 0; i < count; ++i) {
+        const char * extension = glGetStringi(GL_EXTENSIONS, i);
+        if (extension && !strcmp(extension, name)) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+static int get_gl_version() {
+    int major = 0;
+    int minor = 0;
+    glGetIntegerv(GL_MAJOR_VERSION, &major);
+    glGetIntegerv(GL_MINOR_VERSION, &minor);
+    return major * 10 + minor;
+}
+
 static int get_limit(int pname, int min, int max) {
     int value = 0;
     glGetIntegerv(pname, &value);
@@ -1685,6 +2137,8 @@ static Context * meth_context(PyObject * self, PyObject * args) {
     res->program_cache = PyDict_New();
     res->shader_cache = PyDict_New();
     res->includes = PyDict_New();
+    res->transient_free = PyDict_New();
+    res->transient_images = PyList_New(0);
     res->default_framebuffer = default_framebuffer;
     res->info_dict = NULL;
     res->current_descriptor_set = NULL;
@@ -1706,6 +2160,10 @@ static Context * meth_context(PyObject * self, PyObject * args) {
     res->is_gles = 0;
     res->is_webgl = 0;
     res->is_lost = 0;
+    res->has_clear_texture = 0;
+    res->has_invalidate_framebuffer = 0;
+    res->has_float_blend = 1;
+    res->has_compressed_formats = 0;
 
     res->limits.max_uniform_buffer_bindings = get_limit(GL_MAX_UNIFORM_BUFFER_BINDINGS, 8, MAX_BUFFER_BINDINGS);
     res->limits.max_uniform_block_size = get_limit(GL_MAX_UNIFORM_BLOCK_SIZE, 0x4000, 0x40000000);
@@ -1720,8 +2178,17 @@ static Context * meth_context(PyObject * self, PyObject * args) {
     res->is_gles = startswith(version, "OpenGL ES");
     res->is_webgl = startswith(version, "WebGL");
 
+    if (!res->is_gles && !res->is_webgl) {
+        int gl_version = get_gl_version();
+        res->has_clear_texture = glClearTexSubImage && (gl_version >= 44 || has_gl_extension("GL_ARB_clear_texture"));
+        res->has_invalidate_framebuffer = glInvalidateFramebuffer && (gl_version >= 43 || has_gl_extension("GL_ARB_invalidate_subdata"));
+    } else {
+        res->has_invalidate_framebuffer = glInvalidateFramebuffer != NULL;
+        res->has_float_blend = has_gl_extension("GL_EXT_float_blend") || has_gl_extension("EXT_float_blend");
+    }
+
     res->info_dict = Py_BuildValue(
-        "{szszszszsisisisisisisi}",
+        "{szszszszsisisisisisisisOsN}",
         "vendor", glGetString(GL_VENDOR),
         "renderer", glGetString(GL_RENDERER),
         "version", version,
@@ -1732,7 +2199,9 @@ static Context * meth_context(PyObject * self, PyObject * args) {
         "max_combined_texture_image_units", res->limits.max_combined_texture_image_units,
         "max_vertex_attribs", res->limits.max_vertex_attribs,
         "max_draw_buffers", res->limits.max_draw_buffers,
-        "max_samples", res->limits.max_samples
+        "max_samples", res->limits.max_samples,
+        "float_blend", res->has_float_blend ? Py_True : Py_False,
+        "compressed_formats", PyList_New(0)
     );
 
     int max_texture_image_units = get_limit(GL_MAX_TEXTURE_IMAGE_UNITS, 8, MAX_SAMPLER_BINDINGS + 1);
@@ -1785,9 +2254,9 @@ static Buffer * Context_meth_buffer(Context * self, PyObject * args, PyObject *
         return NULL;
     }
 
-    int size = 0;
+    intptr size = 0;
     if (size_arg != Py_None) {
-        size = to_int(size_arg);
+        size = PyLong_AsSsize_t(size_arg);
         if (size <= 0) {
             PyErr_Format(PyExc_ValueError, "invalid size");
             return NULL;
@@ -1797,15 +2266,11 @@ static Buffer * Context_meth_buffer(Context * self, PyObject * args, PyObject *
     int target = uniform ? GL_UNIFORM_BUFFER : index ? GL_ELEMENT_ARRAY_BUFFER : GL_ARRAY_BUFFER;
 
     if (data != Py_None) {
-        data = PyMemoryView_GetContiguous(data, PyBUF_READ, 'C');
-        if (!data) {
-            return NULL;
-        }
         Py_buffer view;
-        if (PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)) {
+        if (PyObject_GetBuffer(data, &view, PyBUF_FULL_RO)) {
             return NULL;
         }
-        size = (int)view.len;
+        size = view.len;
         PyBuffer_Release(&view);
         if (size == 0) {
             PyErr_Format(PyExc_ValueError, "invalid size");
@@ -1849,10 +2314,11 @@ static Buffer * Context_meth_buffer(Context * self, PyObject * args, PyObject *
     res->buffer = buffer;
     res->target = target;
     res->size = size;
+    res->capacity = size;
     res->access = access;
 
     if (data != Py_None) {
-        Py_XDECREF(PyObject_CallMethod((PyObject *)res, "write", "(N)", data));
+        Py_XDECREF(PyObject_CallMethod((PyObject *)res, "write_from", "(O)", data));
         if (PyErr_Occurred()) {
             return NULL;
         }
@@ -1862,7 +2328,7 @@ static Buffer * Context_meth_buffer(Context * self, PyObject * args, PyObject *
 }
 
 static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"size", "format", "data", "samples", "array", "levels", "texture", "cubemap", "external", NULL};
+    static char * keywords[] = {"size", "format", "data", "samples", "array", "levels", "texture", "cubemap", "external", "depth", NULL};
 
     int width;
     int height;
@@ -1874,11 +2340,12 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
     int cubemap = 0;
     int levels = 1;
     int external = 0;
+    int depth = 0;
 
     int args_ok = PyArg_ParseTupleAndKeywords(
         args,
         kwargs,
-        "(ii)|O!OiiiOpi",
+        "(ii)|O!OiiiOpii",
         keywords,
         &width,
         &height,
@@ -1890,14 +2357,15 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
         &levels,
         &texture,
         &cubemap,
-        &external
+        &external,
+        &depth
     );
 
     if (!args_ok) {
         return NULL;
     }
 
-    int max_levels = count_mipmaps(width, height);
+    int max_levels = depth ? count_mipmaps(width > height ? width : height, depth) : count_mipmaps(width, height);
     if (levels <= 0) {
         levels = max_levels;
     }
@@ -1935,6 +2403,18 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
         PyErr_Format(PyExc_TypeError, "multisampled array or cubemap images are not supported");
         return NULL;
     }
+    if (depth < 0) {
+        PyErr_Format(PyExc_ValueError, "depth must not be negative");
+        return NULL;
+    }
+    if (depth && (array || cubemap)) {
+        PyErr_Format(PyExc_TypeError, "3D images cannot be array or cubemap images");
+        return NULL;
+    }
+    if (depth && (samples > 1 || texture == Py_False)) {
+        PyErr_Format(PyExc_TypeError, "3D images must be textures");
+        return NULL;
+    }
     if (texture == Py_False && (array || cubemap)) {
         PyErr_Format(PyExc_TypeError, "for array or cubemap images texture must be True");
         return NULL;
@@ -1949,7 +2429,7 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
     }
 
     int renderbuffer = samples > 1 || texture == Py_False;
-    int target = cubemap ? GL_TEXTURE_CUBE_MAP : array ? GL_TEXTURE_2D_ARRAY : GL_TEXTURE_2D;
+    int target = cubemap ? GL_TEXTURE_CUBE_MAP : array ? GL_TEXTURE_2D_ARRAY : depth ? GL_TEXTURE_3D : GL_TEXTURE_2D;
 
     if (samples > self->limits.max_samples) {
         samples = self->limits.max_samples;
@@ -1961,6 +2441,17 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
         return NULL;
     }
 
+    int compressed = fmt.flags & FORMAT_COMPRESSED;
+    if (compressed && renderbuffer) {
+        PyErr_Format(PyExc_TypeError, "compressed images must be textures");
+        return NULL;
+    }
+
+    if (compressed && depth) {
+        PyErr_Format(PyExc_TypeError, "compressed 3D images are not supported");
+        return NULL;
+    }
+
     int image = 0;
     if (external) {
         image = external;
@@ -1977,13 +2468,27 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
         for (int level = 0; level < levels; ++level) {
             int w = least_one(width >> level);
             int h = least_one(height >> level);
-            if (cubemap) {
+            if (compressed) {
+                int layer_size = (int)compressed_size(&fmt, w, h);
+                if (cubemap) {
+                    for (int i = 0; i < 6; ++i) {
+                        int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + i;
+                        glCompressedTexImage2D(face, level, fmt.internal_format, w, h, 0, layer_size, NULL);
+                    }
+                } else if (array) {
+                    glCompressedTexImage3D(target, level, fmt.internal_format, w, h, array, 0, layer_size * array, NULL);
+                } else {
+                    glCompressedTexImage2D(target, level, fmt.internal_format, w, h, 0, layer_size, NULL);
+                }
+            } else if (cubemap) {
                 for (int i = 0; i < 6; ++i) {
                     int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + i;
                     glTexImage2D(face, level, fmt.internal_format, w, h, 0, fmt.format, fmt.type, NULL);
                 }
             } else if (array) {
                 glTexImage3D(target, level, fmt.internal_format, w, h, array, 0, fmt.format, fmt.type, NULL);
+            } else if (depth) {
+                glTexImage3D(target, level, fmt.internal_format, w, h, least_one(depth >> level), 0, fmt.format, fmt.type, NULL);
             } else {
                 glTexImage2D(target, level, fmt.internal_format, w, h, 0, fmt.format, fmt.type, NULL);
             }
@@ -2012,10 +2517,21 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
     res->samples = samples;
     res->array = array;
     res->cubemap = cubemap;
+    res->depth = depth;
     res->target = target;
     res->renderbuffer = renderbuffer;
-    res->layer_count = (array ? array : 1) * (cubemap ? 6 : 1);
+    res->layer_count = depth ? depth : (array ? array : 1) * (cubemap ? 6 : 1);
     res->level_count = levels;
+    res->readbacks = PyList_New(0);
+    res->readback_buffers = PyList_New(0);
+    memset(res->upload_buffers, 0, sizeof(res->upload_buffers));
+    memset(res->upload_syncs, 0, sizeof(res->upload_syncs));
+    memset(res->upload_sizes, 0, sizeof(res->upload_sizes));
+    res->upload_index = 0;
+    res->transient_key = NULL;
+    res->transient_leased = 0;
+    res->transient_used = 0;
+    res->resolve_target = NULL;
 
     if (fmt.buffer == GL_DEPTH || fmt.buffer == GL_DEPTH_STENCIL) {
         res->clear_value.clear_floats[0] = 1.0f;
@@ -2038,6 +2554,12 @@ static Image * Context_meth_image(Context * self, PyObject * args, PyObject * kw
     return res;
 }
 
+static void release_pipeline_args(PyObject * create_kwargs, PyObject * varyings, Buffer * feedback_buffer) {
+    Py_DECREF(create_kwargs);
+    Py_DECREF(varyings);
+    Py_XDECREF(feedback_buffer);
+}
+
 static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObject * kwargs) {
     if (PyTuple_Size(args) || !kwargs) {
         PyErr_Format(PyExc_TypeError, "pipeline only takes keyword-only arguments");
@@ -2067,6 +2589,8 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
         "viewport_data",
         "render_data",
         "includes",
+        "feedback",
+        "discard",
         NULL,
     };
 
@@ -2092,6 +2616,8 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
     PyObject * viewport_data = Py_None;
     PyObject * render_data = Py_None;
     PyObject * includes = Py_None;
+    PyObject * feedback = Py_None;
+    PyObject * discard = Py_None;
 
     Pipeline * template = (Pipeline *)PyDict_GetItemString(kwargs, "template");
     PyObject * create_kwargs;
@@ -2120,7 +2646,7 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
     int args_ok = PyArg_ParseTupleAndKeywords(
         args,
         create_kwargs,
-        "|$O!O!OOOOOOOOOpOOiiiOOOOO",
+        "|$O!O!OOOOOOOOOpOOiiiOOOOOOO",
         keywords,
         &PyUnicode_Type,
         &vertex_shader,
@@ -2145,10 +2671,13 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
         &uniform_data,
         &viewport_data,
         &render_data,
-        &includes
+        &includes,
+        &feedback,
+        &discard
     );
 
     if (!args_ok) {
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
@@ -2158,67 +2687,130 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
 
     if (self->is_lost) {
         PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     if (!vertex_shader) {
         PyErr_Format(PyExc_TypeError, "no vertex_shader was specified");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
-    if (!fragment_shader) {
+    if (!fragment_shader && feedback == Py_None) {
         PyErr_Format(PyExc_TypeError, "no fragment_shader was specified");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
-    if (!framebuffer_arg) {
+    if (!framebuffer_arg && feedback == Py_None) {
         PyErr_Format(PyExc_TypeError, "no framebuffer was specified");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
-    if (framebuffer_arg == Py_None && viewport == Py_None) {
+    if (framebuffer_arg == Py_None && viewport == Py_None && feedback == Py_None) {
         PyErr_Format(PyExc_TypeError, "no viewport was specified");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     if (uniform_data != Py_None && !valid_mem(uniform_data, -1)) {
         PyErr_Format(PyExc_TypeError, "uniform_data must be a contiguous memoryview");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     if (viewport_data != Py_None && !valid_mem(viewport_data, 16)) {
         PyErr_Format(PyExc_TypeError, "viewport_data must be a contiguous memoryview with a size of 16 bytes");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     if (render_data != Py_None && !valid_mem(render_data, 12)) {
         PyErr_Format(PyExc_TypeError, "render_data must be a contiguous memoryview with a size of 12 bytes");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     Viewport viewport_value;
     if (!to_viewport(&viewport_value, viewport, 0, 0, 0, 0)) {
         PyErr_Format(PyExc_TypeError, "the viewport must be a tuple of 4 ints");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     int topology;
     if (!get_topology(self->module_state->helper, topology_arg, &topology)) {
         PyErr_Format(PyExc_ValueError, "invalid topology");
+        Py_DECREF(create_kwargs);
         return NULL;
     }
 
     int index_size = short_index ? 2 : 4;
     int index_type = index_buffer != Py_None ? (short_index ? GL_UNSIGNED_SHORT : GL_UNSIGNED_INT) : 0;
 
+    PyObject * varyings = self->module_state->empty_tuple;
+    Buffer * feedback_buffer = NULL;
+    intptr feedback_offset = 0;
+    intptr feedback_size = 0;
+    int feedback_mode = topology == GL_POINTS ? GL_POINTS : topology < GL_TRIANGLES ? GL_LINES : GL_TRIANGLES;
+
+    if (feedback != Py_None) {
+        PyObject * tup = PyObject_CallMethod(self->module_state->helper, "feedback", "(O)", feedback);
+        if (!tup) {
+            Py_DECREF(create_kwargs);
+            return NULL;
+        }
+        PyObject * buffer = PyTuple_GetItem(tup, 1);
+        if (Py_TYPE(buffer) == self->module_state->Buffer_type) {
+            feedback_buffer = (Buffer *)buffer;
+            feedback_size = -1;
+        } else if (Py_TYPE(buffer) == self->module_state->BufferView_type) {
+            feedback_buffer = ((BufferView *)buffer)->buffer;
+            feedback_offset = ((BufferView *)buffer)->offset;
+            feedback_size = ((BufferView *)buffer)->size;
+        } else {
+            Py_DECREF(tup);
+            PyErr_Format(PyExc_TypeError, "the feedback buffer must be a Buffer or a BufferView");
+            Py_DECREF(create_kwargs);
+            return NULL;
+        }
+        varyings = PyTuple_GetItem(tup, 0);
+        Py_INCREF(feedback_buffer);
+        Py_INCREF(varyings);
+        Py_DECREF(tup);
+    } else {
+        Py_INCREF(varyings);
+    }
+
+    if (template && !PyObject_RichCompareBool(varyings, template->feedback_varyings, Py_EQ)) {
+        PyErr_Format(PyExc_ValueError, "cannot use template with different feedback varyings");
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
+        return NULL;
+    }
+
+    if (!fragment_shader) {
+        fragment_shader = Py_None;
+    }
+
+    if (!framebuffer_arg) {
+        framebuffer_arg = Py_None;
+        if (viewport == Py_None) {
+            viewport_value.width = 1;
+            viewport_value.height = 1;
+        }
+    }
+
     GLObject * program;
 
     if (template) {
         program = (GLObject *)new_ref(template->program);
         program->uses += 1;
     } else {
-        program = compile_program(self, includes != Py_None ? includes : self->includes, vertex_shader, fragment_shader, layout);
+        program = compile_program(self, includes != Py_None ? includes : self->includes, vertex_shader, fragment_shader, layout, varyings);
         if (!program) {
+            release_pipeline_args(create_kwargs, varyings, feedback_buffer);
             return NULL;
         }
     }
@@ -2228,6 +2820,7 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
     if (uniforms) {
         PyObject * tuple = PyObject_CallMethod(self->module_state->helper, "uniforms", "(OOO)", program->extra, uniforms, uniform_data);
         if (!tuple) {
+            release_pipeline_args(create_kwargs, varyings, feedback_buffer);
             return NULL;
         }
 
@@ -2251,11 +2844,13 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
     );
 
     if (!validate) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
     PyObject * layout_bindings = PyObject_CallMethod(self->module_state->helper, "layout_bindings", "(O)", layout);
     if (!layout_bindings) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
@@ -2275,6 +2870,13 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
 
     PyObject * framebuffer_attachments = PyObject_CallMethod(self->module_state->helper, "framebuffer_attachments", "(O)", framebuffer_arg);
     if (!framebuffer_attachments) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
+        return NULL;
+    }
+
+    PyObject * discard_attachments = PyObject_CallMethod(self->module_state->helper, "discard_attachments", "(OO)", discard, framebuffer_attachments);
+    if (!discard_attachments) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
@@ -2284,20 +2886,23 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
         viewport_value.height = to_int(PyTuple_GetItem(size, 1));
     }
 
-    GLObject * framebuffer = build_framebuffer(self, framebuffer_attachments);
+    GLObject * framebuffer = feedback != Py_None && framebuffer_arg == Py_None ? build_feedback_framebuffer(self) : build_framebuffer(self, framebuffer_attachments);
 
     PyObject * vertex_array_bindings = PyObject_CallMethod(self->module_state->helper, "vertex_array_bindings", "(OO)", vertex_buffers, index_buffer);
     if (!vertex_array_bindings) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
     GLObject * vertex_array = build_vertex_array(self, vertex_array_bindings);
     if (!vertex_array) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
     PyObject * resource_bindings = PyObject_CallMethod(self->module_state->helper, "resource_bindings", "(O)", resources);
     if (!resource_bindings) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
@@ -2315,6 +2920,7 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
     );
 
     if (!settings) {
+        release_pipeline_args(create_kwargs, varyings, feedback_buffer);
         return NULL;
     }
 
@@ -2378,14 +2984,56 @@ static Pipeline * Context_meth_pipeline(Context * self, PyObject * args, PyObjec
     res->index_size = index_size;
     res->descriptor_set = descriptor_set;
     res->global_settings = global_settings;
+    res->feedback_varyings = varyings;
+    res->feedback_buffer = feedback_buffer;
+    res->feedback_offset = feedback_offset;
+    res->feedback_size = feedback_size;
+    res->feedback_mode = feedback_mode;
+    res->discard_count = (int)PyTuple_Size(discard_attachments);
+    for (int i = 0; i < res->discard_count; ++i) {
+        res->discard_attachments[i] = to_int(PyTuple_GetItem(discard_attachments, i));
+    }
+    Py_DECREF(discard_attachments);
     return res;
 }
 
-static PyObject * Context_meth_new_frame(Context * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"reset", "clear", NULL};
-
-    int reset = 1;
-    int clear = 1;
+static PyObject * Context_meth_atlas(Context * self, PyObject * args, PyObject * kwargs) {
+    if (self->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    PyObject * atlas = PyObject_GetAttrString(self->module_state->helper, "Atlas");
+    PyObject * prefix = PyTuple_Pack(1, self);
+    PyObject * atlas_args = PySequence_Concat(prefix, args);
+    PyObject * res = PyObject_Call(atlas, atlas_args, kwargs);
+    Py_DECREF(atlas_args);
+    Py_DECREF(prefix);
+    Py_DECREF(atlas);
+    return res;
+}
+
+static PyObject * Context_meth_picker(Context * self, PyObject * args, PyObject * kwargs) {
+    if (self->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    PyObject * picker = PyObject_GetAttrString(self->module_state->helper, "Picker");
+    PyObject * prefix = PyTuple_Pack(1, self);
+    PyObject * picker_args = PySequence_Concat(prefix, args);
+    PyObject * res = PyObject_Call(picker, picker_args, kwargs);
+    Py_DECREF(picker_args);
+    Py_DECREF(prefix);
+    Py_DECREF(picker);
+    return res;
+}
+
+static PyObject * Context_meth_new_frame(Context * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"reset", "clear", NULL};
+
+    int reset = 1;
+    int clear = 1;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|pp", keywords, &reset, &clear)) {
         return NULL;
@@ -2429,6 +3077,171 @@ static PyObject * Context_meth_new_frame(Context * self, PyObject * args, PyObje
     Py_RETURN_NONE;
 }
 
+static void recycle_transient_images(Context * self) {
+    PyObject * images = self->transient_images;
+    self->transient_images = PyList_New(0);
+    PyDict_Clear(self->transient_free);
+
+    for (int i = 0; i < PyList_Size(images); ++i) {
+        Image * image = (Image *)PyList_GetItem(images, i);
+        if (!image->transient_used) {
+            Py_CLEAR(image->transient_key);
+            Py_DECREF(Context_meth_release(self, (PyObject *)image));
+            continue;
+        }
+        image->transient_leased = 0;
+        image->transient_used = 0;
+        PyObject * free_images = PyDict_GetItem(self->transient_free, image->transient_key);
+        if (!free_images) {
+            free_images = PyList_New(0);
+            PyDict_SetItem(self->transient_free, image->transient_key, free_images);
+            Py_DECREF(free_images);
+        }
+        PyList_Append(free_images, (PyObject *)image);
+        PyList_Append(self->transient_images, (PyObject *)image);
+    }
+
+    Py_DECREF(images);
+}
+
+static PyObject * Context_meth_transient(Context * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "format", "samples", NULL};
+
+    int width;
+    int height;
+    PyObject * format = self->module_state->str_rgba8unorm;
+    int samples = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "(ii)|O!i", keywords, &width, &height, &PyUnicode_Type, &format, &samples)) {
+        return NULL;
+    }
+
+    if (self->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    PyObject * key = Py_BuildValue("((ii)Oi)", width, height, format, samples);
+    PyObject * free_images = PyDict_GetItem(self->transient_free, key);
+
+    if (free_images && PyList_Size(free_images)) {
+        Py_ssize_t last = PyList_Size(free_images) - 1;
+        Image * image = (Image *)new_ref(PyList_GetItem(free_images, last));
+        PyList_SetSlice(free_images, last, last + 1, NULL);
+        image->transient_leased = 1;
+        image->transient_used = 1;
+        Py_DECREF(key);
+        return (PyObject *)image;
+    }
+
+    PyObject * image_args = Py_BuildValue("((ii)O)", width, height, format);
+    PyObject * image_kwargs = Py_BuildValue("{si}", "samples", samples);
+    Image * image = (Image *)Context_meth_image(self, image_args, image_kwargs);
+    Py_DECREF(image_kwargs);
+    Py_DECREF(image_args);
+    if (!image) {
+        Py_DECREF(key);
+        return NULL;
+    }
+
+    if (!free_images) {
+        free_images = PyList_New(0);
+        PyDict_SetItem(self->transient_free, key, free_images);
+        Py_DECREF(free_images);
+    }
+
+    image->transient_key = key;
+    image->transient_leased = 1;
+    image->transient_used = 1;
+    PyList_Append(self->transient_images, (PyObject *)image);
+    return (PyObject *)image;
+}
+
+static PyObject * Context_meth_blit_many(Context * self, PyObject * arg) {
+    if (self->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    PyObject * seq = PySequence_Fast(arg, "the blits must be a sequence");
+    if (!seq) {
+        return NULL;
+    }
+
+    const int count = (int)PySequence_Fast_GET_SIZE(seq);
+    for (int i = 0; i < count; ++i) {
+        PyObject * item = PySequence_Fast_GET_ITEM(seq, i);
+        PyObject * src = NULL;
+        PyObject * target = Py_None;
+        PyObject * crop = Py_None;
+        int filter = 0;
+
+        if (!PyTuple_Check(item) || !PyArg_ParseTuple(item, "O|OOp", &src, &target, &crop, &filter)) {
+            PyErr_Clear();
+            PyErr_Format(PyExc_TypeError, "the blits must be tuples of source, target, crop and filter");
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        if (Py_TYPE(src) == self->module_state->Image_type) {
+            src = PyTuple_GetItem(((Image *)src)->layers, 0);
+        }
+
+        if (Py_TYPE(src) != self->module_state->ImageFace_type) {
+            PyErr_Format(PyExc_TypeError, "the source must be an Image or ImageFace");
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        PyObject * size = Py_None;
+        if (Py_TYPE(target) == self->module_state->Image_type) {
+            size = ((Image *)target)->size;
+        } else if (Py_TYPE(target) == self->module_state->ImageFace_type) {
+            size = ((ImageFace *)target)->size;
+        }
+
+        PyObject * res = blit_image_face((ImageFace *)src, target, Py_None, size, crop, filter);
+        if (!res) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+        Py_DECREF(res);
+    }
+
+    Py_DECREF(seq);
+    Py_RETURN_NONE;
+}
+
+static int is_recording(Context * self, PyObject * recorder, Image * image) {
+    PyObject * target = PyObject_GetAttrString(recorder, "image");
+    if (!target) {
+        PyErr_Clear();
+        return 0;
+    }
+    int res = Py_TYPE(target) == self->module_state->Image_type && ((Image *)target)->ctx == self && ((Image *)target)->gc_prev;
+    if (image) {
+        res = res && target == (PyObject *)image;
+    }
+    Py_DECREF(target);
+    return res;
+}
+
+static void close_frame_recorders(Context * self, Image * image) {
+    PyObject * recorders = self->module_state->frame_recorders;
+    PyObject * lst = PyList_GetSlice(recorders, 0, PyList_Size(recorders));
+    for (int i = 0; i < PyList_Size(lst); ++i) {
+        PyObject * recorder = PyList_GetItem(lst, i);
+        if (is_recording(self, recorder, image)) {
+            PyObject * res = PyObject_CallMethod(recorder, "close", NULL);
+            if (!res) {
+                PyErr_WriteUnraisable(recorder);
+            }
+            Py_XDECREF(res);
+        }
+    }
+    Py_DECREF(lst);
+}
+
 static PyObject * Context_meth_end_frame(Context * self, PyObject * args, PyObject * kwargs) {
     static char * keywords[] = {"clean", "flush", NULL};
 
@@ -2444,6 +3257,25 @@ static PyObject * Context_meth_end_frame(Context * self, PyObject * args, PyObje
         return NULL;
     }
 
+    PyObject * error_type = NULL;
+    PyObject * error_value = NULL;
+    PyObject * error_traceback = NULL;
+    PyObject * recorders = self->module_state->frame_recorders;
+    for (int i = 0; i < PyList_Size(recorders); ++i) {
+        PyObject * recorder = PyList_GetItem(recorders, i);
+        if (!is_recording(self, recorder, NULL)) {
+            continue;
+        }
+        PyObject * res = PyObject_CallMethod(recorder, "capture", NULL);
+        if (!res) {
+            PyErr_Fetch(&error_type, &error_value, &error_traceback);
+            break;
+        }
+        Py_DECREF(res);
+    }
+
+    recycle_transient_images(self);
+
     if (clean) {
         bind_draw_framebuffer(self, 0);
         bind_program(self, 0);
@@ -2472,6 +3304,11 @@ static PyObject * Context_meth_end_frame(Context * self, PyObject * args, PyObje
         glFlush();
     }
 
+    if (error_type) {
+        PyErr_Restore(error_type, error_value, error_traceback);
+        return NULL;
+    }
+
     Py_RETURN_NONE;
 }
 
@@ -2523,6 +3360,10 @@ static void release_framebuffer(Context * self, GLObject * framebuffer) {
                 bind_draw_framebuffer(self, 0);
                 bind_read_framebuffer(self, 0);
                 glDeleteFramebuffers(1, &framebuffer->obj);
+                if (framebuffer->extra) {
+                    int renderbuffer = to_int(framebuffer->extra);
+                    glDeleteRenderbuffers(1, &renderbuffer);
+                }
             }
         }
         self->current_viewport.x = -1;
@@ -2571,9 +3412,20 @@ static PyObject * Context_meth_release(Context * self, PyObject * arg) {
             }
             Py_DECREF(buffer);
         }
+    } else if (Py_TYPE(arg) == self->module_state->Image_type && ((Image *)arg)->transient_key) {
+        Image * image = (Image *)arg;
+        if (image->transient_leased) {
+            image->transient_leased = 0;
+            PyList_Append(PyDict_GetItem(self->transient_free, image->transient_key), (PyObject *)image);
+        }
     } else if (Py_TYPE(arg) == self->module_state->Image_type) {
         Image * image = (Image *)arg;
         if (image->gc_prev) {
+            close_frame_recorders(self, image);
+            if (image->resolve_target) {
+                Py_DECREF(Context_meth_release(self, (PyObject *)image->resolve_target));
+                Py_CLEAR(image->resolve_target);
+            }
             release_gc_object((GCHeader *)image);
             if (image->faces) {
                 PyObject * key = NULL;
@@ -2585,6 +3437,32 @@ static PyObject * Context_meth_release(Context * self, PyObject * arg) {
                 }
                 PyDict_Clear(image->faces);
             }
+            while (!self->is_lost && PyList_Size(image->readbacks)) {
+                Readback * readback = (Readback *)new_ref(PyList_GetItem(image->readbacks, 0));
+                resolve_readback(readback);
+                Py_DECREF(readback);
+            }
+            for (int i = 0; i < PyList_Size(image->readbacks); ++i) {
+                ((Readback *)PyList_GetItem(image->readbacks, i))->image = NULL;
+            }
+            PyList_SetSlice(image->readbacks, 0, PyList_Size(image->readbacks), NULL);
+            if (!self->is_lost) {
+                for (int i = 0; i < PyList_Size(image->readback_buffers); ++i) {
+                    int buffer = to_int(PyList_GetItem(image->readback_buffers, i));
+                    glDeleteBuffers(1, &buffer);
+                }
+            }
+            PyList_SetSlice(image->readback_buffers, 0, PyList_Size(image->readback_buffers), NULL);
+            if (!self->is_lost) {
+                for (int i = 0; i < UPLOAD_RING_SIZE; ++i) {
+                    if (image->upload_syncs[i]) {
+                        glDeleteSync(image->upload_syncs[i]);
+                    }
+                    if (image->upload_buffers[i]) {
+                        glDeleteBuffers(1, &image->upload_buffers[i]);
+                    }
+                }
+            }
             if (!self->is_lost) {
                 if (image->renderbuffer) {
                     glDeleteRenderbuffers(1, &image->image);
@@ -2623,7 +3501,20 @@ static PyObject * Context_meth_release(Context * self, PyObject * arg) {
         }
         PyDict_Clear(self->shader_cache);
     } else if (PyUnicode_CheckExact(arg) && !PyUnicode_CompareWithASCIIString(arg, "all")) {
+        for (int i = 0; i < PyList_Size(self->transient_images); ++i) {
+            Image * image = (Image *)PyList_GetItem(self->transient_images, i);
+            Py_CLEAR(image->transient_key);
+        }
+        PyList_SetSlice(self->transient_images, 0, PyList_Size(self->transient_images), NULL);
+        PyDict_Clear(self->transient_free);
         GCHeader * it = self->gc_next;
+        while (it != (GCHeader *)self) {
+            if (Py_TYPE((PyObject *)it) == self->module_state->Image_type) {
+                Py_CLEAR(((Image *)it)->resolve_target);
+            }
+            it = it->gc_next;
+        }
+        it = self->gc_next;
         while (it != (GCHeader *)self) {
             GCHeader * next = it->gc_next;
             if (Py_TYPE((PyObject *)it) == self->module_state->Pipeline_type) {
@@ -2674,13 +3565,22 @@ static PyObject * Context_get_loader(Context * self, void * closure) {
     return new_ref(self->module_state->default_loader);
 }
 
+static PyObject * Context_get_info(Context * self, void * closure) {
+    if (!self->has_compressed_formats && !self->is_lost) {
+        detect_compressed_formats(self, PyDict_GetItemString(self->info_dict, "compressed_formats"));
+        self->has_compressed_formats = 1;
+    }
+    return new_ref(self->info_dict);
+}
+
 static PyObject * Buffer_meth_write(Buffer * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"data", "offset", NULL};
+    static char * keywords[] = {"data", "offset", "zero_copy_only", NULL};
 
     PyObject * data;
-    int offset = 0;
+    intptr offset = 0;
+    int zero_copy_only = 0;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|i", keywords, &data, &offset)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|n$p", keywords, &data, &offset, &zero_copy_only)) {
         return NULL;
     }
 
@@ -2718,23 +3618,25 @@ static PyObject * Buffer_meth_write(Buffer * self, PyObject * args, PyObject * k
         Py_RETURN_NONE;
     }
 
-    PyObject * mem = PyMemoryView_GetContiguous(data, PyBUF_READ, 'C');
-    if (!mem) {
-        return NULL;
-    }
-
     Py_buffer view;
-    if (PyObject_GetBuffer(mem, &view, PyBUF_SIMPLE)) {
+    if (PyObject_GetBuffer(data, &view, PyBUF_FULL_RO)) {
         return NULL;
     }
-    char * ptr = (char *)view.buf;
-    int data_size = (int)view.len;
+    intptr data_size = view.len;
+    int contiguous = PyBuffer_IsContiguous(&view, 'C');
 
     if (data_size + offset > self->size) {
+        PyBuffer_Release(&view);
         PyErr_Format(PyExc_ValueError, "invalid size");
         return NULL;
     }
 
+    if (!contiguous && self->ctx->is_webgl && zero_copy_only) {
+        PyBuffer_Release(&view);
+        PyErr_Format(PyExc_ValueError, "the data is not contiguous and cannot be uploaded without a copy");
+        return NULL;
+    }
+
     if (data_size) {
         if (self->target == GL_ELEMENT_ARRAY_BUFFER) {
             bind_vertex_array(self->ctx, 0);
@@ -2745,23 +3647,42 @@ static PyObject * Buffer_meth_write(Buffer * self, PyObject * args, PyObject * k
         }
 
         glBindBuffer(self->target, self->buffer);
-        glBufferSubData(self->target, offset, data_size, ptr);
+        void * mapped = NULL;
+        if (!contiguous && !self->ctx->is_webgl) {
+            mapped = glMapBufferRange(self->target, offset, data_size, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_RANGE_BIT);
+        }
+        if (contiguous) {
+            glBufferSubData(self->target, offset, data_size, view.buf);
+        } else if (mapped) {
+            PyBuffer_ToContiguous(mapped, &view, data_size, 'C');
+            glUnmapBuffer(self->target);
+        } else {
+            void * ptr = PyMem_Malloc((size_t)data_size);
+            if (!ptr) {
+                glBindBuffer(self->target, 0);
+                PyBuffer_Release(&view);
+                return PyErr_NoMemory();
+            }
+            PyBuffer_ToContiguous(ptr, &view, data_size, 'C');
+            glBufferSubData(self->target, offset, data_size, ptr);
+            PyMem_Free(ptr);
+        }
         glBindBuffer(self->target, 0);
     }
 
     PyBuffer_Release(&view);
-    Py_DECREF(mem);
     Py_RETURN_NONE;
 }
 
-static PyObject * Buffer_meth_read(Buffer * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"size", "offset", "into", NULL};
+static PyObject * Buffer_meth_write_from(Buffer * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"source", "offset", "size", "chunk", NULL};
 
+    PyObject * source;
+    intptr offset = 0;
     PyObject * size_arg = Py_None;
-    int offset = 0;
-    PyObject * into = Py_None;
+    intptr chunk = 1 << 24;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OiO", keywords, &size_arg, &offset, &into)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|nO$n", keywords, &source, &offset, &size_arg, &chunk)) {
         return NULL;
     }
 
@@ -2770,23 +3691,24 @@ static PyObject * Buffer_meth_read(Buffer * self, PyObject * args, PyObject * kw
         return NULL;
     }
 
+    if (size_arg != Py_None && !PyLong_CheckExact(size_arg)) {
+        PyErr_Format(PyExc_TypeError, "the size must be an int");
+        return NULL;
+    }
+
     if (offset < 0 || offset > self->size) {
         PyErr_Format(PyExc_ValueError, "invalid offset");
         return NULL;
     }
 
-    if (size_arg != Py_None && !PyLong_CheckExact(size_arg)) {
-        PyErr_Format(PyExc_TypeError, "the size must be an int");
+    if (chunk <= 0) {
+        PyErr_Format(PyExc_ValueError, "invalid chunk");
         return NULL;
     }
 
-    int size = self->size - offset;
-    if (size_arg != Py_None) {
-        size = to_int(size_arg);
-        if (size < 0) {
-            PyErr_Format(PyExc_ValueError, "invalid size");
-            return NULL;
-        }
+    intptr size = size_arg != Py_None ? PyLong_AsSsize_t(size_arg) : self->size - offset;
+    if (size == -1 && PyErr_Occurred()) {
+        return NULL;
     }
 
     if (size < 0 || size + offset > self->size) {
@@ -2794,6 +3716,42 @@ static PyObject * Buffer_meth_read(Buffer * self, PyObject * args, PyObject * kw
         return NULL;
     }
 
+    Py_buffer view;
+    int has_buffer = PyObject_CheckBuffer(source);
+
+    if (has_buffer) {
+        if (PyObject_GetBuffer(source, &view, PyBUF_FULL_RO)) {
+            return NULL;
+        }
+        if (size_arg == Py_None) {
+            size = view.len;
+        }
+        if (size > view.len || size + offset > self->size) {
+            PyBuffer_Release(&view);
+            PyErr_Format(PyExc_ValueError, "invalid size");
+            return NULL;
+        }
+        if (!PyBuffer_IsContiguous(&view, 'C')) {
+            PyBuffer_Release(&view);
+            if (size != view.len) {
+                PyErr_Format(PyExc_ValueError, "the size must match non-contiguous sources");
+                return NULL;
+            }
+            PyObject * mem = PyMemoryView_FromObject(source);
+            if (!mem) {
+                return NULL;
+            }
+            Py_XDECREF(PyObject_CallMethod((PyObject *)self, "write", "(Nn)", mem, offset));
+            if (PyErr_Occurred()) {
+                return NULL;
+            }
+            return PyLong_FromSsize_t(size);
+        }
+    } else if (!PyObject_HasAttrString(source, "readinto")) {
+        PyErr_Format(PyExc_TypeError, "the source must be a buffer or a file object");
+        return NULL;
+    }
+
     if (self->target == GL_ELEMENT_ARRAY_BUFFER) {
         bind_vertex_array(self->ctx, 0);
     }
@@ -2802,294 +3760,1769 @@ static PyObject * Buffer_meth_read(Buffer * self, PyObject * args, PyObject * kw
         self->ctx->current_descriptor_set = NULL;
     }
 
-    glBindBuffer(self->target, self->buffer);
+    intptr written = 0;
 
-    if (into == Py_None) {
-        PyObject * res = PyBytes_FromStringAndSize(NULL, size);
-        glGetBufferSubData(self->target, offset, size, PyBytes_AsString(res));
-        return res;
+    if (has_buffer) {
+        glBindBuffer(self->target, self->buffer);
+        while (written < size) {
+            intptr length = size - written < chunk ? size - written : chunk;
+            glBufferSubData(self->target, offset + written, length, (char *)view.buf + written);
+            written += length;
+        }
+        glBindBuffer(self->target, 0);
+        PyBuffer_Release(&view);
+        return PyLong_FromSsize_t(written);
     }
 
-    if (Py_TYPE(into) == self->ctx->module_state->Buffer_type) {
-        PyObject * chunk = PyObject_CallMethod((PyObject *)self, "view", "(ii)", size, offset);
-        return PyObject_CallMethod(into, "write", "(N)", chunk);
+    intptr staging_size = size < chunk ? size : chunk;
+    PyObject * staging = PyByteArray_FromStringAndSize(NULL, staging_size);
+    if (!staging) {
+        return NULL;
     }
 
-    if (Py_TYPE(into) == self->ctx->module_state->BufferView_type) {
-        BufferView * buffer_view = (BufferView *)into;
-        if (size > buffer_view->size) {
-            PyErr_Format(PyExc_ValueError, "invalid size");
+    while (written < size) {
+        intptr length = size - written < chunk ? size - written : chunk;
+        PyObject * mem = PyMemoryView_FromMemory(PyByteArray_AsString(staging), length, PyBUF_WRITE);
+        PyObject * count = PyObject_CallMethod(source, "readinto", "(N)", mem);
+        if (!count) {
+            Py_DECREF(staging);
             return NULL;
         }
-        PyObject * chunk = PyObject_CallMethod((PyObject *)self, "view", "(ii)", size, offset);
-        return PyObject_CallMethod((PyObject *)buffer_view->buffer, "write", "(Ni)", chunk, buffer_view->offset);
+        intptr received = count != Py_None ? PyLong_AsSsize_t(count) : 0;
+        Py_DECREF(count);
+        if (received <= 0) {
+            break;
+        }
+        glBindBuffer(self->target, self->buffer);
+        glBufferSubData(self->target, offset + written, received, PyByteArray_AsString(staging));
+        glBindBuffer(self->target, 0);
+        written += received;
     }
 
-    Py_buffer view;
-    if (PyObject_GetBuffer(into, &view, PyBUF_WRITABLE)) {
-        return NULL;
+    Py_DECREF(staging);
+    return PyLong_FromSsize_t(written);
+}
+
+static intptr * parse_offsets(PyObject * obj, int * count) {
+    if (PyObject_CheckBuffer(obj)) {
+        Py_buffer view;
+        if (PyObject_GetBuffer(obj, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS)) {
+            return NULL;
+        }
+        const char * format = view.format ? view.format : "B";
+        if (*format == '@' || *format == '=' || *format == '<') {
+            format += 1;
+        }
+        if (!format[0] || format[1] || !strchr("iIlLqQnN", format[0]) || (view.itemsize != 4 && view.itemsize != 8)) {
+            PyBuffer_Release(&view);
+            PyErr_Format(PyExc_TypeError, "the offsets must be 32 or 64 bit integers");
+            return NULL;
+        }
+        int length = (int)(view.len / view.itemsize);
+        intptr * res = (intptr *)PyMem_Malloc(sizeof(intptr) * (size_t)(length + 1));
+        for (int i = 0; i < length; ++i) {
+            if (view.itemsize == 4) {
+                res[i] = strchr("IL", format[0]) ? (intptr)((unsigned *)view.buf)[i] : (intptr)((int *)view.buf)[i];
+            } else {
+                res[i] = (intptr)((long long *)view.buf)[i];
+            }
+        }
+        PyBuffer_Release(&view);
+        *count = length;
+        return res;
     }
 
-    if (size > (int)view.len) {
-        PyErr_Format(PyExc_ValueError, "invalid size");
+    PyObject * seq = PySequence_Fast(obj, "the offsets must be a sequence of ints");
+    if (!seq) {
         return NULL;
     }
-
-    glGetBufferSubData(self->target, offset, size, view.buf);
-    PyBuffer_Release(&view);
-    Py_RETURN_NONE;
+    int length = (int)PySequence_Fast_GET_SIZE(seq);
+    intptr * res = (intptr *)PyMem_Malloc(sizeof(intptr) * (size_t)(length + 1));
+    for (int i = 0; i < length; ++i) {
+        PyObject * item = PySequence_Fast_GET_ITEM(seq, i);
+        if (!PyLong_Check(item)) {
+            PyErr_Format(PyExc_TypeError, "the offsets must be a sequence of ints");
+            PyMem_Free(res);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        res[i] = PyLong_AsSsize_t(item);
+    }
+    Py_DECREF(seq);
+    *count = length;
+    return res;
 }
 
-static BufferView * Buffer_meth_view(Buffer * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"size", "offset", NULL};
+static PyObject * Buffer_meth_write_many(Buffer * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"items", "data", NULL};
 
-    PyObject * size_arg = Py_None;
-    int offset = 0;
+    PyObject * items;
+    PyObject * data = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|Oi", keywords, &size_arg, &offset)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|O", keywords, &items, &data)) {
         return NULL;
     }
 
-    int size = self->size - offset;
-    if (size_arg != Py_None) {
-        size = to_int(size_arg);
-    }
-
     if (self->ctx->is_lost) {
         PyErr_Format(PyExc_RuntimeError, "the context is lost");
         return NULL;
     }
 
-    if (offset < 0 || offset > self->size) {
-        PyErr_Format(PyExc_ValueError, "invalid offset");
-        return NULL;
+    int count = 0;
+    intptr * offsets = NULL;
+    intptr * sizes = NULL;
+    const char ** ptrs = NULL;
+    PyObject * mems = NULL;
+    Py_buffer * views = NULL;
+    int num_views = 0;
+    char * staging = NULL;
+    PyObject * res = NULL;
+
+    if (data != Py_None) {
+        offsets = parse_offsets(items, &count);
+        if (!offsets) {
+            return NULL;
+        }
+        mems = PyTuple_New(1);
+        views = (Py_buffer *)PyMem_Malloc(sizeof(Py_buffer));
+        PyObject * mem = PyMemoryView_GetContiguous(data, PyBUF_READ, 'C');
+        if (!mem) {
+            goto cleanup;
+        }
+        PyTuple_SetItem(mems, 0, mem);
+        if (PyObject_GetBuffer(mem, &views[0], PyBUF_SIMPLE)) {
+            goto cleanup;
+        }
+        num_views = 1;
+        if (count && views[0].len % count) {
+            PyErr_Format(PyExc_ValueError, "the data size must be a multiple of the number of offsets");
+            goto cleanup;
+        }
+        intptr chunk = count ? views[0].len / count : 0;
+        sizes = (intptr *)PyMem_Malloc(sizeof(intptr) * (size_t)(count + 1));
+        ptrs = (const char **)PyMem_Malloc(sizeof(char *) * (size_t)(count + 1));
+        for (int i = 0; i < count; ++i) {
+            sizes[i] = chunk;
+            ptrs[i] = (const char *)views[0].buf + chunk * i;
+        }
+    } else {
+        PyObject * seq = PySequence_Fast(items, "the items must be a sequence of (offset, data) pairs");
+        if (!seq) {
+            return NULL;
+        }
+        count = (int)PySequence_Fast_GET_SIZE(seq);
+        offsets = (intptr *)PyMem_Malloc(sizeof(intptr) * (size_t)(count + 1));
+        sizes = (intptr *)PyMem_Malloc(sizeof(intptr) * (size_t)(count + 1));
+        ptrs = (const char **)PyMem_Malloc(sizeof(char *) * (size_t)(count + 1));
+        views = (Py_buffer *)PyMem_Malloc(sizeof(Py_buffer) * (size_t)(count + 1));
+        mems = PyTuple_New(count);
+        for (int i = 0; i < count; ++i) {
+            PyObject * item = PySequence_Fast_GET_ITEM(seq, i);
+            if (!PyTuple_Check(item) || PyTuple_Size(item) != 2 || !PyLong_Check(PyTuple_GetItem(item, 0))) {
+                PyErr_Format(PyExc_TypeError, "the items must be a sequence of (offset, data) pairs");
+                Py_DECREF(seq);
+                goto cleanup;
+            }
+            offsets[i] = PyLong_AsSsize_t(PyTuple_GetItem(item, 0));
+            PyObject * mem = PyMemoryView_GetContiguous(PyTuple_GetItem(item, 1), PyBUF_READ, 'C');
+            if (!mem) {
+                Py_DECREF(seq);
+                goto cleanup;
+            }
+            PyTuple_SetItem(mems, i, mem);
+            if (PyObject_GetBuffer(mem, &views[i], PyBUF_SIMPLE)) {
+                Py_DECREF(seq);
+                goto cleanup;
+            }
+            num_views += 1;
+            sizes[i] = views[i].len;
+            ptrs[i] = (const char *)views[i].buf;
+        }
+        Py_DECREF(seq);
     }
 
-    if (size < 0 || offset + size > self->size) {
-        PyErr_Format(PyExc_ValueError, "invalid size");
-        return NULL;
+    if (PyErr_Occurred()) {
+        goto cleanup;
     }
 
-    BufferView * res = PyObject_New(BufferView, self->ctx->module_state->BufferView_type);
-    res->buffer = (Buffer *)new_ref(self);
-    res->offset = offset;
-    res->size = size;
-    return res;
-}
+    for (int i = 0; i < count; ++i) {
+        if (offsets[i] < 0 || offsets[i] > self->size) {
+            PyErr_Format(PyExc_ValueError, "invalid offset");
+            goto cleanup;
+        }
+        if (sizes[i] + offsets[i] > self->size) {
+            PyErr_Format(PyExc_ValueError, "invalid size");
+            goto cleanup;
+        }
+    }
+
+    if (self->target == GL_ELEMENT_ARRAY_BUFFER) {
+        bind_vertex_array(self->ctx, 0);
+    }
+
+    if (self->target == GL_UNIFORM_BUFFER) {
+        self->ctx->current_descriptor_set = NULL;
+    }
+
+    glBindBuffer(self->target, self->buffer);
+
+    intptr staging_size = 0;
+    int first = 0;
+    while (first < count) {
+        int last = first + 1;
+        intptr run_size = sizes[first];
+        int contiguous = 1;
+        while (last < count && offsets[last] == offsets[first] + run_size) {
+            contiguous = contiguous && ptrs[last] == ptrs[first] + run_size;
+            run_size += sizes[last];
+            last += 1;
+        }
+        const char * ptr = ptrs[first];
+        if (!contiguous) {
+            if (staging_size < run_size) {
+                PyMem_Free(staging);
+                staging = (char *)PyMem_Malloc((size_t)run_size);
+                staging_size = run_size;
+            }
+            intptr position = 0;
+            for (int i = first; i < last; ++i) {
+                memcpy(staging + position, ptrs[i], (size_t)sizes[i]);
+                position += sizes[i];
+            }
+            ptr = staging;
+        }
+        if (run_size) {
+            glBufferSubData(self->target, offsets[first], run_size, ptr);
+        }
+        first = last;
+    }
+
+    glBindBuffer(self->target, 0);
+    res = new_ref(Py_None);
+
+cleanup:
+    for (int i = 0; i < num_views; ++i) {
+        PyBuffer_Release(&views[i]);
+    }
+    Py_XDECREF(mems);
+    PyMem_Free(views);
+    PyMem_Free(offsets);
+    PyMem_Free(sizes);
+    PyMem_Free(ptrs);
+    PyMem_Free(staging);
+    return res;
+}
+
+static int rebuild_vertex_arrays(Context * self, Buffer * buffer) {
+    PyObject * key = NULL;
+    PyObject * value = NULL;
+    Py_ssize_t pos = 0;
+    while (PyDict_Next(self->vertex_array_cache, &pos, &key, &value)) {
+        int length = (int)PyTuple_Size(key);
+        int found = PyTuple_GetItem(key, 0) == (PyObject *)buffer;
+        for (int i = 1; i < length && !found; i += 6) {
+            found = PyTuple_GetItem(key, i) == (PyObject *)buffer;
+        }
+        if (found) {
+            bind_vertex_array(self, ((GLObject *)value)->obj);
+            if (!setup_vertex_array(self, key)) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+static void zero_buffer_range(int target, intptr offset, intptr size) {
+    void * zeros = PyMem_Calloc(1, (size_t)size);
+    glBufferSubData(target, offset, size, zeros);
+    PyMem_Free(zeros);
+}
+
+static PyObject * Buffer_meth_resize(Buffer * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "preserve", NULL};
+
+    intptr size;
+    int preserve = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "n|p", keywords, &size, &preserve)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (size <= 0) {
+        PyErr_Format(PyExc_ValueError, "invalid size");
+        return NULL;
+    }
+
+    if (self->target == GL_ELEMENT_ARRAY_BUFFER) {
+        bind_vertex_array(self->ctx, 0);
+    }
+
+    if (self->target == GL_UNIFORM_BUFFER) {
+        self->ctx->current_descriptor_set = NULL;
+    }
+
+    if (!preserve) {
+        if (size > self->capacity) {
+            self->capacity = size > self->capacity * 2 ? size : self->capacity * 2;
+        }
+        glBindBuffer(self->target, self->buffer);
+        glBufferData(self->target, self->capacity, NULL, self->access);
+        glBindBuffer(self->target, 0);
+        self->size = size;
+        Py_RETURN_NONE;
+    }
+
+    if (size <= self->capacity) {
+        if (size > self->size) {
+            glBindBuffer(self->target, self->buffer);
+            zero_buffer_range(self->target, self->size, size - self->size);
+            glBindBuffer(self->target, 0);
+        }
+        self->size = size;
+        Py_RETURN_NONE;
+    }
+
+    intptr capacity = size > self->capacity * 2 ? size : self->capacity * 2;
+    int buffer = 0;
+    glGenBuffers(1, &buffer);
+    glBindBuffer(GL_COPY_WRITE_BUFFER, buffer);
+    glBufferData(GL_COPY_WRITE_BUFFER, capacity, NULL, self->access);
+    glBindBuffer(GL_COPY_READ_BUFFER, self->buffer);
+    glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_COPY_WRITE_BUFFER, 0, 0, self->size);
+    zero_buffer_range(GL_COPY_WRITE_BUFFER, self->size, size - self->size);
+    glBindBuffer(GL_COPY_READ_BUFFER, 0);
+    glBindBuffer(GL_COPY_WRITE_BUFFER, 0);
+    glDeleteBuffers(1, &self->buffer);
+
+    self->buffer = buffer;
+    self->capacity = capacity;
+    self->size = size;
+
+    if (!rebuild_vertex_arrays(self->ctx, self)) {
+        return NULL;
+    }
+
+    bind_vertex_array(self->ctx, 0);
+    Py_RETURN_NONE;
+}
+
+static PyObject * Buffer_meth_read(Buffer * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "offset", "into", NULL};
+
+    PyObject * size_arg = Py_None;
+    intptr offset = 0;
+    PyObject * into = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OnO", keywords, &size_arg, &offset, &into)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (offset < 0 || offset > self->size) {
+        PyErr_Format(PyExc_ValueError, "invalid offset");
+        return NULL;
+    }
+
+    if (size_arg != Py_None && !PyLong_CheckExact(size_arg)) {
+        PyErr_Format(PyExc_TypeError, "the size must be an int");
+        return NULL;
+    }
+
+    intptr size = self->size - offset;
+    if (size_arg != Py_None) {
+        size = PyLong_AsSsize_t(size_arg);
+        if (size == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (size < 0) {
+            PyErr_Format(PyExc_ValueError, "invalid size");
+            return NULL;
+        }
+    }
+
+    if (size < 0 || size + offset > self->size) {
+        PyErr_Format(PyExc_ValueError, "invalid size");
+        return NULL;
+    }
+
+    if (self->target == GL_ELEMENT_ARRAY_BUFFER) {
+        bind_vertex_array(self->ctx, 0);
+    }
+
+    if (self->target == GL_UNIFORM_BUFFER) {
+        self->ctx->current_descriptor_set = NULL;
+    }
+
+    glBindBuffer(self->target, self->buffer);
+
+    if (into == Py_None) {
+        PyObject * res = PyBytes_FromStringAndSize(NULL, size);
+        glGetBufferSubData(self->target, offset, size, PyBytes_AsString(res));
+        return res;
+    }
+
+    if (Py_TYPE(into) == self->ctx->module_state->Buffer_type) {
+        PyObject * chunk = PyObject_CallMethod((PyObject *)self, "view", "(nn)", size, offset);
+        return PyObject_CallMethod(into, "write", "(N)", chunk);
+    }
+
+    if (Py_TYPE(into) == self->ctx->module_state->BufferView_type) {
+        BufferView * buffer_view = (BufferView *)into;
+        if (size > buffer_view->size) {
+            PyErr_Format(PyExc_ValueError, "invalid size");
+            return NULL;
+        }
+        PyObject * chunk = PyObject_CallMethod((PyObject *)self, "view", "(nn)", size, offset);
+        return PyObject_CallMethod((PyObject *)buffer_view->buffer, "write", "(Nn)", chunk, buffer_view->offset);
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(into, &view, PyBUF_WRITABLE)) {
+        return NULL;
+    }
+
+    if (size > view.len) {
+        PyErr_Format(PyExc_ValueError, "invalid size");
+        return NULL;
+    }
+
+    glGetBufferSubData(self->target, offset, size, view.buf);
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
+}
+
+static BufferView * Buffer_meth_view(Buffer * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "offset", NULL};
+
+    PyObject * size_arg = Py_None;
+    intptr offset = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|On", keywords, &size_arg, &offset)) {
+        return NULL;
+    }
+
+    intptr size = self->size - offset;
+    if (size_arg != Py_None) {
+        size = PyLong_AsSsize_t(size_arg);
+        if (size == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (offset < 0 || offset > self->size) {
+        PyErr_Format(PyExc_ValueError, "invalid offset");
+        return NULL;
+    }
+
+    if (size < 0 || offset + size > self->size) {
+        PyErr_Format(PyExc_ValueError, "invalid size");
+        return NULL;
+    }
+
+    BufferView * res = PyObject_New(BufferView, self->ctx->module_state->BufferView_type);
+    res->buffer = (Buffer *)new_ref(self);
+    res->offset = offset;
+    res->size = size;
+    return res;
+}
+
+static int level_layers(Image * self, int level) {
+    return self->depth ? least_one(self->depth >> level) : self->layer_count;
+}
+
+static int parse_layer_range(Image * self, PyObject * layers_arg, int level, int * first, int * count) {
+    if (layers_arg == Py_None) {
+        *first = 0;
+        *count = level_layers(self, level);
+        return 1;
+    }
+
+    long first_value;
+    long count_value;
+
+    if (PyLong_CheckExact(layers_arg)) {
+        first_value = PyLong_AsLong(layers_arg);
+        count_value = 1;
+        if (PyErr_Occurred()) {
+            return 0;
+        }
+    } else if (PyRange_Check(layers_arg)) {
+        PyObject * start = PyObject_GetAttrString(layers_arg, "start");
+        PyObject * stop = PyObject_GetAttrString(layers_arg, "stop");
+        PyObject * step = PyObject_GetAttrString(layers_arg, "step");
+        if (!start || !stop || !step) {
+            Py_XDECREF(start);
+            Py_XDECREF(stop);
+            Py_XDECREF(step);
+            return 0;
+        }
+        first_value = PyLong_AsLong(start);
+        long stop_value = PyLong_AsLong(stop);
+        long step_value = PyLong_AsLong(step);
+        Py_DECREF(start);
+        Py_DECREF(stop);
+        Py_DECREF(step);
+        if (PyErr_Occurred()) {
+            return 0;
+        }
+        count_value = first_value >= 0 ? stop_value - first_value : 0;
+        if (step_value != 1) {
+            PyErr_Format(PyExc_ValueError, "the layers must be a range with a step of 1");
+            return 0;
+        }
+    } else {
+        PyErr_Format(PyExc_TypeError, "the layers must be an int, a range or None");
+        return 0;
+    }
+
+    if (first_value < 0 || count_value <= 0 || first_value + count_value > level_layers(self, level)) {
+        PyErr_Format(PyExc_ValueError, "invalid layers");
+        return 0;
+    }
+
+    *first = (int)first_value;
+    *count = (int)count_value;
+    return 1;
+}
+
+static PyObject * Image_meth_clear(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"rect", "layers", "level", NULL};
+
+    PyObject * rect_arg = Py_None;
+    PyObject * layers_arg = Py_None;
+    int level = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOi", keywords, &rect_arg, &layers_arg, &level)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (self->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot clear compressed images");
+        return NULL;
+    }
+
+    if (level < 0 || level >= self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid level");
+        return NULL;
+    }
+
+    int first;
+    int count;
+    if (!parse_layer_range(self, layers_arg, level, &first, &count)) {
+        return NULL;
+    }
+
+    int width = least_one(self->width >> level);
+    int height = least_one(self->height >> level);
+
+    Viewport rect;
+    if (!to_viewport(&rect, rect_arg, 0, 0, width, height)) {
+        PyErr_Format(PyExc_TypeError, "the rect must be a tuple of 4 ints");
+        return NULL;
+    }
+
+    if (rect.x < 0 || rect.y < 0 || rect.width <= 0 || rect.height <= 0 || rect.x + rect.width > width || rect.y + rect.height > height) {
+        PyErr_Format(PyExc_ValueError, "invalid rect");
+        return NULL;
+    }
+
+    int clear_format = 0;
+    int clear_type = 0;
+    if (self->ctx->has_clear_texture && !self->renderbuffer) {
+        if (self->fmt.color && self->fmt.clear_type == 'f') {
+            clear_format = GL_RGBA;
+            clear_type = GL_FLOAT;
+        } else if (self->fmt.color && self->fmt.clear_type == 'i') {
+            clear_format = GL_RGBA_INTEGER;
+            clear_type = GL_INT;
+        } else if (self->fmt.color && self->fmt.clear_type == 'u') {
+            clear_format = GL_RGBA_INTEGER;
+            clear_type = GL_UNSIGNED_INT;
+        }
+    }
+
+    if (clear_format) {
+        glClearTexSubImage(self->image, level, rect.x, rect.y, first, rect.width, rect.height, count, clear_format, clear_type, &self->clear_value);
+        Py_RETURN_NONE;
+    }
+
+    int scissor = rect.x || rect.y || rect.width != width || rect.height != height;
+    if (scissor) {
+        glEnable(GL_SCISSOR_TEST);
+        glScissor(rect.x, rect.y, rect.width, rect.height);
+    }
+
+    for (int i = first; i < first + count; ++i) {
+        PyObject * key = Py_BuildValue("(ii)", i, level);
+        ImageFace * face = build_image_face(self, key);
+        Py_DECREF(key);
+        bind_draw_framebuffer(self->ctx, face->framebuffer->obj);
+        clear_bound_image(self);
+        Py_DECREF(face);
+    }
+
+    if (scissor) {
+        glDisable(GL_SCISSOR_TEST);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * Image_meth_invalidate(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"layers", "level", NULL};
+
+    PyObject * layers_arg = Py_None;
+    int level = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|Oi", keywords, &layers_arg, &level)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (self->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot invalidate compressed images");
+        return NULL;
+    }
+
+    if (level < 0 || level >= self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid level");
+        return NULL;
+    }
+
+    int first;
+    int count;
+    if (!parse_layer_range(self, layers_arg, level, &first, &count)) {
+        return NULL;
+    }
+
+    if (!self->ctx->has_invalidate_framebuffer) {
+        Py_RETURN_NONE;
+    }
+
+    int buffer = self->fmt.buffer;
+    int attachment = self->fmt.color ? GL_COLOR_ATTACHMENT0 : buffer == GL_DEPTH ? GL_DEPTH_ATTACHMENT : buffer == GL_STENCIL ? GL_STENCIL_ATTACHMENT : GL_DEPTH_STENCIL_ATTACHMENT;
+
+    for (int i = first; i < first + count; ++i) {
+        PyObject * key = Py_BuildValue("(ii)", i, level);
+        ImageFace * face = build_image_face(self, key);
+        Py_DECREF(key);
+        bind_draw_framebuffer(self->ctx, face->framebuffer->obj);
+        glInvalidateFramebuffer(GL_DRAW_FRAMEBUFFER, 1, &attachment);
+        Py_DECREF(face);
+    }
+
+    Py_RETURN_NONE;
+}
+
+static void upload_image_layers(Image * self, const ImageFormat * fmt, int level, int layer, int layers, IntPair offset, IntPair size, intptr stride, const char * ptr) {
+    if (self->fmt.flags & FORMAT_COMPRESSED) {
+        int format = self->fmt.internal_format;
+        if (self->cubemap) {
+            for (int i = 0; i < layers; ++i) {
+                int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + layer + i;
+                glCompressedTexSubImage2D(face, level, offset.x, offset.y, size.x, size.y, format, (int)stride, ptr + stride * i);
+            }
+        } else if (self->array) {
+            glCompressedTexSubImage3D(self->target, level, offset.x, offset.y, layer, size.x, size.y, layers, format, (int)(stride * layers), ptr);
+        } else {
+            glCompressedTexSubImage2D(self->target, level, offset.x, offset.y, size.x, size.y, format, (int)stride, ptr);
+        }
+    } else if (self->cubemap) {
+        for (int i = 0; i < layers; ++i) {
+            int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + layer + i;
+            glTexSubImage2D(face, level, offset.x, offset.y, size.x, size.y, fmt->format, fmt->type, ptr + stride * i);
+        }
+    } else if (self->array || self->depth) {
+        glTexSubImage3D(self->target, level, offset.x, offset.y, layer, size.x, size.y, layers, fmt->format, fmt->type, ptr);
+    } else {
+        glTexSubImage2D(self->target, level, offset.x, offset.y, size.x, size.y, fmt->format, fmt->type, ptr);
+    }
+}
+
+static void write_image_layers(Image * self, const ImageFormat * fmt, int level, int layer, int layers, IntPair offset, IntPair size, intptr stride, const char * ptr) {
+    glActiveTexture(self->ctx->default_texture_unit);
+    glBindTexture(self->target, self->image);
+    upload_image_layers(self, fmt, level, layer, layers, offset, size, stride, ptr);
+}
+
+static int parse_image_write(Image * self, PyObject * size_arg, PyObject * offset_arg, PyObject * layer_arg, int level, IntPair * size, IntPair * offset, int * layer) {
+    if (layer_arg != Py_None && !PyLong_CheckExact(layer_arg)) {
+        PyErr_Format(PyExc_TypeError, "the layer must be an int or None");
+        return 0;
+    }
+
+    *layer = 0;
+    if (layer_arg != Py_None) {
+        *layer = to_int(layer_arg);
+    }
+
+    if (!to_int_pair(size, size_arg, least_one(self->width >> level), least_one(self->height >> level))) {
+        PyErr_Format(PyExc_TypeError, "the size must be a tuple of 2 ints");
+        return 0;
+    }
+
+    if (!to_int_pair(offset, offset_arg, 0, 0)) {
+        PyErr_Format(PyExc_TypeError, "the offset must be a tuple of 2 ints");
+        return 0;
+    }
+
+    if (size_arg == Py_None && offset_arg != Py_None) {
+        PyErr_Format(PyExc_ValueError, "the size is required when the offset is not None");
+        return 0;
+    }
+
+    if (size->x <= 0 || size->y <= 0 || size->x > self->width || size->y > self->height) {
+        PyErr_Format(PyExc_ValueError, "invalid size");
+        return 0;
+    }
+
+    if (offset->x < 0 || offset->y < 0 || size->x + offset->x > self->width || size->y + offset->y > self->height) {
+        PyErr_Format(PyExc_ValueError, "invalid offset");
+        return 0;
+    }
+
+    if (*layer < 0 || *layer >= level_layers(self, level)) {
+        PyErr_Format(PyExc_ValueError, "invalid layer");
+        return 0;
+    }
+
+    if (level < 0 || level > self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid level");
+        return 0;
+    }
+
+    if (!self->cubemap && !self->array && !self->depth && layer_arg != Py_None) {
+        PyErr_Format(PyExc_TypeError, "the image is not layered");
+        return 0;
+    }
+
+    if (!self->fmt.color) {
+        PyErr_Format(PyExc_TypeError, "cannot write to depth or stencil images");
+        return 0;
+    }
+
+    if (self->samples != 1) {
+        PyErr_Format(PyExc_TypeError, "cannot write to multisampled images");
+        return 0;
+    }
+
+    if (self->fmt.flags & FORMAT_COMPRESSED) {
+        int width = least_one(self->width >> level);
+        int height = least_one(self->height >> level);
+        int aligned_offset = offset->x % 4 == 0 && offset->y % 4 == 0;
+        int aligned_size = (size->x % 4 == 0 || offset->x + size->x == width) && (size->y % 4 == 0 || offset->y + size->y == height);
+        if (!aligned_offset || !aligned_size) {
+            PyErr_Format(PyExc_ValueError, "the size and offset must be aligned to 4x4 blocks");
+            return 0;
+        }
+    }
+
+    return 1;
+}
+
+static PyObject * write_image_compressed(Image * self, PyObject * data, int level, int layer, int layers, IntPair offset, IntPair size) {
+    intptr layer_size = compressed_size(&self->fmt, size.x, size.y);
+    intptr expected_size = layer_size * layers;
+
+    BufferView * buffer_view = NULL;
+
+    if (Py_TYPE(data) == self->ctx->module_state->Buffer_type) {
+        buffer_view = (BufferView *)PyObject_CallMethod(data, "view", NULL);
+    }
+
+    if (Py_TYPE(data) == self->ctx->module_state->BufferView_type) {
+        buffer_view = (BufferView *)new_ref(data);
+    }
+
+    if (buffer_view) {
+        if (buffer_view->size != expected_size) {
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected %zd, got %zd", expected_size, buffer_view->size);
+            Py_DECREF(buffer_view);
+            return NULL;
+        }
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer_view->buffer->buffer);
+        write_image_layers(self, &self->fmt, level, layer, layers, offset, size, layer_size, (char *)(intptr)buffer_view->offset);
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+        Py_DECREF(buffer_view);
+        Py_RETURN_NONE;
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)) {
+        return NULL;
+    }
+
+    if (view.len != expected_size) {
+        PyErr_Format(PyExc_ValueError, "invalid data size, expected %zd, got %zd", expected_size, view.len);
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+
+    write_image_layers(self, &self->fmt, level, layer, layers, offset, size, layer_size, (char *)view.buf);
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
+}
+
+static PyObject * write_image_packed(Image * self, const ImageFormat * fmt, PyObject * data, int level, int layer, int layers, IntPair offset, IntPair size, int row_length, int alignment) {
+    intptr stride = row_stride(size.x, fmt->pixel_size, row_length, alignment);
+    intptr layer_size = stride * size.y;
+    intptr expected_size = layer_size * (layers - 1) + stride * (size.y - 1) + (intptr)size.x * fmt->pixel_size;
+
+    BufferView * buffer_view = NULL;
+
+    if (Py_TYPE(data) == self->ctx->module_state->Buffer_type) {
+        buffer_view = (BufferView *)PyObject_CallMethod(data, "view", NULL);
+    }
+
+    if (Py_TYPE(data) == self->ctx->module_state->BufferView_type) {
+        buffer_view = (BufferView *)new_ref(data);
+    }
+
+    Py_buffer view = {0};
+    const char * ptr = NULL;
+
+    if (buffer_view) {
+        if (buffer_view->size < expected_size) {
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected at least %zd, got %zd", expected_size, buffer_view->size);
+            Py_DECREF(buffer_view);
+            return NULL;
+        }
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer_view->buffer->buffer);
+        ptr = (char *)(intptr)buffer_view->offset;
+    } else {
+        if (PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)) {
+            return NULL;
+        }
+        if (view.len < expected_size) {
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected at least %zd, got %zd", expected_size, view.len);
+            PyBuffer_Release(&view);
+            return NULL;
+        }
+        ptr = (char *)view.buf;
+    }
+
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, row_length);
+    glPixelStorei(GL_UNPACK_ALIGNMENT, alignment);
+    write_image_layers(self, fmt, level, layer, layers, offset, size, layer_size, ptr);
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, 0);
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4);
+
+    if (buffer_view) {
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+        Py_DECREF(buffer_view);
+    } else {
+        PyBuffer_Release(&view);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * Image_meth_write(Image * self, PyObject * args, PyObject * kwargs);
+
+static PyObject * write_image_sequence(Image * self, PyObject * data, IntPair size, IntPair offset, PyObject * layer_arg, int level, int layers, PyObject * kwargs) {
+    if (layer_arg != Py_None) {
+        PyErr_Format(PyExc_TypeError, "the data must be a single buffer when the layer is not None");
+        return NULL;
+    }
+
+    if (PySequence_Size(data) != layers) {
+        PyErr_Format(PyExc_ValueError, "the data must have one buffer for each layer, expected %d, got %d", layers, (int)PySequence_Size(data));
+        return NULL;
+    }
+
+    PyObject * empty = PyTuple_New(0);
+    PyObject * layer_kwargs = kwargs ? PyDict_Copy(kwargs) : PyDict_New();
+    PyObject * size_arg = Py_BuildValue("(ii)", size.x, size.y);
+    PyObject * offset_arg = Py_BuildValue("(ii)", offset.x, offset.y);
+    PyObject * level_arg = PyLong_FromLong(level);
+    PyDict_SetItemString(layer_kwargs, "size", size_arg);
+    PyDict_SetItemString(layer_kwargs, "offset", offset_arg);
+    PyDict_SetItemString(layer_kwargs, "level", level_arg);
+    Py_DECREF(size_arg);
+    Py_DECREF(offset_arg);
+    Py_DECREF(level_arg);
+
+    PyObject * res = Py_None;
+    for (int i = 0; i < layers; ++i) {
+        PyDict_SetItemString(layer_kwargs, "data", PySequence_Fast_GET_ITEM(data, i));
+        if (self->array || self->cubemap || self->depth) {
+            PyObject * layer = PyLong_FromLong(i);
+            PyDict_SetItemString(layer_kwargs, "layer", layer);
+            Py_DECREF(layer);
+        }
+        PyObject * temp = Image_meth_write(self, empty, layer_kwargs);
+        if (!temp) {
+            res = NULL;
+            break;
+        }
+        Py_DECREF(temp);
+    }
+
+    Py_DECREF(layer_kwargs);
+    Py_DECREF(empty);
+    return res ? new_ref(res) : NULL;
+}
+
+static PyObject * Image_meth_write(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"data", "size", "offset", "layer", "level", "zero_copy_only", "row_length", "alignment", "format", NULL};
+
+    PyObject * data;
+    PyObject * size_arg = Py_None;
+    PyObject * offset_arg = Py_None;
+    PyObject * layer_arg = Py_None;
+    int level = 0;
+    int zero_copy_only = 0;
+    int row_length = 0;
+    int alignment = 0;
+    PyObject * format_arg = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OOOi$piiO", keywords, &data, &size_arg, &offset_arg, &layer_arg, &level, &zero_copy_only, &row_length, &alignment, &format_arg)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    IntPair size, offset;
+    int layer;
+    if (!parse_image_write(self, size_arg, offset_arg, layer_arg, level, &size, &offset, &layer)) {
+        return NULL;
+    }
+
+    ImageFormat fmt;
+    if (!get_pixel_format(self, format_arg, &fmt)) {
+        return NULL;
+    }
+
+    int layers = layer_arg == Py_None ? level_layers(self, level) : 1;
+
+    if (PyList_Check(data) || PyTuple_Check(data)) {
+        return write_image_sequence(self, data, size, offset, layer_arg, level, layers, kwargs);
+    }
+
+    int row_size = size.x * fmt.pixel_size;
+    int padded_row = (row_size + 3) & ~3;
+    int expected_size = padded_row * size.y * layers;
+
+    if (self->fmt.flags & FORMAT_COMPRESSED) {
+        if (row_length || alignment) {
+            PyErr_Format(PyExc_ValueError, "the row_length and alignment are not supported for compressed images");
+            return NULL;
+        }
+        return write_image_compressed(self, data, level, layer, layers, offset, size);
+    }
+
+    if ((row_length || alignment) && !parse_pixel_store(size.x, row_length, alignment ? alignment : 4)) {
+        return NULL;
+    }
+
+    if (row_length || alignment) {
+        return write_image_packed(self, &fmt, data, level, layer, layers, offset, size, row_length, alignment ? alignment : 4);
+    }
+
+    BufferView * buffer_view = NULL;
+
+    if (Py_TYPE(data) == self->ctx->module_state->Buffer_type) {
+        buffer_view = (BufferView *)PyObject_CallMethod(data, "view", NULL);
+    }
+
+    if (Py_TYPE(data) == self->ctx->module_state->BufferView_type) {
+        buffer_view = (BufferView *)new_ref(data);
+    }
+
+    if (buffer_view) {
+        if (buffer_view->size != expected_size) {
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected %d, got %zd", expected_size, buffer_view->size);
+            return NULL;
+        }
+
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer_view->buffer->buffer);
+        write_image_layers(self, &fmt, level, layer, layers, offset, size, padded_row * size.y, (char *)(intptr)buffer_view->offset);
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+
+        Py_DECREF(buffer_view);
+        Py_RETURN_NONE;
+    }
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(data, &view, PyBUF_FULL_RO)) {
+        return NULL;
+    }
+    int data_size = (int)view.len;
+
+    if (PyBuffer_IsContiguous(&view, 'C')) {
+        if (data_size != expected_size) {
+            PyBuffer_Release(&view);
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected %d, got %d", expected_size, data_size);
+            return NULL;
+        }
+        write_image_layers(self, &fmt, level, layer, layers, offset, size, padded_row * size.y, (char *)view.buf);
+        PyBuffer_Release(&view);
+        Py_RETURN_NONE;
+    }
+
+    if (data_size != expected_size && data_size != row_size * size.y * layers) {
+        PyBuffer_Release(&view);
+        PyErr_Format(PyExc_ValueError, "invalid data size, expected %d, got %d", expected_size, data_size);
+        return NULL;
+    }
+
+    int source_row = data_size / (size.y * layers);
+    intptr pitch = 0;
+
+    if (row_pitch(&view, source_row, &pitch) && pitch % fmt.pixel_size == 0) {
+        glPixelStorei(GL_UNPACK_ROW_LENGTH, (int)(pitch / fmt.pixel_size));
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1);
+        write_image_layers(self, &fmt, level, layer, layers, offset, size, pitch * size.y, (char *)view.buf);
+        glPixelStorei(GL_UNPACK_ROW_LENGTH, 0);
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4);
+        PyBuffer_Release(&view);
+        Py_RETURN_NONE;
+    }
+
+    if (zero_copy_only) {
+        PyBuffer_Release(&view);
+        PyErr_Format(PyExc_ValueError, "the data is not contiguous and cannot be uploaded without a copy");
+        return NULL;
+    }
+
+    char * ptr = (char *)PyMem_Malloc((size_t)data_size);
+    if (!ptr) {
+        PyBuffer_Release(&view);
+        return PyErr_NoMemory();
+    }
+    PyBuffer_ToContiguous(ptr, &view, data_size, 'C');
+    glPixelStorei(GL_UNPACK_ALIGNMENT, source_row == row_size ? 1 : 4);
+    write_image_layers(self, &fmt, level, layer, layers, offset, size, (intptr)source_row * size.y, ptr);
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4);
+    PyMem_Free(ptr);
+
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
+}
+
+static PyObject * Image_meth_write_all(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"data", "levels", "layers", "alignment", NULL};
+
+    PyObject * data;
+    PyObject * levels_arg = Py_None;
+    PyObject * layers_arg = Py_None;
+    int alignment = 4;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OO$i", keywords, &data, &levels_arg, &layers_arg, &alignment)) {
+        return NULL;
+    }
 
-static PyObject * Image_meth_clear(Image * self, PyObject * args) {
     if (self->ctx->is_lost) {
         PyErr_Format(PyExc_RuntimeError, "the context is lost");
         return NULL;
     }
 
-    const int count = (int)PyTuple_Size(self->layers);
-    for (int i = 0; i < count; ++i) {
-        ImageFace * face = (ImageFace *)PyTuple_GetItem(self->layers, i);
-        bind_draw_framebuffer(self->ctx, face->framebuffer->obj);
-        clear_bound_image(self);
+    if ((levels_arg != Py_None && !PyLong_CheckExact(levels_arg)) || (layers_arg != Py_None && !PyLong_CheckExact(layers_arg))) {
+        PyErr_Format(PyExc_TypeError, "the levels and layers must be int or None");
+        return NULL;
+    }
+
+    if (self->depth && layers_arg != Py_None) {
+        PyErr_Format(PyExc_TypeError, "the layers are not supported for 3D images");
+        return NULL;
+    }
+
+    int levels = levels_arg != Py_None ? to_int(levels_arg) : self->level_count;
+    int layers = layers_arg != Py_None ? to_int(layers_arg) : self->layer_count;
+
+    if (levels <= 0 || levels > self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid levels");
+        return NULL;
+    }
+
+    if (layers <= 0 || layers > self->layer_count) {
+        PyErr_Format(PyExc_ValueError, "invalid layers");
+        return NULL;
+    }
+
+    if (!valid_alignment(alignment)) {
+        PyErr_Format(PyExc_ValueError, "the alignment must be 1, 2, 4 or 8");
+        return NULL;
+    }
+
+    if (!self->fmt.color) {
+        PyErr_Format(PyExc_TypeError, "cannot write to depth or stencil images");
+        return NULL;
+    }
+
+    if (self->samples != 1) {
+        PyErr_Format(PyExc_TypeError, "cannot write to multisampled images");
+        return NULL;
+    }
+
+    int compressed = self->fmt.flags & FORMAT_COMPRESSED;
+    intptr expected_size = 0;
+    for (int level = 0; level < levels; ++level) {
+        int width = least_one(self->width >> level);
+        int height = least_one(self->height >> level);
+        int level_layer_count = self->depth ? level_layers(self, level) : layers;
+        if (compressed) {
+            expected_size += compressed_size(&self->fmt, width, height) * level_layer_count;
+        } else {
+            expected_size += row_stride(width, self->fmt.pixel_size, 0, alignment) * height * level_layer_count;
+        }
+    }
+
+    BufferView * buffer_view = NULL;
+
+    if (Py_TYPE(data) == self->ctx->module_state->Buffer_type) {
+        buffer_view = (BufferView *)PyObject_CallMethod(data, "view", NULL);
+    }
+
+    if (Py_TYPE(data) == self->ctx->module_state->BufferView_type) {
+        buffer_view = (BufferView *)new_ref(data);
+    }
+
+    Py_buffer view = {0};
+    const char * ptr = NULL;
+
+    if (buffer_view) {
+        if (buffer_view->size != expected_size) {
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected %zd, got %zd", expected_size, buffer_view->size);
+            Py_DECREF(buffer_view);
+            return NULL;
+        }
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer_view->buffer->buffer);
+        ptr = (char *)(intptr)buffer_view->offset;
+    } else {
+        if (PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)) {
+            return NULL;
+        }
+        if (view.len != expected_size) {
+            PyErr_Format(PyExc_ValueError, "invalid data size, expected %zd, got %zd", expected_size, view.len);
+            PyBuffer_Release(&view);
+            return NULL;
+        }
+        ptr = (char *)view.buf;
+    }
+
+    glActiveTexture(self->ctx->default_texture_unit);
+    glBindTexture(self->target, self->image);
+    glPixelStorei(GL_UNPACK_ALIGNMENT, alignment);
+
+    IntPair offset = {0, 0};
+    for (int level = 0; level < levels; ++level) {
+        IntPair size = {least_one(self->width >> level), least_one(self->height >> level)};
+        intptr layer_size = compressed ? compressed_size(&self->fmt, size.x, size.y) : row_stride(size.x, self->fmt.pixel_size, 0, alignment) * size.y;
+        int level_layer_count = self->depth ? level_layers(self, level) : layers;
+        upload_image_layers(self, &self->fmt, level, 0, level_layer_count, offset, size, layer_size, ptr);
+        ptr += layer_size * level_layer_count;
+    }
+
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4);
+
+    if (buffer_view) {
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+        Py_DECREF(buffer_view);
+    } else {
+        PyBuffer_Release(&view);
     }
     Py_RETURN_NONE;
 }
 
-static PyObject * Image_meth_write(Image * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"data", "size", "offset", "layer", "level", NULL};
+static PyObject * Image_meth_write_async(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"data", "size", "offset", "layer", "level", "format", NULL};
 
     PyObject * data;
     PyObject * size_arg = Py_None;
     PyObject * offset_arg = Py_None;
     PyObject * layer_arg = Py_None;
     int level = 0;
+    PyObject * format_arg = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OOOi$O", keywords, &data, &size_arg, &offset_arg, &layer_arg, &level, &format_arg)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (self->ctx->is_webgl || self->fmt.flags & FORMAT_COMPRESSED) {
+        return Image_meth_write(self, args, kwargs);
+    }
+
+    IntPair size, offset;
+    int layer;
+    if (!parse_image_write(self, size_arg, offset_arg, layer_arg, level, &size, &offset, &layer)) {
+        return NULL;
+    }
+
+    ImageFormat fmt;
+    if (!get_pixel_format(self, format_arg, &fmt)) {
+        return NULL;
+    }
+
+    int layers = layer_arg == Py_None ? level_layers(self, level) : 1;
+    intptr row_size = (intptr)size.x * fmt.pixel_size;
+    intptr padded_row = (row_size + 3) & ~3;
+    intptr expected_size = padded_row * size.y * layers;
+
+    Py_buffer view;
+    if (PyObject_GetBuffer(data, &view, PyBUF_FULL_RO)) {
+        return NULL;
+    }
+
+    if (view.len != expected_size && view.len != row_size * size.y * layers) {
+        PyBuffer_Release(&view);
+        PyErr_Format(PyExc_ValueError, "invalid data size, expected %zd, got %zd", expected_size, view.len);
+        return NULL;
+    }
+
+    int slot = self->upload_index;
+    self->upload_index = (slot + 1) % UPLOAD_RING_SIZE;
+
+    if (self->upload_syncs[slot]) {
+        void * sync = self->upload_syncs[slot];
+        Py_BEGIN_ALLOW_THREADS;
+        glClientWaitSync(sync, GL_SYNC_FLUSH_COMMANDS_BIT, GL_TIMEOUT_IGNORED);
+        Py_END_ALLOW_THREADS;
+        glDeleteSync(sync);
+        self->upload_syncs[slot] = NULL;
+    }
+
+    if (!self->upload_buffers[slot]) {
+        glGenBuffers(1, &self->upload_buffers[slot]);
+    }
+
+    glBindBuffer(GL_PIXEL_UNPACK_BUFFER, self->upload_buffers[slot]);
+    if (self->upload_sizes[slot] < view.len) {
+        glBufferData(GL_PIXEL_UNPACK_BUFFER, view.len, NULL, GL_STREAM_DRAW);
+        self->upload_sizes[slot] = view.len;
+    }
+
+    int access = GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_RANGE_BIT | GL_MAP_UNSYNCHRONIZED_BIT;
+    void * ptr = glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, view.len, access);
+    if (!ptr) {
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+        PyBuffer_Release(&view);
+        return Image_meth_write(self, args, kwargs);
+    }
+
+    if (PyBuffer_IsContiguous(&view, 'C')) {
+        Py_BEGIN_ALLOW_THREADS;
+        memcpy(ptr, view.buf, (size_t)view.len);
+        Py_END_ALLOW_THREADS;
+    } else {
+        PyBuffer_ToContiguous(ptr, &view, view.len, 'C');
+    }
+    glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER);
+
+    glPixelStorei(GL_UNPACK_ALIGNMENT, view.len == expected_size ? 4 : 1);
+    write_image_layers(self, &fmt, level, layer, layers, offset, size, view.len / layers, NULL);
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 4);
+    glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+
+    self->upload_syncs[slot] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
+}
+
+static int linear_filter_format(Image * self) {
+    return self->fmt.color && self->fmt.clear_type == 'f';
+}
+
+static PyObject * downsample_layers(Image * self, int first, int count, int base, int top, int filter) {
+    for (int layer = first; layer < first + count; ++layer) {
+        for (int level = base + 1; level <= top; ++level) {
+            PyObject * src_key = Py_BuildValue("(ii)", layer, level - 1);
+            PyObject * dst_key = Py_BuildValue("(ii)", layer, level);
+            ImageFace * src = build_image_face(self, src_key);
+            ImageFace * dst = build_image_face(self, dst_key);
+            PyObject * res = blit_image_face(src, (PyObject *)dst, Py_None, dst->size, Py_None, filter);
+            Py_DECREF(src_key);
+            Py_DECREF(dst_key);
+            Py_DECREF(src);
+            Py_DECREF(dst);
+            if (!res) {
+                return NULL;
+            }
+            Py_DECREF(res);
+        }
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * Image_meth_mipmaps(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"base", "top", "layers", NULL};
+
+    int base = 0;
+    PyObject * top_arg = Py_None;
+    PyObject * layers_arg = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|iOO", keywords, &base, &top_arg, &layers_arg)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (self->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot generate mipmaps for compressed images");
+        return NULL;
+    }
+
+    if (top_arg != Py_None && !PyLong_CheckExact(top_arg)) {
+        PyErr_Format(PyExc_TypeError, "the top must be an int or None");
+        return NULL;
+    }
+
+    if (base < 0 || base >= self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid base");
+        return NULL;
+    }
+
+    int top = top_arg != Py_None ? to_int(top_arg) : -1;
+    if (top_arg != Py_None && (top <= base || top >= self->level_count)) {
+        PyErr_Format(PyExc_ValueError, "invalid top");
+        return NULL;
+    }
+
+    if (layers_arg != Py_None) {
+        if (self->depth) {
+            PyErr_Format(PyExc_TypeError, "the layers are not supported for 3D images");
+            return NULL;
+        }
+        int first;
+        int count;
+        if (!parse_layer_range(self, layers_arg, 0, &first, &count)) {
+            return NULL;
+        }
+        return downsample_layers(self, first, count, base, top_arg != Py_None ? top : self->level_count - 1, linear_filter_format(self));
+    }
+
+    glActiveTexture(self->ctx->default_texture_unit);
+    glBindTexture(self->target, self->image);
+    int base_level = 0;
+    int max_level = 1000;
+    if (base) {
+        glGetTexParameteriv(self->target, GL_TEXTURE_BASE_LEVEL, &base_level);
+        glTexParameteri(self->target, GL_TEXTURE_BASE_LEVEL, base);
+    }
+    if (top_arg != Py_None) {
+        glGetTexParameteriv(self->target, GL_TEXTURE_MAX_LEVEL, &max_level);
+        glTexParameteri(self->target, GL_TEXTURE_MAX_LEVEL, top);
+    }
+    glGenerateMipmap(self->target);
+    if (base) {
+        glTexParameteri(self->target, GL_TEXTURE_BASE_LEVEL, base_level);
+    }
+    if (top_arg != Py_None) {
+        glTexParameteri(self->target, GL_TEXTURE_MAX_LEVEL, max_level);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * Image_meth_downsample_chain(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"levels", "filter", NULL};
+
+    PyObject * levels_arg = Py_None;
+    int filter = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|Op", keywords, &levels_arg, &filter)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (self->depth) {
+        PyErr_Format(PyExc_TypeError, "cannot downsample 3D images, use mipmaps instead");
+        return NULL;
+    }
+
+    int levels = levels_arg != Py_None ? to_int(levels_arg) : self->level_count;
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+
+    if (levels <= 0 || levels > self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid levels");
+        return NULL;
+    }
+
+    return downsample_layers(self, 0, self->layer_count, 0, levels - 1, filter && linear_filter_format(self));
+}
+
+static int check_reduce_image(Image * self) {
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return 0;
+    }
+
+    if (self->array || self->cubemap || self->depth) {
+        PyErr_Format(PyExc_TypeError, "cannot reduce cubemap, array or 3D images");
+        return 0;
+    }
+
+    if (self->fmt.clear_type != 'f' || self->fmt.flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "only normalized, float and depth images can be reduced");
+        return 0;
+    }
+
+    return 1;
+}
+
+static PyObject * Image_meth_reduce(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"op", "region", NULL};
+
+    PyObject * op;
+    PyObject * region = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O!|O", keywords, &PyUnicode_Type, &op, &region)) {
+        return NULL;
+    }
+
+    if (!check_reduce_image(self)) {
+        return NULL;
+    }
+
+    PyObject * operations = PyObject_GetAttrString(self->ctx->module_state->helper, "REDUCE_OPERATION");
+    int valid = PyDict_GetItem(operations, op) != NULL;
+    Py_DECREF(operations);
+
+    if (!valid) {
+        PyErr_Format(PyExc_ValueError, "invalid reduce operation");
+        return NULL;
+    }
+
+    return PyObject_CallMethod(self->ctx->module_state->helper, "reduce_image", "(OOOO)", self->ctx, self, op, region);
+}
+
+static PyObject * Image_meth_histogram(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"bins", "range", "region", NULL};
+
+    int bins = 256;
+    double low = 0.0;
+    double high = 1.0;
+    PyObject * region = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|i(dd)O", keywords, &bins, &low, &high, &region)) {
+        return NULL;
+    }
+
+    if (!check_reduce_image(self)) {
+        return NULL;
+    }
+
+    return PyObject_CallMethod(self->ctx->module_state->helper, "image_histogram", "(OOi(dd)O)", self->ctx, self, bins, low, high, region);
+}
+
+static PyObject * layer_target(Context * ctx, PyObject * into, intptr offset, intptr size) {
+    if (Py_TYPE(into) == ctx->module_state->Buffer_type) {
+        return PyObject_CallMethod(into, "view", "(nn)", size, offset);
+    }
+
+    if (Py_TYPE(into) == ctx->module_state->BufferView_type) {
+        BufferView * view = (BufferView *)into;
+        if (offset + size > view->size) {
+            PyErr_Format(PyExc_ValueError, "invalid size");
+            return NULL;
+        }
+        return PyObject_CallMethod((PyObject *)view->buffer, "view", "(nn)", size, view->offset + offset);
+    }
+
+    PyObject * mem = PyMemoryView_FromObject(into);
+    if (!mem) {
+        return NULL;
+    }
+
+    PyObject * bytes = PyObject_CallMethod(mem, "cast", "(s)", "B");
+    Py_DECREF(mem);
+    if (!bytes) {
+        return NULL;
+    }
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|OOOi", keywords, &data, &size_arg, &offset_arg, &layer_arg, &level)) {
+    if (offset + size > PyObject_Size(bytes)) {
+        Py_DECREF(bytes);
+        PyErr_Format(PyExc_ValueError, "invalid write size");
         return NULL;
     }
 
-    if (self->ctx->is_lost) {
-        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+    PyObject * res = PySequence_GetSlice(bytes, offset, offset + size);
+    Py_DECREF(bytes);
+    return res;
+}
+
+static PyObject * Image_meth_read(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "offset", "into", "row_length", "alignment", "format", NULL};
+
+    PyObject * size_arg = Py_None;
+    PyObject * offset_arg = Py_None;
+    PyObject * into = Py_None;
+    int row_length = 0;
+    int alignment = 1;
+    PyObject * format_arg = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOO$iiO", keywords, &size_arg, &offset_arg, &into, &row_length, &alignment, &format_arg)) {
         return NULL;
     }
 
-    if (layer_arg != Py_None && !PyLong_CheckExact(layer_arg)) {
-        PyErr_Format(PyExc_TypeError, "the layer must be an int or None");
+    ImageFormat fmt;
+    if (!get_pixel_format(self, format_arg, &fmt)) {
         return NULL;
     }
 
-    int layer = 0;
-    if (layer_arg != Py_None) {
-        layer = to_int(layer_arg);
-    }
-
-    IntPair size;
-    if (!to_int_pair(&size, size_arg, least_one(self->width >> level), least_one(self->height >> level))) {
-        PyErr_Format(PyExc_TypeError, "the size must be a tuple of 2 ints");
+    IntPair size, offset;
+    ImageFace * first_layer = (ImageFace *)PyTuple_GetItem(self->layers, 0);
+    if (!parse_size_and_offset(first_layer, size_arg, offset_arg, &size, &offset)) {
         return NULL;
     }
 
-    IntPair offset;
-    if (!to_int_pair(&offset, offset_arg, 0, 0)) {
-        PyErr_Format(PyExc_TypeError, "the offset must be a tuple of 2 ints");
+    if (!parse_pixel_store(size.x, row_length, alignment)) {
         return NULL;
     }
 
-    if (size_arg == Py_None && offset_arg != Py_None) {
-        PyErr_Format(PyExc_ValueError, "the size is required when the offset is not None");
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
         return NULL;
     }
 
-    if (size.x <= 0 || size.y <= 0 || size.x > self->width || size.y > self->height) {
-        PyErr_Format(PyExc_ValueError, "invalid size");
-        return NULL;
-    }
+    if (self->array || self->cubemap || self->depth) {
+        intptr stride = row_stride(size.x, fmt.pixel_size, row_length, alignment);
+        intptr write_size = stride * (size.y - 1) + (intptr)size.x * fmt.pixel_size;
+        intptr layer_size = stride * size.y;
 
-    if (offset.x < 0 || offset.y < 0 || size.x + offset.x > self->width || size.y + offset.y > self->height) {
-        PyErr_Format(PyExc_ValueError, "invalid offset");
-        return NULL;
+        if (PyList_Check(into) || PyTuple_Check(into)) {
+            if (PySequence_Size(into) != self->layer_count) {
+                PyErr_Format(PyExc_ValueError, "into must have one target for each layer, expected %d, got %d", self->layer_count, (int)PySequence_Size(into));
+                return NULL;
+            }
+            for (int i = 0; i < self->layer_count; ++i) {
+                ImageFace * src = (ImageFace *)PyTuple_GetItem(self->layers, i);
+                PyObject * temp = read_image_face(src, size, offset, row_length, alignment, &fmt, PySequence_Fast_GET_ITEM(into, i));
+                if (!temp) {
+                    return NULL;
+                }
+                Py_DECREF(temp);
+            }
+            Py_RETURN_NONE;
+        }
+
+        PyObject * res = NULL;
+        if (into == Py_None) {
+            res = PyBytes_FromStringAndSize(NULL, layer_size * (self->layer_count - 1) + write_size);
+        }
+
+        for (int i = 0; i < self->layer_count; ++i) {
+            ImageFace * src = (ImageFace *)PyTuple_GetItem(self->layers, i);
+            PyObject * chunk = NULL;
+            if (res) {
+                chunk = PyMemoryView_FromMemory(PyBytes_AsString(res) + layer_size * i, write_size, PyBUF_WRITE);
+            } else {
+                chunk = layer_target(self->ctx, into, layer_size * i, write_size);
+            }
+            if (!chunk) {
+                Py_XDECREF(res);
+                return NULL;
+            }
+            PyObject * temp = read_image_face(src, size, offset, row_length, alignment, &fmt, chunk);
+            Py_DECREF(chunk);
+            if (!temp) {
+                Py_XDECREF(res);
+                return NULL;
+            }
+            Py_DECREF(temp);
+        }
+
+        if (!res) {
+            Py_RETURN_NONE;
+        }
+        return res;
     }
 
-    if (layer < 0 || layer >= self->layer_count) {
-        PyErr_Format(PyExc_ValueError, "invalid layer");
+    return read_image_face(first_layer, size, offset, row_length, alignment, &fmt, into);
+}
+
+static PyObject * Image_meth_read_all(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"levels", "into", "alignment", NULL};
+
+    PyObject * levels_arg = Py_None;
+    PyObject * into = Py_None;
+    int alignment = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO$i", keywords, &levels_arg, &into, &alignment)) {
         return NULL;
     }
 
-    if (level < 0 || level > self->level_count) {
-        PyErr_Format(PyExc_ValueError, "invalid level");
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
         return NULL;
     }
 
-    if (!self->cubemap && !self->array && layer_arg != Py_None) {
-        PyErr_Format(PyExc_TypeError, "the image is not layered");
+    if (levels_arg != Py_None && !PyLong_CheckExact(levels_arg)) {
+        PyErr_Format(PyExc_TypeError, "the levels must be an int or None");
         return NULL;
     }
 
-    if (!self->fmt.color) {
-        PyErr_Format(PyExc_TypeError, "cannot write to depth or stencil images");
+    int levels = levels_arg != Py_None ? to_int(levels_arg) : self->level_count;
+
+    if (levels <= 0 || levels > self->level_count) {
+        PyErr_Format(PyExc_ValueError, "invalid levels");
         return NULL;
     }
 
-    if (self->samples != 1) {
-        PyErr_Format(PyExc_TypeError, "cannot write to multisampled images");
+    if (!valid_alignment(alignment)) {
+        PyErr_Format(PyExc_ValueError, "the alignment must be 1, 2, 4 or 8");
         return NULL;
     }
 
-    int padded_row = (size.x * self->fmt.pixel_size + 3) & ~3;
-    int expected_size = padded_row * size.y;
-
-    if (layer_arg == Py_None) {
-        expected_size *= self->layer_count;
+    if (self->samples > 1) {
+        IntPair size = {self->width, self->height};
+        IntPair offset = {0, 0};
+        return read_image_face((ImageFace *)PyTuple_GetItem(self->layers, 0), size, offset, 0, alignment, &self->fmt, into);
     }
 
-    glActiveTexture(self->ctx->default_texture_unit);
-    glBindTexture(self->target, self->image);
-
-    BufferView * buffer_view = NULL;
+    int compressed = self->fmt.flags & FORMAT_COMPRESSED;
+    int get_tex_image = !self->ctx->is_gles && !self->ctx->is_webgl && !self->renderbuffer && glGetTexImage;
 
-    if (Py_TYPE(data) == self->ctx->module_state->Buffer_type) {
-        buffer_view = (BufferView *)PyObject_CallMethod(data, "view", NULL);
+    if (compressed && (!get_tex_image || !glGetCompressedTexImage)) {
+        PyErr_Format(PyExc_TypeError, "cannot read compressed images");
+        return NULL;
     }
 
-    if (Py_TYPE(data) == self->ctx->module_state->BufferView_type) {
-        buffer_view = (BufferView *)new_ref(data);
+    intptr total_size = 0;
+    for (int level = 0; level < levels; ++level) {
+        int width = least_one(self->width >> level);
+        int height = least_one(self->height >> level);
+        if (compressed) {
+            total_size += compressed_size(&self->fmt, width, height) * level_layers(self, level);
+        } else {
+            total_size += row_stride(width, self->fmt.pixel_size, 0, alignment) * height * level_layers(self, level);
+        }
     }
 
-    if (buffer_view) {
-        if (buffer_view->size != expected_size) {
-            PyErr_Format(PyExc_ValueError, "invalid data size, expected %d, got %d", expected_size, buffer_view->size);
-            return NULL;
+    PyObject * res = NULL;
+    BufferView * buffer_view = NULL;
+    Py_buffer view = {0};
+    char * ptr = NULL;
+
+    if (into == Py_None) {
+        res = PyBytes_FromStringAndSize(NULL, total_size);
+        ptr = PyBytes_AsString(res);
+    } else {
+        if (Py_TYPE(into) == self->ctx->module_state->Buffer_type) {
+            buffer_view = (BufferView *)PyObject_CallMethod(into, "view", NULL);
         }
 
-        char * ptr = (char *)(intptr)buffer_view->offset;
-        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer_view->buffer->buffer);
+        if (Py_TYPE(into) == self->ctx->module_state->BufferView_type) {
+            buffer_view = (BufferView *)new_ref(into);
+        }
 
-        if (self->cubemap) {
-            int stride = padded_row * size.y;
-            if (layer_arg != Py_None) {
-                int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + layer;
-                glTexSubImage2D(face, level, offset.x, offset.y, size.x, size.y, self->fmt.format, self->fmt.type, ptr);
-            } else {
-                for (int i = 0; i < 6; ++i) {
-                    int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + i;
-                    glTexSubImage2D(face, level, offset.x, offset.y, size.x, size.y, self->fmt.format, self->fmt.type, ptr + stride * i);
-                }
-            }
-        } else if (self->array) {
-            if (layer_arg != Py_None) {
-                glTexSubImage3D(self->target, level, offset.x, offset.y, layer, size.x, size.y, 1, self->fmt.format, self->fmt.type, ptr);
-            } else {
-                glTexSubImage3D(self->target, level, offset.x, offset.y, 0, size.x, size.y, self->array, self->fmt.format, self->fmt.type, ptr);
+        if (buffer_view) {
+            if (total_size > buffer_view->size) {
+                PyErr_Format(PyExc_ValueError, "invalid size");
+                Py_DECREF(buffer_view);
+                return NULL;
             }
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer_view->buffer->buffer);
+            ptr = (char *)(intptr)buffer_view->offset;
         } else {
-            glTexSubImage2D(self->target, level, offset.x, offset.y, size.x, size.y, self->fmt.format, self->fmt.type, ptr);
+            if (PyObject_GetBuffer(into, &view, PyBUF_WRITABLE)) {
+                return NULL;
+            }
+            if (total_size > view.len) {
+                PyErr_Format(PyExc_ValueError, "invalid write size");
+                PyBuffer_Release(&view);
+                return NULL;
+            }
+            ptr = (char *)view.buf;
         }
-
-        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
-
-        Py_DECREF(buffer_view);
-        Py_RETURN_NONE;
-    }
-
-    PyObject * mem = PyMemoryView_GetContiguous(data, PyBUF_READ, 'C');
-    if (!mem) {
-        return NULL;
+        res = new_ref(Py_None);
     }
 
-    Py_buffer view;
-    if (PyObject_GetBuffer(mem, &view, PyBUF_SIMPLE)) {
-        return NULL;
-    }
-    int data_size = (int)view.len;
+    glPixelStorei(GL_PACK_ALIGNMENT, alignment);
 
-    if (data_size != expected_size) {
-        PyErr_Format(PyExc_ValueError, "invalid data size, expected %d, got %d", expected_size, data_size);
-        return NULL;
+    if (get_tex_image) {
+        glActiveTexture(self->ctx->default_texture_unit);
+        glBindTexture(self->target, self->image);
     }
 
-    if (self->cubemap) {
-        int stride = padded_row * size.y;
-        if (layer_arg != Py_None) {
-            int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + layer;
-            glTexSubImage2D(face, level, offset.x, offset.y, size.x, size.y, self->fmt.format, self->fmt.type, view.buf);
-        } else {
+    for (int level = 0; level < levels; ++level) {
+        int width = least_one(self->width >> level);
+        int height = least_one(self->height >> level);
+        intptr layer_size = compressed ? compressed_size(&self->fmt, width, height) : row_stride(width, self->fmt.pixel_size, 0, alignment) * height;
+        if (get_tex_image && self->cubemap) {
             for (int i = 0; i < 6; ++i) {
                 int face = GL_TEXTURE_CUBE_MAP_POSITIVE_X + i;
-                glTexSubImage2D(face, level, offset.x, offset.y, size.x, size.y, self->fmt.format, self->fmt.type, (char *)view.buf + stride * i);
+                if (compressed) {
+                    glGetCompressedTexImage(face, level, ptr + layer_size * i);
+                } else {
+                    glGetTexImage(face, level, self->fmt.format, self->fmt.type, ptr + layer_size * i);
+                }
+            }
+        } else if (get_tex_image) {
+            if (compressed) {
+                glGetCompressedTexImage(self->target, level, ptr);
+            } else {
+                glGetTexImage(self->target, level, self->fmt.format, self->fmt.type, ptr);
             }
-        }
-    } else if (self->array) {
-        if (layer_arg != Py_None) {
-            glTexSubImage3D(self->target, level, offset.x, offset.y, layer, size.x, size.y, 1, self->fmt.format, self->fmt.type, view.buf);
         } else {
-            glTexSubImage3D(self->target, level, offset.x, offset.y, 0, size.x, size.y, self->array, self->fmt.format, self->fmt.type, view.buf);
+            for (int i = 0; i < level_layers(self, level); ++i) {
+                PyObject * key = Py_BuildValue("(ii)", i, level);
+                ImageFace * face = build_image_face(self, key);
+                Py_DECREF(key);
+                bind_read_framebuffer(self->ctx, face->framebuffer->obj);
+                glReadPixels(0, 0, width, height, self->fmt.format, self->fmt.type, ptr + layer_size * i);
+                Py_DECREF(face);
+            }
         }
-    } else {
-        glTexSubImage2D(self->target, level, offset.x, offset.y, size.x, size.y, self->fmt.format, self->fmt.type, view.buf);
+        ptr += layer_size * level_layers(self, level);
     }
 
-    PyBuffer_Release(&view);
-    Py_DECREF(mem);
-    Py_RETURN_NONE;
-}
+    glPixelStorei(GL_PACK_ALIGNMENT, 4);
 
-static PyObject * Image_meth_mipmaps(Image * self, PyObject * args) {
-    if (self->ctx->is_lost) {
-        PyErr_Format(PyExc_RuntimeError, "the context is lost");
-        return NULL;
+    if (buffer_view) {
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+        Py_DECREF(buffer_view);
+    } else if (into != Py_None) {
+        PyBuffer_Release(&view);
     }
-
-    glActiveTexture(self->ctx->default_texture_unit);
-    glBindTexture(self->target, self->image);
-    glGenerateMipmap(self->target);
-    Py_RETURN_NONE;
+    return res;
 }
 
-static PyObject * Image_meth_read(Image * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"size", "offset", "into", NULL};
+static Readback * Image_meth_read_async(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "offset", NULL};
 
     PyObject * size_arg = Py_None;
     PyObject * offset_arg = Py_None;
-    PyObject * into = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOO", keywords, &size_arg, &offset_arg, &into)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO", keywords, &size_arg, &offset_arg)) {
         return NULL;
     }
 
@@ -3104,28 +5537,11 @@ static PyObject * Image_meth_read(Image * self, PyObject * args, PyObject * kwar
         return NULL;
     }
 
-    if (self->array || self->cubemap) {
-        if (into != Py_None) {
-            // TODO:
-            return NULL;
-        }
-
-        int write_size = size.x * size.y * self->fmt.pixel_size;
-        PyObject * res = PyBytes_FromStringAndSize(NULL, write_size * self->layer_count);
-        for (int i = 0; i < self->layer_count; ++i) {
-            ImageFace * src = (ImageFace *)PyTuple_GetItem(self->layers, i);
-            PyObject * chunk = PyMemoryView_FromMemory(PyBytes_AsString(res) + write_size * i, write_size, PyBUF_WRITE);
-            PyObject * temp = read_image_face(src, size, offset, chunk);
-            if (!temp) {
-                return NULL;
-            }
-            Py_DECREF(chunk);
-            Py_DECREF(temp);
-        }
-        return res;
+    if (self->array || self->cubemap || self->depth) {
+        return read_image_async(self, NULL, size, offset);
     }
 
-    return read_image_face(first_layer, size, offset, into);
+    return read_image_face_async(first_layer, size, offset);
 }
 
 static PyObject * Image_meth_blit(Image * self, PyObject * args, PyObject * kwargs) {
@@ -3150,6 +5566,51 @@ static PyObject * Image_meth_blit(Image * self, PyObject * args, PyObject * kwar
     return blit_image_face(src, target, offset, size, crop, filter);
 }
 
+static PyObject * Image_meth_resolve(Image * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"target", NULL};
+
+    PyObject * target = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|O", keywords, &target)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    if (self->samples == 1) {
+        PyErr_Format(PyExc_TypeError, "only multisampled images can be resolved");
+        return NULL;
+    }
+
+    IntPair size = {self->width, self->height};
+    IntPair offset = {0, 0};
+
+    if (target == Py_None) {
+        return new_ref(resolve_image(self, size, offset));
+    }
+
+    if (Py_TYPE(target) != self->ctx->module_state->Image_type) {
+        PyErr_Format(PyExc_TypeError, "target must be an Image or None");
+        return NULL;
+    }
+
+    Image * image = (Image *)target;
+    if (image->width != self->width || image->height != self->height) {
+        PyErr_Format(PyExc_ValueError, "the target size must match the image size");
+        return NULL;
+    }
+
+    PyObject * res = blit_image_face((ImageFace *)PyTuple_GetItem(self->layers, 0), PyTuple_GetItem(image->layers, 0), Py_None, Py_None, Py_None, 0);
+    if (!res) {
+        return NULL;
+    }
+    Py_DECREF(res);
+    return new_ref(target);
+}
+
 static ImageFace * Image_meth_face(Image * self, PyObject * args, PyObject * kwargs) {
     static char * keywords[] = {"layer", "level", NULL};
 
@@ -3165,7 +5626,7 @@ static ImageFace * Image_meth_face(Image * self, PyObject * args, PyObject * kwa
         return NULL;
     }
 
-    if (layer < 0 || layer >= self->layer_count) {
+    if (layer < 0 || layer >= level_layers(self, level)) {
         PyErr_Format(PyExc_ValueError, "invalid layer");
         return NULL;
     }
@@ -3282,12 +5743,35 @@ static PyObject * Pipeline_meth_render(Pipeline * self, PyObject * args) {
         bind_uniforms(self);
     }
     RenderParameters * params = (RenderParameters *)self->render_data_buffer.buf;
+    if (self->feedback_buffer) {
+        glEnable(GL_RASTERIZER_DISCARD);
+        intptr feedback_size = self->feedback_size < 0 ? self->feedback_buffer->size : self->feedback_size;
+        glBindBufferRange(GL_TRANSFORM_FEEDBACK_BUFFER, 0, self->feedback_buffer->buffer, self->feedback_offset, feedback_size);
+        glBeginTransformFeedback(self->feedback_mode);
+    }
     if (self->index_type) {
         intptr offset = (intptr)params->first_vertex * (intptr)self->index_size;
         glDrawElementsInstanced(self->topology, params->vertex_count, self->index_type, offset, params->instance_count);
     } else {
         glDrawArraysInstanced(self->topology, params->first_vertex, params->vertex_count, params->instance_count);
     }
+    if (self->feedback_buffer) {
+        glEndTransformFeedback();
+        glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, 0);
+        glDisable(GL_RASTERIZER_DISCARD);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * Pipeline_meth_invalidate(Pipeline * self, PyObject * args) {
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+    if (self->discard_count && self->ctx->has_invalidate_framebuffer) {
+        bind_draw_framebuffer(self->ctx, self->framebuffer->obj);
+        glInvalidateFramebuffer(GL_DRAW_FRAMEBUFFER, self->discard_count, self->discard_attachments);
+    }
     Py_RETURN_NONE;
 }
 
@@ -3368,19 +5852,59 @@ static PyObject * ImageFace_meth_clear(ImageFace * self, PyObject * args) {
         return NULL;
     }
 
+    if (self->flags & FORMAT_COMPRESSED) {
+        PyErr_Format(PyExc_TypeError, "cannot clear compressed images");
+        return NULL;
+    }
+
     bind_draw_framebuffer(self->ctx, self->framebuffer->obj);
     clear_bound_image(self->image);
     Py_RETURN_NONE;
 }
 
 static PyObject * ImageFace_meth_read(ImageFace * self, PyObject * args, PyObject * kwargs) {
-    static char * keywords[] = {"size", "offset", "into", NULL};
+    static char * keywords[] = {"size", "offset", "into", "row_length", "alignment", "format", NULL};
 
     PyObject * size_arg = Py_None;
     PyObject * offset_arg = Py_None;
     PyObject * into = Py_None;
+    int row_length = 0;
+    int alignment = 1;
+    PyObject * format_arg = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOO$iiO", keywords, &size_arg, &offset_arg, &into, &row_length, &alignment, &format_arg)) {
+        return NULL;
+    }
+
+    ImageFormat fmt;
+    if (!get_pixel_format(self->image, format_arg, &fmt)) {
+        return NULL;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    IntPair size, offset;
+    if (!parse_size_and_offset(self, size_arg, offset_arg, &size, &offset)) {
+        return NULL;
+    }
+
+    if (!parse_pixel_store(size.x, row_length, alignment)) {
+        return NULL;
+    }
+
+    return read_image_face(self, size, offset, row_length, alignment, &fmt, into);
+}
+
+static Readback * ImageFace_meth_read_async(ImageFace * self, PyObject * args, PyObject * kwargs) {
+    static char * keywords[] = {"size", "offset", NULL};
+
+    PyObject * size_arg = Py_None;
+    PyObject * offset_arg = Py_None;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OOO", keywords, &size_arg, &offset_arg, &into)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|OO", keywords, &size_arg, &offset_arg)) {
         return NULL;
     }
 
@@ -3394,7 +5918,28 @@ static PyObject * ImageFace_meth_read(ImageFace * self, PyObject * args, PyObjec
         return NULL;
     }
 
-    return read_image_face(self, size, offset, into);
+    return read_image_face_async(self, size, offset);
+}
+
+static PyObject * Readback_meth_read(Readback * self, PyObject * args) {
+    if (!resolve_readback(self)) {
+        return NULL;
+    }
+    return PyMemoryView_FromObject(self->data);
+}
+
+static PyObject * Readback_get_ready(Readback * self, void * closure) {
+    if (self->data) {
+        Py_RETURN_TRUE;
+    }
+
+    if (self->ctx->is_lost) {
+        PyErr_Format(PyExc_RuntimeError, "the context is lost");
+        return NULL;
+    }
+
+    int status = glClientWaitSync(self->sync, GL_SYNC_FLUSH_COMMANDS_BIT, 0);
+    return PyBool_FromLong(status == GL_ALREADY_SIGNALED || status == GL_CONDITION_SATISFIED);
 }
 
 static PyObject * ImageFace_meth_blit(ImageFace * self, PyObject * args, PyObject * kwargs) {
@@ -3535,6 +6080,8 @@ static void Context_dealloc(Context * self) {
     Py_DECREF(self->program_cache);
     Py_DECREF(self->shader_cache);
     Py_DECREF(self->includes);
+    Py_DECREF(self->transient_free);
+    Py_DECREF(self->transient_images);
     Py_DECREF(self->default_framebuffer);
     Py_DECREF(self->info_dict);
     PyObject_Del(self);
@@ -3549,6 +6096,15 @@ static void Image_dealloc(Image * self) {
     Py_DECREF(self->format);
     Py_DECREF(self->faces);
     Py_DECREF(self->layers);
+    Py_DECREF(self->readbacks);
+    Py_DECREF(self->readback_buffers);
+    Py_XDECREF(self->transient_key);
+    Py_XDECREF(self->resolve_target);
+    PyObject_Del(self);
+}
+
+static void Readback_dealloc(Readback * self) {
+    Py_XDECREF(self->data);
     PyObject_Del(self);
 }
 
@@ -3563,6 +6119,8 @@ static void Pipeline_dealloc(Pipeline * self) {
     Py_XDECREF(self->uniform_data);
     Py_DECREF(self->viewport_data);
     Py_DECREF(self->render_data);
+    Py_DECREF(self->feedback_varyings);
+    Py_XDECREF(self->feedback_buffer);
     PyObject_Del(self);
 }
 
@@ -3596,6 +6154,10 @@ static PyMethodDef Context_methods[] = {
     {"buffer", (PyCFunction)Context_meth_buffer, METH_VARARGS | METH_KEYWORDS, NULL},
     {"image", (PyCFunction)Context_meth_image, METH_VARARGS | METH_KEYWORDS, NULL},
     {"pipeline", (PyCFunction)Context_meth_pipeline, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"atlas", (PyCFunction)Context_meth_atlas, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"picker", (PyCFunction)Context_meth_picker, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"transient", (PyCFunction)Context_meth_transient, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"blit_many", (PyCFunction)Context_meth_blit_many, METH_O, NULL},
     {"new_frame", (PyCFunction)Context_meth_new_frame, METH_VARARGS | METH_KEYWORDS, NULL},
     {"end_frame", (PyCFunction)Context_meth_end_frame, METH_VARARGS | METH_KEYWORDS, NULL},
     {"release", (PyCFunction)Context_meth_release, METH_O, NULL},
@@ -3606,34 +6168,46 @@ static PyMethodDef Context_methods[] = {
 static PyGetSetDef Context_getset[] = {
     {"screen", (getter)Context_get_screen, (setter)Context_set_screen, NULL, NULL},
     {"loader", (getter)Context_get_loader, NULL, NULL, NULL},
+    {"info", (getter)Context_get_info, NULL, NULL, NULL},
     {0},
 };
 
 static PyMemberDef Context_members[] = {
     {"includes", T_OBJECT, offsetof(Context, includes), READONLY, NULL},
-    {"info", T_OBJECT, offsetof(Context, info_dict), READONLY, NULL},
     {"lost", T_BOOL, offsetof(Context, is_lost), 0, NULL},
     {0},
 };
 
 static PyMethodDef Buffer_methods[] = {
     {"write", (PyCFunction)Buffer_meth_write, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"write_many", (PyCFunction)Buffer_meth_write_many, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"write_from", (PyCFunction)Buffer_meth_write_from, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"resize", (PyCFunction)Buffer_meth_resize, METH_VARARGS | METH_KEYWORDS, NULL},
     {"read", (PyCFunction)Buffer_meth_read, METH_VARARGS | METH_KEYWORDS, NULL},
     {"view", (PyCFunction)Buffer_meth_view, METH_VARARGS | METH_KEYWORDS, NULL},
     {0},
 };
 
 static PyMemberDef Buffer_members[] = {
-    {"size", T_INT, offsetof(Buffer, size), READONLY, NULL},
+    {"size", T_PYSSIZET, offsetof(Buffer, size), READONLY, NULL},
     {0},
 };
 
 static PyMethodDef Image_methods[] = {
-    {"clear", (PyCFunction)Image_meth_clear, METH_NOARGS, NULL},
+    {"clear", (PyCFunction)Image_meth_clear, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"invalidate", (PyCFunction)Image_meth_invalidate, METH_VARARGS | METH_KEYWORDS, NULL},
     {"write", (PyCFunction)Image_meth_write, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"write_async", (PyCFunction)Image_meth_write_async, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"write_all", (PyCFunction)Image_meth_write_all, METH_VARARGS | METH_KEYWORDS, NULL},
     {"read", (PyCFunction)Image_meth_read, METH_VARARGS | METH_KEYWORDS, NULL},
-    {"mipmaps", (PyCFunction)Image_meth_mipmaps, METH_NOARGS, NULL},
+    {"read_async", (PyCFunction)Image_meth_read_async, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"read_all", (PyCFunction)Image_meth_read_all, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"mipmaps", (PyCFunction)Image_meth_mipmaps, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"downsample_chain", (PyCFunction)Image_meth_downsample_chain, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"reduce", (PyCFunction)Image_meth_reduce, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"histogram", (PyCFunction)Image_meth_histogram, METH_VARARGS | METH_KEYWORDS, NULL},
     {"blit", (PyCFunction)Image_meth_blit, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"resolve", (PyCFunction)Image_meth_resolve, METH_VARARGS | METH_KEYWORDS, NULL},
     {"face", (PyCFunction)Image_meth_face, METH_VARARGS | METH_KEYWORDS, NULL},
     {0},
 };
@@ -3648,12 +6222,14 @@ static PyMemberDef Image_members[] = {
     {"format", T_OBJECT, offsetof(Image, format), READONLY, NULL},
     {"samples", T_INT, offsetof(Image, samples), READONLY, NULL},
     {"array", T_INT, offsetof(Image, array), READONLY, NULL},
+    {"depth", T_INT, offsetof(Image, depth), READONLY, NULL},
     {"renderbuffer", T_BOOL, offsetof(Image, renderbuffer), READONLY, NULL},
     {0},
 };
 
 static PyMethodDef Pipeline_methods[] = {
     {"render", (PyCFunction)Pipeline_meth_render, METH_NOARGS, NULL},
+    {"invalidate", (PyCFunction)Pipeline_meth_invalidate, METH_NOARGS, NULL},
     {0},
 };
 
@@ -3673,6 +6249,7 @@ static PyMemberDef Pipeline_members[] = {
 static PyMethodDef ImageFace_methods[] = {
     {"clear", (PyCFunction)ImageFace_meth_clear, METH_NOARGS, NULL},
     {"read", (PyCFunction)ImageFace_meth_read, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"read_async", (PyCFunction)ImageFace_meth_read_async, METH_VARARGS | METH_KEYWORDS, NULL},
     {"blit", (PyCFunction)ImageFace_meth_blit, METH_VARARGS | METH_KEYWORDS, NULL},
     {0},
 };
@@ -3740,6 +6317,29 @@ static PyType_Slot GlobalSettings_slots[] = {
     {0},
 };
 
+static PyMethodDef Readback_methods[] = {
+    {"read", (PyCFunction)Readback_meth_read, METH_NOARGS, NULL},
+    {0},
+};
+
+static PyGetSetDef Readback_getset[] = {
+    {"ready", (getter)Readback_get_ready, NULL, NULL, NULL},
+    {0},
+};
+
+static PyMemberDef Readback_members[] = {
+    {"size", T_PYSSIZET, offsetof(Readback, size), READONLY, NULL},
+    {0},
+};
+
+static PyType_Slot Readback_slots[] = {
+    {Py_tp_methods, Readback_methods},
+    {Py_tp_getset, Readback_getset},
+    {Py_tp_members, Readback_members},
+    {Py_tp_dealloc, (void *)Readback_dealloc},
+    {0},
+};
+
 static PyType_Slot GLObject_slots[] = {
     {Py_tp_dealloc, (void *)GLObject_dealloc},
     {0},
@@ -3754,6 +6354,7 @@ static PyType_Spec BufferView_spec = {"zengl.BufferView", sizeof(BufferView), 0,
 static PyType_Spec DescriptorSet_spec = {"zengl.DescriptorSet", sizeof(DescriptorSet), 0, Py_TPFLAGS_DEFAULT, DescriptorSet_slots};
 static PyType_Spec GlobalSettings_spec = {"zengl.GlobalSettings", sizeof(GlobalSettings), 0, Py_TPFLAGS_DEFAULT, GlobalSettings_slots};
 static PyType_Spec GLObject_spec = {"zengl.GLObject", sizeof(GLObject), 0, Py_TPFLAGS_DEFAULT, GLObject_slots};
+static PyType_Spec Readback_spec = {"zengl.Readback", sizeof(Readback), 0, Py_TPFLAGS_DEFAULT, Readback_slots};
 
 static int module_exec(PyObject * self) {
     ModuleState * state = (ModuleState *)PyModule_GetState(self);
@@ -3771,6 +6372,7 @@ static int module_exec(PyObject * self) {
     state->str_rgba8unorm = PyUnicode_FromString("rgba8unorm");
     state->default_loader = new_ref(Py_None);
     state->default_context = new_ref(Py_None);
+    state->frame_recorders = PyObject_GetAttrString(state->helper, "frame_recorders");
     state->Context_type = (PyTypeObject *)PyType_FromSpec(&Context_spec);
     state->Buffer_type = (PyTypeObject *)PyType_FromSpec(&Buffer_spec);
     state->Image_type = (PyTypeObject *)PyType_FromSpec(&Image_spec);
@@ -3780,6 +6382,7 @@ static int module_exec(PyObject * self) {
     state->DescriptorSet_type = (PyTypeObject *)PyType_FromSpec(&DescriptorSet_spec);
     state->GlobalSettings_type = (PyTypeObject *)PyType_FromSpec(&GlobalSettings_spec);
     state->GLObject_type = (PyTypeObject *)PyType_FromSpec(&GLObject_spec);
+    state->Readback_type = (PyTypeObject *)PyType_FromSpec(&Readback_spec);
 
     PyModule_AddObject(self, "Context", new_ref(state->Context_type));
     PyModule_AddObject(self, "Buffer", new_ref(state->Buffer_type));
@@ -3787,10 +6390,12 @@ static int module_exec(PyObject * self) {
     PyModule_AddObject(self, "ImageFace", new_ref(state->ImageFace_type));
     PyModule_AddObject(self, "BufferView", new_ref(state->BufferView_type));
     PyModule_AddObject(self, "Pipeline", new_ref(state->Pipeline_type));
+    PyModule_AddObject(self, "Readback", new_ref(state->Readback_type));
 
     PyModule_AddObject(self, "loader", PyObject_GetAttrString(state->helper, "loader"));
     PyModule_AddObject(self, "calcsize", PyObject_GetAttrString(state->helper, "calcsize"));
     PyModule_AddObject(self, "bind", PyObject_GetAttrString(state->helper, "bind"));
+    PyModule_AddObject(self, "FrameRecorder", PyObject_GetAttrString(state->helper, "FrameRecorder"));
 
     #ifdef EXTERN_GL
     PyModule_AddObject(self, "_extern_gl", PyUnicode_FromString(EXTERN_GL));
@@ -3854,6 +6459,7 @@ static void module_free(PyObject * self) {
         Py_DECREF(state->str_rgba8unorm);
         Py_DECREF(state->default_loader);
         Py_DECREF(state->default_context);
+        Py_DECREF(state->frame_recorders);
         Py_DECREF(state->Context_type);
         Py_DECREF(state->Buffer_type);
         Py_DECREF(state->Image_type);
@@ -3862,6 +6468,7 @@ static void module_free(PyObject * self) {
         Py_DECREF(state->DescriptorSet_type);
         Py_DECREF(state->GlobalSettings_type);
         Py_DECREF(state->GLObject_type);
+        Py_DECREF(state->Readback_type);
     }
 }
 
@@ -42,6 +42,18 @@
   let glid = 1;
   glo[0] = null;
 
+  let unpackRowLength = 0;
+  let packRowLength = 0;
+  let packBuffer = 0;
+  let unpackBuffer = 0;
+
+  gl.getExtension('WEBGL_compressed_texture_s3tc');
+  gl.getExtension('EXT_texture_compression_rgtc');
+  gl.getExtension('EXT_texture_compression_bptc');
+  gl.getExtension('WEBGL_compressed_texture_etc');
+  gl.getExtension('EXT_color_buffer_float');
+  gl.getExtension('EXT_float_blend');
+
   return {
     zengl_glCullFace(mode) {
       gl.cullFace(mode);
@@ -78,7 +90,11 @@
       gl.readBuffer(src);
     },
     zengl_glReadPixels(x, y, width, height, format, type, pixels) {
-      const data = typedArray(type, pixels, width * height * componentCount(format));
+      if (packBuffer) {
+        gl.readPixels(x, y, width, height, format, type, pixels);
+        return;
+      }
+      const data = typedArray(type, pixels, (packRowLength || width) * height * componentCount(format));
       gl.readPixels(x, y, width, height, format, type, data);
     },
     zengl_glGetError() {
@@ -88,14 +104,20 @@
       const value = gl.getParameter(pname);
       wasm.HEAP32[data >> 2] = Math.min(value, 0x7ffffff);
     },
+    zengl_glGetTexParameteriv(target, pname, params) {
+      wasm.HEAP32[params >> 2] = gl.getTexParameter(target, pname);
+    },
     zengl_glGetString(pname) {
       return wasm.allocateUTF8(gl.getParameter(pname));
     },
+    zengl_glGetStringi(name, index) {
+      return wasm.allocateUTF8(gl.getSupportedExtensions()[index] || '');
+    },
     zengl_glViewport(x, y, width, height) {
       gl.viewport(x, y, width, height);
     },
     zengl_glTexSubImage2D(target, level, xoffset, yoffset, width, height, format, type, pixels) {
-      const data = typedArray(type, pixels, width * height * componentCount(format));
+      const data = typedArray(type, pixels, (unpackRowLength || width) * height * componentCount(format));
       gl.texSubImage2D(target, level, xoffset, yoffset, width, height, format, type, data);
     },
     zengl_glBindTexture(target, texture) {
@@ -115,9 +137,29 @@
       gl.texImage3D(target, level, internalformat, width, height, depth, border, format, type, null);
     },
     zengl_glTexSubImage3D(target, level, xoffset, yoffset, zoffset, width, height, depth, format, type, pixels) {
-      const data = typedArray(type, pixels, width * height * depth * componentCount(format));
+      const data = typedArray(type, pixels, (unpackRowLength || width) * height * depth * componentCount(format));
       gl.texSubImage3D(target, level, xoffset, yoffset, zoffset, width, height, depth, format, type, data);
     },
+    zengl_glCompressedTexImage2D(target, level, internalformat, width, height, border, imageSize, data) {
+      gl.compressedTexImage2D(target, level, internalformat, width, height, border, new Uint8Array(imageSize));
+    },
+    zengl_glCompressedTexImage3D(target, level, internalformat, width, height, depth, border, imageSize, data) {
+      gl.compressedTexImage3D(target, level, internalformat, width, height, depth, border, new Uint8Array(imageSize));
+    },
+    zengl_glCompressedTexSubImage2D(target, level, xoffset, yoffset, width, height, format, imageSize, data) {
+      if (unpackBuffer) {
+        gl.compressedTexSubImage2D(target, level, xoffset, yoffset, width, height, format, imageSize, data);
+        return;
+      }
+      gl.compressedTexSubImage2D(target, level, xoffset, yoffset, width, height, format, wasm.HEAPU8.subarray(data, data + imageSize));
+    },
+    zengl_glCompressedTexSubImage3D(target, level, xoffset, yoffset, zoffset, width, height, depth, format, imageSize, data) {
+      if (unpackBuffer) {
+        gl.compressedTexSubImage3D(target, level, xoffset, yoffset, zoffset, width, height, depth, format, imageSize, data);
+        return;
+      }
+      gl.compressedTexSubImage3D(target, level, xoffset, yoffset, zoffset, width, height, depth, format, wasm.HEAPU8.subarray(data, data + imageSize));
+    },
     zengl_glActiveTexture(texture) {
       gl.activeTexture(texture);
     },
@@ -125,6 +167,12 @@
       gl.blendFuncSeparate(sfactorRGB, dfactorRGB, sfactorAlpha, dfactorAlpha);
     },
     zengl_glBindBuffer(target, buffer) {
+      if (target === 0x88EB) {
+        packBuffer = buffer;
+      }
+      if (target === 0x88EC) {
+        unpackBuffer = buffer;
+      }
       gl.bindBuffer(target, glo[buffer]);
     },
     zengl_glDeleteBuffers(n, buffers) {
@@ -428,5 +476,60 @@
     zengl_glVertexAttribDivisor(index, divisor) {
       gl.vertexAttribDivisor(index, divisor);
     },
+    zengl_glTransformFeedbackVaryings(program, count, varyings, bufferMode) {
+      const names = [];
+      for (let i = 0; i < count; ++i) {
+        names.push(getString(wasm.HEAP32[(varyings >> 2) + i]));
+      }
+      gl.transformFeedbackVaryings(glo[program], names, bufferMode);
+    },
+    zengl_glBeginTransformFeedback(primitiveMode) {
+      gl.beginTransformFeedback(primitiveMode);
+    },
+    zengl_glEndTransformFeedback() {
+      gl.endTransformFeedback();
+    },
+    zengl_glBindBufferBase(target, index, buffer) {
+      gl.bindBufferBase(target, index, glo[buffer]);
+    },
+    zengl_glPixelStorei(pname, param) {
+      if (pname === 0x0CF2) {
+        unpackRowLength = param;
+      }
+      if (pname === 0x0D02) {
+        packRowLength = param;
+      }
+      gl.pixelStorei(pname, param);
+    },
+    zengl_glMapBufferRange(target, offset, length, access) {
+      return 0;
+    },
+    zengl_glUnmapBuffer(target) {
+      return 1;
+    },
+    zengl_glFenceSync(condition, flags) {
+      const sync = glid++;
+      glo[sync] = gl.fenceSync(condition, flags);
+      return sync;
+    },
+    zengl_glClientWaitSync(sync, flags, timeout) {
+      return gl.clientWaitSync(glo[sync], flags, 0);
+    },
+    zengl_glDeleteSync(sync) {
+      gl.deleteSync(glo[sync]);
+      glo.delete(sync);
+    },
+    zengl_glGetTexImage(target, level, format, type, pixels) {
+    },
+    zengl_glGetCompressedTexImage(target, level, pixels) {
+    },
+    zengl_glScissor(x, y, width, height) {
+      gl.scissor(x, y, width, height);
+    },
+    zengl_glClearTexSubImage(texture, level, xoffset, yoffset, zoffset, width, height, depth, format, type, data) {
+    },
+    zengl_glInvalidateFramebuffer(target, numAttachments, attachments) {
+      gl.invalidateFramebuffer(target, wasm.HEAP32.subarray(attachments >> 2, (attachments >> 2) + numAttachments));
+    },
   };
 }